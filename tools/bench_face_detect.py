@@ -0,0 +1,100 @@
+"""
+Benchmark / equivalence check: legacy QC face detection vs. FaceDetector.
+
+Legacy = what qc.py did before: new CascadeClassifier per call, full-resolution
+grayscale, scaleFactor=1.1, minNeighbors=5, minSize=(60, 60).
+
+With --ref DIR every image in DIR (jpg/png) is checked by both and the
+any-face verdicts are compared (run it on the reference frame set before
+changing detector parameters). Without --ref, synthetic 4K frames are used
+for timing only.
+
+    python tools/bench_face_detect.py --ref path/to/reference_frames
+    python tools/bench_face_detect.py --size 3840x2160 --frames 3 --repeat 3
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+ROOT = Path(__file__).resolve().parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from tools.cli.face_detect import CASCADE_FILE, FaceDetector  # noqa: E402
+
+
+def legacy_any_face(frames) -> bool:
+    face_cascade = cv2.CascadeClassifier(str(Path(cv2.data.haarcascades) / CASCADE_FILE))
+    for img in frames:
+        gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
+        faces = face_cascade.detectMultiScale(gray, scaleFactor=1.1, minNeighbors=5, minSize=(60, 60))
+        if len(faces) > 0:
+            return True
+    return False
+
+
+def synthetic_frames(w: int, h: int, n: int) -> list:
+    rng = np.random.default_rng(0)
+    out = []
+    for _ in range(n):
+        img = cv2.GaussianBlur(rng.integers(0, 256, (h, w, 3), dtype=np.uint8), (0, 0), 8)
+        out.append(img)
+    return out
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--ref", default=None, help="Directory of reference frames (jpg/png)")
+    ap.add_argument("--size", default="3840x2160")
+    ap.add_argument("--frames", type=int, default=3)
+    ap.add_argument("--repeat", type=int, default=3)
+    args = ap.parse_args()
+
+    det = FaceDetector()
+
+    if args.ref:
+        paths = sorted(p for p in Path(args.ref).iterdir() if p.suffix.lower() in (".jpg", ".jpeg", ".png"))
+        mismatches = 0
+        t_old = t_new = 0.0
+        for p in paths:
+            img = cv2.imread(str(p))
+            if img is None:
+                continue
+            t = time.perf_counter()
+            a = legacy_any_face([img])
+            t_old += time.perf_counter() - t
+            t = time.perf_counter()
+            b = det.any_face([img])
+            t_new += time.perf_counter() - t
+            if a != b:
+                mismatches += 1
+                print(f"MISMATCH {p.name}: legacy={a} detector={b}")
+        print(f"images: {len(paths)} | mismatches: {mismatches}")
+        print(f"legacy: {t_old:.3f}s | detector: {t_new:.3f}s")
+        return 1 if mismatches else 0
+
+    w, h = (int(x) for x in args.size.lower().split("x"))
+    frames = synthetic_frames(w, h, args.frames)
+
+    def best(fn) -> float:
+        times = []
+        for _ in range(args.repeat):
+            t = time.perf_counter()
+            fn(frames)
+            times.append(time.perf_counter() - t)
+        return min(times)
+
+    old = best(legacy_any_face)
+    new = best(det.any_face)
+    print(f"{args.frames} frames {w}x{h} (no faces: full scan)")
+    print(f"legacy:   {old:.3f}s")
+    print(f"detector: {new:.3f}s  ({old / new:.1f}x)")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
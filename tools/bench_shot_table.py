@@ -0,0 +1,123 @@
+"""
+Benchmark: dict-of-dicts DURUM model vs. columnar ShotTable.
+
+Builds a synthetic DURUM with N shots (default 100000) and compares
+memory (tracemalloc) and time for the bulk operations used by
+listshots / release / promote-release: filter by status, sort by id, count.
+
+Three ways to load: the dict model (json.loads), a table built from that
+dict (ShotTable.from_durum: smaller resident size, same peak, since the
+dict is built first) and the streaming ShotTable.from_json_text /
+ShotTable.load (one shot decoded at a time: lower peak as well).
+
+    python tools/bench_shot_table.py
+    python tools/bench_shot_table.py --n 20000 --repeat 5
+"""
+import argparse
+import gc
+import json
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from tools.cli.shot_table import ShotTable  # noqa: E402
+
+STATUSES = ["PLANNED", "IN_PROGRESS", "QC", "DONE", "RELEASE"]
+PHASES = ["FAZ_1", "FAZ_2", "FAZ_3"]
+
+
+def make_durum_bytes(n: int) -> bytes:
+    shots = {}
+    for i in range(n):
+        sid = f"SH{i + 1:06d}"
+        v = f"outputs/v{(i % 9999) + 1:04d}"
+        shots[sid] = {
+            "id": sid,
+            "phase": PHASES[i % len(PHASES)],
+            "status": STATUSES[i % len(STATUSES)],
+            "inputs": {"prompt": f"bench / {sid} initial planning input"},
+            "outputs": {"preview.mp4": f"{v}/preview.mp4", "qc.json": f"{v}/qc.json"},
+            "history": [
+                {"event": "CREATED", "at": "2026-01-01T00:00:00Z", "by": "system"},
+                {"event": "STATUS_CHANGED", "from": "PLANNED", "to": "IN_PROGRESS", "at": "2026-01-02T00:00:00Z", "by": "cli"},
+            ],
+        }
+    durum = {
+        "active_project": "bench",
+        "current_focus": "FAZ_1",
+        "shots": shots,
+        "last_updated_utc": "2026-01-01T00:00:00Z",
+    }
+    return json.dumps(durum).encode("utf-8")
+
+
+def bulk_dict(durum: dict):
+    shots = durum["shots"]
+    done = sorted(sid for sid, sh in shots.items() if isinstance(sh, dict) and sh.get("status") == "DONE")
+    total = len([1 for v in shots.values() if isinstance(v, dict)])
+    return len(done), total
+
+
+def bulk_table(table: ShotTable):
+    done = table.ids_where(status="DONE")
+    return len(done), table.count()
+
+
+def measure_memory(build):
+    gc.collect()
+    tracemalloc.start()
+    obj = build()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return obj, current, peak
+
+
+def best_of(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(prog="bench_shot_table")
+    ap.add_argument("--n", type=int, default=100000, help="Number of synthetic shots")
+    ap.add_argument("--repeat", type=int, default=3, help="Timing repeats (best-of)")
+    args = ap.parse_args(argv)
+
+    raw = make_durum_bytes(args.n)
+
+    durum, dict_mem, dict_peak = measure_memory(lambda: json.loads(raw))
+    _, via_mem, via_peak = measure_memory(lambda: ShotTable.from_durum(json.loads(raw)))
+    table, table_mem, table_peak = measure_memory(lambda: ShotTable.from_json_text(raw.decode("utf-8")))
+
+    if bulk_dict(durum) != bulk_table(table):
+        print("[FAIL] dict and table results differ")
+        return 1
+
+    t_dict = best_of(lambda: bulk_dict(durum), args.repeat)
+    t_table = best_of(lambda: bulk_table(table), args.repeat)
+
+    mb = 1024 * 1024
+    print(f"shots: {args.n}  (DURUM bytes: {len(raw) / mb:.1f} MiB)")
+    print(f"{'MODEL':<12} {'RESIDENT MiB':>13} {'PEAK MiB':>9} {'SELECT+SORT+COUNT ms':>21}")
+    print("-" * 60)
+    print(f"{'dict':<12} {dict_mem / mb:>13.1f} {dict_peak / mb:>9.1f} {t_dict * 1000:>21.2f}")
+    print(f"{'dict->table':<12} {via_mem / mb:>13.1f} {via_peak / mb:>9.1f} {t_table * 1000:>21.2f}")
+    print(f"{'table load':<12} {table_mem / mb:>13.1f} {table_peak / mb:>9.1f} {t_table * 1000:>21.2f}")
+    print("")
+    print(f"resident ratio (table/dict): {table_mem / dict_mem:.2f}")
+    print(f"peak ratio (table load/dict): {table_peak / dict_peak:.2f}  (dict->table: {via_peak / dict_peak:.2f})")
+    print(f"speedup (dict/table):      {t_dict / t_table:.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -25,6 +25,13 @@ from .listshots import cmd_listshots
 from tools.cli.render import cmd_render
 from .promote_release import cmd_promote_release
 from tools.cli.bundle import cmd_bundle
+from .history_archive import cmd_archive_history
+from .migrate_ids import cmd_migrate_ids
+from .workspace import cmd_partition, resolve_state_args
+from .audit import cmd_audit
+from .readiness import cmd_readiness
+from .qc_timing import cmd_qc_timing
+from .similar import cmd_similar
 
 
 # --- CineV4 quick-route (do not disturb existing CLI) ---
@@ -51,16 +58,29 @@ def main():
     p = argparse.ArgumentParser(prog="cinev2-cli")
     sp = p.add_subparsers(dest="cmd", required=True)
     p_val = sp.add_parser("validate", help="Validate DURUM.json against schema")
-    p_val.add_argument("path")
+    p_val.add_argument("path", nargs="?", default=None)
+    p_val.add_argument("--project", default=None, help="Project id: use projects/<id>/DURUM.json when no path is given")
+    p_val.add_argument("--full", action="store_true", help="Ignore the validation cache and re-check every shot")
+    p_val.add_argument("--jobs", type=int, default=0, help="Worker processes for per-shot checks (default: auto)")
+    p_val.add_argument("--max-errors", type=int, default=0, help="Stop after N errors (default: report all)")
+    p_val.add_argument("--json", action="store_true", help="Print a JSON report grouped by shot")
     p_val.set_defaults(func=cmd_validate)
-    p_ns = sp.add_parser("newshot", help="Create a new shot skeleton")
-    p_ns.add_argument("path")
-    p_ns.add_argument("shot_id")
-    p_ns.add_argument("--prompt", required=True)
+    p_ns = sp.add_parser("newshot", help="Create a new shot skeleton (or many with --from)")
+    p_ns.add_argument("path", nargs="?", default=None)
+    p_ns.add_argument("shot_id", nargs="?", default=None)
+    p_ns.add_argument("--project", default=None, help="Project id: use projects/<id>/DURUM.json when no path is given")
+    p_ns.add_argument("--prompt", default=None, help="Prompt (required for a single shot)")
+    p_ns.add_argument(
+        "--from",
+        dest="from_file",
+        default=None,
+        help="Bulk import from shots.jsonl or shots.csv (id, prompt[, phase]); one validated commit",
+    )
     p_ns.set_defaults(func=cmd_newshot)
     p_tr = sp.add_parser("transition", help="Transition a shot status")
-    p_tr.add_argument("path")
+    p_tr.add_argument("path", nargs="?", default=None)
     p_tr.add_argument("shot_id")
+    p_tr.add_argument("--project", default=None, help="Project id: use projects/<id>/DURUM.json when no path is given")
     p_tr.add_argument(
         "--to", 
         required=True, 
@@ -69,8 +89,12 @@ def main():
     p_tr.add_argument("--release", default=None, help="Release id (e.g. demo01_r0001)")
     p_tr.set_defaults(func=cmd_transition)
     p_rel = sp.add_parser("release", help="Build a release package from DONE shots")
-    p_rel.add_argument("path")
-    p_rel.add_argument("--project", default=None, help="Project id (default: DURUM.active_project)")
+    p_rel.add_argument("path", nargs="?", default=None)
+    p_rel.add_argument(
+        "--project",
+        default=None,
+        help="Project id (default: DURUM.active_project); without path uses projects/<id>/DURUM.json",
+    )
     p_rel.add_argument("--out", required=True, help="Output directory (e.g. releases)")
     p_rel.add_argument("--release-id", default=None, help="Optional release folder name (default: UTC timestamp)")
     # Tagging (default ON)
@@ -89,13 +113,34 @@ def main():
     p_rel.set_defaults(tag_release=True)
     p_rel.set_defaults(func=cmd_release)
     p_qc = sp.add_parser("qc", help="generate qc.json for a shot")
-    p_qc.add_argument("durum")
-    p_qc.add_argument("shot_id") 
-    p_qc.add_argument("--out", required=True)
+    p_qc.add_argument("durum", nargs="?", default=None)
+    p_qc.add_argument("--project", default=None, help="Project id: use projects/<id>/DURUM.json when no path is given")
+    p_qc.add_argument("shot_id", nargs="?", default=None)
+    p_qc.add_argument("--out", default=None, help="QC output dir holding preview.mp4 (default: dir of outputs['preview.mp4'])")
+    p_qc.add_argument("--shots", nargs="+", default=None, help="Batch: QC these shots")
+    p_qc.add_argument("--status", default=None, help="Batch: QC every shot in this status (e.g. QC)")
+    p_qc.add_argument("--all", action="store_true", help="Batch: QC every shot")
+    p_qc.add_argument("--jobs", type=int, default=0, help="Batch worker processes (default: auto)")
+    p_qc.add_argument("--samples", type=int, default=None, help="Frames sampled across the preview (default: per phase, see qc_frames.SAMPLES_BY_PHASE)")
+    p_qc.add_argument("--keyframes", action="store_true", help="Keyframe-only seeking (faster, stamps snap to keyframes; needs ffmpeg)")
+    p_qc.add_argument("--keep-frames", action="store_true", help="Debug: also write sampled frames to <out>/_qc_frames")
+    p_qc.add_argument("--identity-threshold", type=float, default=None, help="Max LBP distance preview face vs. ref.jpg (0..1, default: ref_index.DEFAULT_MAX_DISTANCE)")
+    p_qc.add_argument("--black-luma", type=float, default=None, help="Error black_frames if a sampled frame's mean luma is below this (0..255)")
+    p_qc.add_argument("--freeze-diff", type=float, default=None, help="Error frozen_preview if every frame-to-frame mean abs diff is below this")
+    p_qc.add_argument("--blur-var", type=float, default=None, help="Error blurry_preview if the median Laplacian variance is below this")
+    p_qc.add_argument("--reuse-diff", type=float, default=None, help="Re-render: reuse the previous version's face boxes (identity is still checked against ref.jpg) if no 16x16 block of the sampled frames changed by more than this (0..255; default 0 = off)")
+    p_qc.add_argument("--no-cache", action="store_true", help="Ignore the QC result cache (always decode and detect)")
     p_qc.set_defaults(func=cmd_qc)
     p_ls = sp.add_parser("listshots", help="List shots in DURUM.json")
-    p_ls.add_argument("path", help="Path to DURUM.json")
+    p_ls.add_argument("path", nargs="?", default=None, help="Path to DURUM.json")
+    p_ls.add_argument("--project", default=None, help="Project id: use projects/<id>/DURUM.json when no path is given")
+    p_ls.add_argument(
+        "--all-projects",
+        action="store_true",
+        help="List shots of every projects/<id>/DURUM.json (loaded in parallel)",
+    )
     p_ls.add_argument("--status", default=None, help="Filter by status (e.g. DONE, QC, IN_PROGRESS, PLANNED)")
+    p_ls.add_argument("--media", action="store_true", help="Add a MEDIA column: preview duration / fps / size / codec (cached probe)")
     p.add_argument("--phase", default=None, help="Filter by phase (e.g. FAZ_1)")
     p_ls.set_defaults(func=cmd_listshots)
     p_render = sp.add_parser("render", help="render preview artifact")
@@ -104,7 +149,8 @@ def main():
         action="store_true",
         help="Allow overwrite (disable strict render guard)"
     )
-    p_render.add_argument("path", help="Path to DURUM.json")
+    p_render.add_argument("path", nargs="?", default=None, help="Path to DURUM.json")
+    p_render.add_argument("--project", default=None, help="Project id: use projects/<id>/DURUM.json when no path is given")
     p_render.add_argument("shot_id", help="Shot id (e.g. SH008)")
     p_render.add_argument("--out", required=True, help="Output dir")
     p_render.add_argument(
@@ -113,9 +159,10 @@ def main():
         default=None,
         help="Source preview.mp4 (default: shot.outputs['preview.mp4'])"
     )
+    p_render.add_argument("--faststart", action="store_true", help="Remux so moov precedes mdat (cheap seeks); no re-encode")
     p_render.set_defaults(func=cmd_render)
     p_pr = sp.add_parser("promote-release", help="Promote DONE shots to RELEASE (after release-gate)")
-    p_pr.add_argument("path")
+    p_pr.add_argument("path", nargs="?", default=None)
     p_pr.add_argument("--project", required=True, help="Project id (e.g. demo01)")
     p_pr.add_argument("--release", required=True, help="Release id (e.g. demo01_r0005)")
     g = p_pr.add_mutually_exclusive_group(required=True)
@@ -155,7 +202,68 @@ def main():
 
     p_bundle.set_defaults(func=cmd_bundle)
 
+    p_ah = sp.add_parser("archive-history", help="Move old shot history into compressed archive segments")
+    p_ah.add_argument("path", nargs="?", default=None, help="Path to DURUM.json")
+    p_ah.add_argument("--project", default=None, help="Project id: use projects/<id>/DURUM.json when no path is given")
+    p_ah.add_argument("--keep", type=int, default=None, help="Keep the last N events per shot in DURUM")
+    p_ah.add_argument("--older-than-days", type=int, default=None, help="Only archive events older than D days")
+    p_ah.add_argument("--shots", nargs="+", default=None, help="Shot ids (default: all shots)")
+    p_ah.set_defaults(func=cmd_archive_history)
+
+    p_mi = sp.add_parser("migrate-ids", help="Rewrite shot ids (wider / scene-qualified) and their outputs paths")
+    p_mi.add_argument("path", nargs="?", default=None, help="Path to DURUM.json")
+    p_mi.add_argument("--project", default=None, help="Project id: use projects/<id>/DURUM.json when no path is given")
+    p_mi.add_argument("--width", type=int, default=None, help="Re-pad SH numbers to N digits (e.g. 4 -> SH0001)")
+    p_mi.add_argument("--map", default=None, help="JSON file with explicit {old_id: new_id} mapping")
+    p_mi.add_argument("--apply", action="store_true", help="Apply the migration (default: dry run)")
+    p_mi.set_defaults(func=cmd_migrate_ids)
+
+    p_part = sp.add_parser("partition", help="Move a root DURUM.json and its outputs under projects/<id>/")
+    p_part.add_argument("path", help="Path to the legacy (root) DURUM.json")
+    p_part.add_argument("--project", default=None, help="Project id (default: DURUM.active_project)")
+    p_part.add_argument("--apply", action="store_true", help="Apply (default: dry run)")
+    p_part.set_defaults(func=cmd_partition)
+
+    p_au = sp.add_parser("audit", help="Check referenced outputs on disk: missing, zero-size, orphaned")
+    p_au.add_argument("path", nargs="?", default=None, help="Path to DURUM.json")
+    p_au.add_argument("--project", default=None, help="Project id: use projects/<id>/DURUM.json when no path is given")
+    p_au.add_argument("--jobs", type=int, default=8, help="Directories scanned in parallel (default: 8)")
+    p_au.add_argument("--json", action="store_true", help="Print the report as JSON")
+    p_au.set_defaults(func=cmd_audit)
+
+    p_rd = sp.add_parser("readiness", help="Which shots can advance (transition gates for every shot)")
+    p_rd.add_argument("path", nargs="?", default=None, help="Path to DURUM.json")
+    p_rd.add_argument("--project", default=None, help="Project id: use projects/<id>/DURUM.json when no path is given")
+    p_rd.add_argument("--status", default=None, help="Filter by current status (e.g. QC)")
+    p_rd.add_argument("--phase", default=None, help="Filter by phase (e.g. FAZ_2)")
+    p_rd.add_argument("--ready-only", action="store_true", help="Only shots with at least one eligible next state")
+    p_rd.add_argument("--jobs", type=int, default=8, help="Directories scanned in parallel (default: 8)")
+    p_rd.add_argument("--json", action="store_true", help="Print JSON instead of a table")
+    p_rd.set_defaults(func=cmd_readiness)
+
+    p_qt = sp.add_parser("qc-timing", help="Aggregate qc.json stage timings over all shots (find hot QC stages)")
+    p_qt.add_argument("path", nargs="?", default=None, help="Path to DURUM.json")
+    p_qt.add_argument("--project", default=None, help="Project id: use projects/<id>/DURUM.json when no path is given")
+    p_qt.add_argument("--status", default=None, help="Filter by current status (e.g. QC)")
+    p_qt.add_argument("--phase", default=None, help="Filter by phase (e.g. FAZ_2)")
+    p_qt.add_argument("--jobs", type=int, default=8, help="Directories scanned in parallel (default: 8)")
+    p_qt.add_argument("--json", action="store_true", help="Print JSON instead of a table")
+    p_qt.set_defaults(func=cmd_qc_timing)
+
+    p_sim = sp.add_parser("similar", help="Shots whose previews look like this shot's (perceptual hash index)")
+    p_sim.add_argument("path", nargs="?", default=None, help="Path to DURUM.json")
+    p_sim.add_argument("shot_id")
+    p_sim.add_argument("--project", default=None, help="Project id: use projects/<id>/DURUM.json when no path is given")
+    p_sim.add_argument("--radius", type=int, default=10, help="Max Hamming distance of frame pHashes, of 64 bits (default: 10)")
+    p_sim.add_argument("--jobs", type=int, default=8, help="Directories scanned in parallel (default: 8)")
+    p_sim.add_argument("--json", action="store_true", help="Print JSON instead of a table")
+    p_sim.set_defaults(func=cmd_similar)
+
     args = p.parse_args()
+    err = resolve_state_args(args)
+    if err:
+        print(f"[ERR] {err}")
+        return 2
     return args.func(args)
 
 if __name__ == "__main__":
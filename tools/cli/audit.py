@@ -0,0 +1,142 @@
+"""
+audit: check every output path referenced by DURUM against the disk.
+
+All referenced paths are resolved through one StatMap (one os.scandir per
+directory, directories in parallel), and the outputs/ tree is listed the same
+way to find files no shot references. Reports:
+
+- missing    referenced, not a regular file on disk
+- zero_size  referenced, present, 0 bytes
+- orphaned   under outputs/ but referenced by no shot (scratch directories
+             starting with "_", e.g. _qc_frames, are skipped)
+- bad_paths  absolute / escaping paths (never resolved)
+
+Paths are relative to the DURUM file's directory, like validate and qc.
+Exit code is 1 when anything is missing or empty; orphans alone are a warning.
+"""
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+
+from .shot_index import sort_shot_ids
+from .statmap import StatMap
+
+OUTPUTS_DIRNAME = "outputs"
+
+
+def _fail(msg: str) -> int:
+    print(f"[ERR] {msg}")
+    return 2
+
+
+def is_safe_rel(rel) -> bool:
+    if not isinstance(rel, str) or not rel.strip():
+        return False
+    p = Path(rel)
+    return not p.is_absolute() and ".." not in p.parts
+
+
+def referenced_outputs(durum: dict) -> list[tuple[str, str, str]]:
+    """(shot_id, output key, relative path) for every string output, in shot order."""
+    shots = durum.get("shots") or {}
+    out = []
+    for sid in sort_shot_ids(shots.keys()):
+        shot = shots[sid]
+        outputs = shot.get("outputs") if isinstance(shot, dict) else None
+        if not isinstance(outputs, dict):
+            continue
+        for key in sorted(outputs):
+            if isinstance(outputs[key], str):
+                out.append((sid, key, outputs[key]))
+    return out
+
+
+def durum_stat_map(durum: dict, state_root, jobs: int = 8) -> StatMap:
+    """StatMap primed with every (safe) output path the state references."""
+    root = Path(state_root)
+    return StatMap.scan(
+        [root / rel for _, _, rel in referenced_outputs(durum) if is_safe_rel(rel)],
+        jobs=jobs,
+    )
+
+
+def run_audit(durum: dict, state_root, jobs: int = 8) -> tuple[dict, StatMap]:
+    root = Path(state_root).resolve()
+    refs = referenced_outputs(durum)
+    sm = durum_stat_map(durum, root, jobs)
+    sm.walk(root / OUTPUTS_DIRNAME)
+
+    missing, zero, bad = [], [], []
+    referenced: set[str] = set()
+    for sid, key, rel in refs:
+        entry = {"shot_id": sid, "key": key, "path": rel}
+        if not is_safe_rel(rel):
+            bad.append(entry)
+            continue
+        full = os.path.normpath(str(root / rel))
+        referenced.add(full)
+        fs = sm.stat(full)
+        if fs is None:
+            missing.append(entry)
+        elif fs.size == 0:
+            zero.append(entry)
+
+    orphaned = [
+        Path(os.path.relpath(f, root)).as_posix()
+        for f in sm.files_under(root / OUTPUTS_DIRNAME)
+        if f not in referenced
+    ]
+
+    report = {
+        "ok": not (missing or zero or bad),
+        "state_root": root.as_posix(),
+        "referenced": len(refs),
+        "directories_scanned": sm.scandirs,
+        "missing": missing,
+        "zero_size": zero,
+        "bad_paths": bad,
+        "orphaned": orphaned,
+    }
+    return report, sm
+
+
+def cmd_audit(args) -> int:
+    durum_path = Path(args.path)
+    if not durum_path.is_file():
+        return _fail(f"cannot read {durum_path}")
+
+    try:
+        durum = json.loads(durum_path.read_text(encoding="utf-8"))
+    except Exception as e:
+        return _fail(f"invalid json: {e}")
+
+    if not isinstance(durum.get("shots"), dict):
+        return _fail("DURUM.json: 'shots' must be an object")
+
+    report, _ = run_audit(durum, durum_path.resolve().parent, jobs=args.jobs)
+
+    if args.json:
+        print(json.dumps(report, ensure_ascii=False, indent=2))
+        return 0 if report["ok"] else 1
+
+    for e in report["bad_paths"]:
+        print(f"[BAD_PATH] {e['shot_id']} {e['key']}: {e['path']}")
+    for e in report["missing"]:
+        print(f"[MISSING] {e['shot_id']} {e['key']}: {e['path']}")
+    for e in report["zero_size"]:
+        print(f"[EMPTY] {e['shot_id']} {e['key']}: {e['path']}")
+    for rel in report["orphaned"]:
+        print(f"[ORPHAN] {rel}")
+
+    print(
+        f"referenced: {report['referenced']} | missing: {len(report['missing'])} | "
+        f"zero-size: {len(report['zero_size'])} | orphaned: {len(report['orphaned'])} | "
+        f"dirs scanned: {report['directories_scanned']}"
+    )
+    if not report["ok"]:
+        print("[FAIL] audit found missing / empty outputs")
+        return 1
+    print("[OK] audit clean" + (" (orphans only)" if report["orphaned"] else ""))
+    return 0
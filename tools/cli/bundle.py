@@ -5,6 +5,8 @@ import shutil
 import hashlib
 from datetime import datetime, timezone
 
+from .shot_index import sort_shot_ids
+
 
 def _sha256_of_file(path: str) -> str:
     h = hashlib.sha256()
@@ -163,7 +165,7 @@ def cmd_bundle(args):
     total_bytes = 0
 
     # stable order
-    for shot_id in sorted(chosen.keys()):
+    for shot_id in sort_shot_ids(chosen.keys()):
         s, shot = chosen[shot_id]
         src_release_dir = s["src"]
         src_release_id = s["release_id"]
@@ -0,0 +1,28 @@
+"""
+Local cache root for derived data (compiled schemas, validation / QC / probe
+caches). Everything under it can be deleted at any time.
+
+Default: <repo>/.cache ; override with CINEV2_CACHE_DIR.
+"""
+from __future__ import annotations
+
+import hashlib
+import os
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+
+
+def cache_root() -> Path:
+    env = os.environ.get("CINEV2_CACHE_DIR")
+    return Path(env) if env else REPO_ROOT / ".cache"
+
+
+def cache_dir(*parts: str) -> Path:
+    d = cache_root().joinpath(*parts)
+    d.mkdir(parents=True, exist_ok=True)
+    return d
+
+
+def sha256_bytes(b: bytes) -> str:
+    return hashlib.sha256(b).hexdigest()
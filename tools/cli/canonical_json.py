@@ -0,0 +1,133 @@
+"""
+Canonical JSON for CINEV2 state files.
+
+Two forms, both sorted-keys UTF-8:
+
+- canonical_pretty(): on-disk form used by every writer (indent=2, trailing
+  newline). Uses orjson when it is installed, stdlib json otherwise.
+- canonical_bytes(): compact form used for hashing. Always stdlib json so a
+  hash never depends on which optional packages a machine has.
+
+Both reject NaN / Infinity (ValueError) whichever backend is installed;
+orjson alone would silently write them as null.
+
+State hashing is content based, not byte based: each shot gets its own
+sha256 over its canonical bytes, and the whole-state hash is derived from
+the top-level fields plus the (shot_id, shot_hash) list. StateHasher keeps
+the per-shot hashes so a mutation only re-hashes the shots it touched;
+state_hash_cache persists them between commands.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import math
+
+try:  # optional accelerated backend
+    import orjson as _orjson
+except Exception:  # pragma: no cover - depends on environment
+    _orjson = None
+
+STATE_HASH_MODE = "canonical-state-v1"
+_STATE_HASH_HEADER = b"cinev2-state/1\n"
+
+
+def backend() -> str:
+    return "orjson" if _orjson is not None else "json"
+
+
+def canonical_bytes(obj) -> bytes:
+    return json.dumps(
+        obj, ensure_ascii=False, sort_keys=True, separators=(",", ":"), allow_nan=False
+    ).encode("utf-8")
+
+
+def _reject_nonfinite(obj) -> None:
+    stack = [obj]
+    while stack:
+        v = stack.pop()
+        if isinstance(v, float):
+            if not math.isfinite(v):
+                raise ValueError(f"Out of range float values are not JSON compliant: {v!r}")
+        elif isinstance(v, dict):
+            stack.extend(v.values())
+        elif isinstance(v, (list, tuple)):
+            stack.extend(v)
+
+
+def canonical_pretty(obj) -> bytes:
+    if _orjson is not None:
+        _reject_nonfinite(obj)  # orjson writes NaN as null instead of failing
+        try:
+            return _orjson.dumps(
+                obj, option=_orjson.OPT_INDENT_2 | _orjson.OPT_SORT_KEYS | _orjson.OPT_APPEND_NEWLINE
+            )
+        except TypeError:
+            pass  # e.g. non-str keys / unsupported types -> stdlib
+    return (
+        json.dumps(obj, ensure_ascii=False, sort_keys=True, indent=2, separators=(",", ": "), allow_nan=False)
+        + "\n"
+    ).encode("utf-8")
+
+
+def sha256_json(obj) -> str:
+    return hashlib.sha256(canonical_bytes(obj)).hexdigest()
+
+
+def shot_sha256(shot) -> str:
+    return sha256_json(shot)
+
+
+def _combine(meta_hash: str, shot_hashes: dict) -> str:
+    h = hashlib.sha256(_STATE_HASH_HEADER)
+    h.update(meta_hash.encode("ascii"))
+    h.update(b"\n")
+    for sid in sorted(shot_hashes):
+        h.update(str(sid).encode("utf-8"))
+        h.update(b"\0")
+        h.update(shot_hashes[sid].encode("ascii"))
+        h.update(b"\n")
+    return h.hexdigest()
+
+
+class StateHasher:
+    """
+    Incremental whole-state hash.
+
+        hasher = StateHasher(durum)
+        ... mutate durum["shots"]["SH004"] ...
+        hasher.update_shot("SH004")
+        hasher.digest()
+
+    shot_hashes=: start from known per-shot hashes (state_hash_cache) instead
+    of hashing every shot; shots missing from it are hashed, stale ids dropped.
+    """
+
+    def __init__(self, durum: dict, shot_hashes: dict | None = None):
+        self.durum = durum
+        self.meta_hash = ""
+        self.update_meta()
+        shots = durum.get("shots") or {}
+        if shot_hashes is None:
+            self.shot_hashes = {sid: shot_sha256(shot) for sid, shot in shots.items()}
+        else:
+            self.shot_hashes = {sid: h for sid, h in shot_hashes.items() if sid in shots}
+            for sid in shots.keys() - self.shot_hashes.keys():
+                self.shot_hashes[sid] = shot_sha256(shots[sid])
+
+    def update_meta(self) -> None:
+        self.meta_hash = sha256_json({k: v for k, v in self.durum.items() if k != "shots"})
+
+    def update_shot(self, sid) -> None:
+        shots = self.durum.get("shots") or {}
+        if sid in shots:
+            self.shot_hashes[sid] = shot_sha256(shots[sid])
+        else:
+            self.shot_hashes.pop(sid, None)
+
+    def digest(self) -> str:
+        return _combine(self.meta_hash, self.shot_hashes)
+
+
+def state_sha256(durum: dict) -> str:
+    return StateHasher(durum).digest()
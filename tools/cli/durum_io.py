@@ -0,0 +1,156 @@
+"""
+Single writer for DURUM.json (and other JSON state files).
+
+Every mutator goes through here so that:
+- the state is serialized once, in canonical form (see canonical_json),
+- written to a temp file in the same directory, fsync'ed,
+- and atomically renamed over the target (os.replace).
+
+A crash can therefore never leave a half-written state file. The temp file
+(mkstemp: 0600) gets the target's mode first, or 0666 & ~umask for a new
+file, so a write never changes a file's permissions.
+
+DurumWriter adds group commit: several mutations queued in one process (or
+one batch command) are applied to the same in-memory state and produce a
+single write + fsync.
+
+A commit that names the shots it touched (write_durum(touched=...)) also
+keeps the whole-state hash current in state_hash_cache, re-hashing only
+those shots.
+"""
+from __future__ import annotations
+
+import json
+import os
+import stat
+import tempfile
+from pathlib import Path
+from typing import Callable
+
+from . import state_hash_cache
+from .canonical_json import canonical_pretty
+
+
+def dumps_json(data) -> bytes:
+    return canonical_pretty(data)
+
+
+def _fsync_dir(d: Path) -> None:
+    # directory fsync makes the rename durable on POSIX; not available on Windows
+    if os.name == "nt":
+        return
+    try:
+        fd = os.open(str(d), os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def _umask() -> int:
+    mask = os.umask(0)  # the only way to read it; restored right away
+    os.umask(mask)
+    return mask
+
+
+def match_mode(fd: int, target: Path) -> None:
+    """Give a temp file (fd) the mode os.replace should leave on target."""
+    if not hasattr(os, "fchmod"):
+        return
+    try:
+        mode = stat.S_IMODE(target.stat().st_mode)
+    except FileNotFoundError:
+        mode = 0o666 & ~_umask()
+    os.fchmod(fd, mode)
+
+
+def write_bytes_atomic(path, payload: bytes) -> None:
+    target = Path(path)
+    parent = target.parent if str(target.parent) else Path(".")
+    fd, tmp = tempfile.mkstemp(prefix=f".{target.name}.", suffix=".tmp", dir=str(parent))
+    try:
+        with os.fdopen(fd, "wb") as f:
+            match_mode(f.fileno(), target)
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, target)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+    _fsync_dir(parent)
+
+
+def write_json_atomic(path, data) -> None:
+    write_bytes_atomic(path, dumps_json(data))
+
+
+def read_durum(path) -> dict:
+    return json.loads(Path(path).read_text(encoding="utf-8"))
+
+
+class DurumWriter:
+    """
+    Group-commit writer for one DURUM.json.
+
+        with DurumWriter(path) as w:
+            w.queue(lambda d: ...)
+            w.queue(lambda d: ...)
+        # -> one serialize, one write, one fsync
+
+    Mutations receive the in-memory DURUM dict. If the block raises, nothing
+    is written.
+    """
+
+    def __init__(self, path, durum: dict | None = None):
+        self.path = Path(path)
+        self._durum = durum
+        self._pending: list[Callable[[dict], None]] = []
+        self.commits = 0
+
+    @property
+    def durum(self) -> dict:
+        if self._durum is None:
+            self._durum = read_durum(self.path)
+        return self._durum
+
+    def queue(self, mutation: Callable[[dict], None]) -> None:
+        self._pending.append(mutation)
+
+    def commit(self, touched=None) -> int:
+        """
+        Apply queued mutations and write once. Returns number of mutations applied.
+        touched: ids of every shot the mutations changed (None: unknown).
+        """
+        durum = self.durum
+        pending, self._pending = self._pending, []
+        for mutation in pending:
+            mutation(durum)
+        hasher = state_hash_cache.hasher_for_write(self.path, durum, touched) if touched is not None else None
+        write_json_atomic(self.path, durum)
+        if hasher is not None:
+            state_hash_cache.save(self.path, hasher)
+        self.commits += 1
+        return len(pending)
+
+    def __enter__(self) -> "DurumWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        if exc_type is None:
+            self.commit()
+        else:
+            self._pending.clear()
+        return False
+
+
+def write_durum(path, durum: dict, touched=None) -> None:
+    """Write a fully mutated DURUM in one atomic commit (touched: see DurumWriter.commit)."""
+    DurumWriter(path, durum).commit(touched)
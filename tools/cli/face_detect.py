@@ -0,0 +1,130 @@
+"""
+Reusable Haar frontal-face detector for QC.
+
+- one detector per process (get_detector()); batch QC workers keep it, and
+  the cascade it loads, for every shot they handle
+- detection runs on a downscaled copy of the frame: detectMultiScale never
+  looks at windows smaller than min_size, so the frame can be shrunk until
+  min_size equals the cascade's native window (24px); the same face sizes
+  are searched (only the scale-step grid shifts) and boxes are mapped back
+- frames are checked on a thread pool (OpenCV releases the GIL) and
+  any_face() returns at the first detection; CascadeClassifier is not
+  thread-safe, so each pool thread loads its own copy once and keeps it
+
+Parameters default to what QC always used (scaleFactor=1.1, minNeighbors=5,
+minSize=60x60). tools/bench_face_detect.py compares this against the plain
+full-resolution call on a directory of reference frames.
+"""
+from __future__ import annotations
+
+import os
+import threading
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from pathlib import Path
+
+import cv2
+
+CASCADE_FILE = "haarcascade_frontalface_default.xml"
+# native window of haarcascade_frontalface_default.xml
+CASCADE_WINDOW = 24
+
+
+class FaceDetector:
+    def __init__(
+        self,
+        scale_factor: float = 1.1,
+        min_neighbors: int = 5,
+        min_size: tuple[int, int] = (60, 60),
+        threads: int | None = None,
+        cascade_path=None,
+    ):
+        self.path = Path(cascade_path) if cascade_path else Path(cv2.data.haarcascades) / CASCADE_FILE
+        self._local = threading.local()
+        self._pool: ThreadPoolExecutor | None = None
+        self.cascade  # load now: a bad path fails here, not in a worker thread
+        self.scale_factor = scale_factor
+        self.min_neighbors = min_neighbors
+        self.min_size = min_size
+        self.threads = threads or min(4, os.cpu_count() or 1)
+
+    def config(self) -> dict:
+        """Parameters that affect results (part of the QC cache key)."""
+        return {
+            "cascade": self.path.name,
+            "scale_factor": self.scale_factor,
+            "min_neighbors": self.min_neighbors,
+            "min_size": list(self.min_size),
+            "window": CASCADE_WINDOW,
+        }
+
+    @property
+    def cascade(self):
+        c = getattr(self._local, "cascade", None)
+        if c is None:
+            c = cv2.CascadeClassifier(str(self.path))
+            if c.empty():
+                raise RuntimeError(f"cannot load face cascade: {self.path}")
+            self._local.cascade = c
+        return c
+
+    def _downscale(self) -> float:
+        return min(1.0, CASCADE_WINDOW / max(1, min(self.min_size)))
+
+    def detect(self, img) -> list[tuple[int, int, int, int]]:
+        """Face boxes (x, y, w, h) in the coordinates of `img` (BGR or gray)."""
+        if img is None:
+            return []
+        gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY) if img.ndim == 3 else img
+
+        f = self._downscale()
+        h, w = gray.shape[:2]
+        if f < 1.0:
+            small = cv2.resize(gray, (max(1, round(w * f)), max(1, round(h * f))), interpolation=cv2.INTER_AREA)
+            min_size = (max(1, round(self.min_size[0] * f)), max(1, round(self.min_size[1] * f)))
+        else:
+            small, min_size, f = gray, self.min_size, 1.0
+
+        faces = self.cascade.detectMultiScale(
+            small, scaleFactor=self.scale_factor, minNeighbors=self.min_neighbors, minSize=min_size
+        )
+        return [(round(x / f), round(y / f), round(bw / f), round(bh / f)) for (x, y, bw, bh) in faces]
+
+    def _executor(self) -> ThreadPoolExecutor:
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(max_workers=self.threads, thread_name_prefix="face")
+        return self._pool
+
+    def detect_all(self, frames) -> list[list[tuple[int, int, int, int]]]:
+        """Boxes for every frame (no early exit; the identity check needs all faces)."""
+        if self.threads <= 1 or len(frames) <= 1:
+            return [self.detect(f) for f in frames]
+        return list(self._executor().map(self.detect, frames))
+
+    def any_face(self, frames) -> bool:
+        frames = [f for f in frames if f is not None]
+        if not frames:
+            return False
+        if self.threads <= 1 or len(frames) == 1:
+            return any(self.detect(f) for f in frames)
+
+        pending = {self._executor().submit(self.detect, f) for f in frames}
+        try:
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                if any(d.result() for d in done):
+                    return True
+            return False
+        finally:
+            for f in pending:
+                f.cancel()  # early exit: frames not started yet are skipped
+
+
+_DETECTOR: FaceDetector | None = None
+
+
+def get_detector() -> FaceDetector:
+    """Process-wide detector with the QC defaults."""
+    global _DETECTOR
+    if _DETECTOR is None:
+        _DETECTOR = FaceDetector()
+    return _DETECTOR
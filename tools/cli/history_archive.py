@@ -0,0 +1,202 @@
+"""
+Cold shot history archive.
+
+Shot `history` arrays only grow. `archive-history` moves the older part of
+each history into gzip'ed JSONL segment files under the state root:
+
+    <state_root>/history_archive/<shot_id>/seg-0001.jsonl.gz
+
+and leaves a single HISTORY_ARCHIVED summary event at history[0]:
+
+    {"event": "HISTORY_ARCHIVED", "at": ..., "by": "cli",
+     "events": 120, "counts": {"STATUS_CHANGED": 110, ...},
+     "segments": [{"path": "history_archive/SH001/seg-0001.jsonl.gz",
+                   "events": 120, "first_at": ..., "last_at": ..., "sha256": ...}]}
+
+`full_history()` reads the segments back transparently (sha256 verified).
+Segments are written before DURUM is committed, so a crash can at worst
+leave an unreferenced segment which the next run overwrites.
+"""
+from __future__ import annotations
+
+import gzip
+import hashlib
+import json
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+from .durum_io import DurumWriter, write_bytes_atomic
+
+ARCHIVE_EVENT = "HISTORY_ARCHIVED"
+ARCHIVE_DIRNAME = "history_archive"
+
+
+def _fail(msg: str) -> int:
+    print(f"[ERR] {msg}")
+    return 2
+
+
+def _utc_now() -> str:
+    return datetime.now(timezone.utc).replace(microsecond=0).isoformat().replace("+00:00", "Z")
+
+
+def _parse_at(s) -> datetime | None:
+    if not isinstance(s, str) or not s.endswith("Z"):
+        return None
+    try:
+        return datetime.fromisoformat(s.replace("Z", "+00:00")).astimezone(timezone.utc)
+    except Exception:
+        return None
+
+
+def archive_marker(shot: dict) -> dict | None:
+    hist = shot.get("history")
+    if isinstance(hist, list) and hist and isinstance(hist[0], dict) and hist[0].get("event") == ARCHIVE_EVENT:
+        return hist[0]
+    return None
+
+
+def hot_history(shot: dict) -> list:
+    """History events kept in DURUM (without the archive marker)."""
+    hist = shot.get("history")
+    if not isinstance(hist, list):
+        return []
+    return hist[1:] if archive_marker(shot) else hist
+
+
+def read_segment(state_root: Path, seg: dict) -> list:
+    p = (Path(state_root) / seg["path"]).resolve()
+    raw = p.read_bytes()
+    if seg.get("sha256") and hashlib.sha256(raw).hexdigest() != seg["sha256"]:
+        raise ValueError(f"history segment hash mismatch: {seg['path']}")
+    return [json.loads(line) for line in gzip.decompress(raw).decode("utf-8").splitlines() if line.strip()]
+
+
+def full_history(shot: dict, state_root) -> list:
+    """Complete history in order: archived segments first, then hot events."""
+    marker = archive_marker(shot)
+    if marker is None:
+        hist = shot.get("history")
+        return hist if isinstance(hist, list) else []
+    events: list = []
+    for seg in marker.get("segments") or []:
+        events.extend(read_segment(Path(state_root), seg))
+    events.extend(hot_history(shot))
+    return events
+
+
+def _split_point(events: list, keep: int | None, cutoff: datetime | None) -> int:
+    """Number of leading events to archive (always a prefix, order is preserved)."""
+    limit = len(events) if keep is None else max(0, len(events) - keep)
+    n = 0
+    while n < limit:
+        if cutoff is not None:
+            at = _parse_at((events[n] or {}).get("at") if isinstance(events[n], dict) else None)
+            if at is None or at >= cutoff:
+                break
+        n += 1
+    return n
+
+
+def archive_shot(shot: dict, sid: str, state_root: Path, keep: int | None, cutoff: datetime | None) -> int:
+    """Move old events of one shot into a new segment. Returns number of events archived."""
+    events = hot_history(shot)
+    n = _split_point(events, keep, cutoff)
+    if n == 0:
+        return 0
+
+    cold, hot = events[:n], events[n:]
+    marker = archive_marker(shot) or {"event": ARCHIVE_EVENT, "events": 0, "counts": {}, "segments": []}
+    segments = list(marker.get("segments") or [])
+
+    seg_rel = Path(ARCHIVE_DIRNAME) / sid / f"seg-{len(segments) + 1:04d}.jsonl.gz"
+    body = "".join(json.dumps(e, ensure_ascii=False, sort_keys=True) + "\n" for e in cold)
+    payload = gzip.compress(body.encode("utf-8"), mtime=0)
+
+    seg_abs = Path(state_root) / seg_rel
+    seg_abs.parent.mkdir(parents=True, exist_ok=True)
+    write_bytes_atomic(seg_abs, payload)
+
+    ats = [e.get("at") for e in cold if isinstance(e, dict) and isinstance(e.get("at"), str)]
+    segments.append(
+        {
+            "path": seg_rel.as_posix(),
+            "events": len(cold),
+            "first_at": ats[0] if ats else "",
+            "last_at": ats[-1] if ats else "",
+            "sha256": hashlib.sha256(payload).hexdigest(),
+        }
+    )
+
+    counts = dict(marker.get("counts") or {})
+    for e in cold:
+        ev = e.get("event") if isinstance(e, dict) else None
+        key = ev if isinstance(ev, str) else "?"
+        counts[key] = counts.get(key, 0) + 1
+
+    new_marker = {
+        "event": ARCHIVE_EVENT,
+        "at": _utc_now(),
+        "by": "cli",
+        "events": int(marker.get("events") or 0) + len(cold),
+        "counts": counts,
+        "segments": segments,
+    }
+    shot["history"] = [new_marker] + hot
+    return len(cold)
+
+
+def cmd_archive_history(args) -> int:
+    path = Path(args.path)
+    if not path.exists() or not path.is_file():
+        return _fail(f"cannot read {path}")
+
+    keep = args.keep
+    days = args.older_than_days
+    if keep is None and days is None:
+        return _fail("archive-history requires --keep and/or --older-than-days")
+    if keep is not None and keep < 0:
+        return _fail("--keep must be >= 0")
+    cutoff = datetime.now(timezone.utc) - timedelta(days=days) if days is not None else None
+
+    writer = DurumWriter(path)
+    try:
+        durum = writer.durum
+    except Exception as e:
+        return _fail(f"invalid json: {e}")
+
+    shots = durum.get("shots")
+    if not isinstance(shots, dict):
+        return _fail("DURUM.json: 'shots' must be an object")
+
+    selected = list(shots.keys())
+    if args.shots:
+        selected = [s.strip() for s in ",".join(args.shots).split(",") if s.strip()]
+        missing = [s for s in selected if s not in shots]
+        if missing:
+            return _fail("shot not found: " + ", ".join(missing))
+
+    state_root = path.resolve().parent
+    moved_total = 0
+    touched = 0
+    for sid in selected:
+        shot = shots[sid]
+        if not isinstance(shot, dict):
+            continue
+        moved = archive_shot(shot, sid, state_root, keep, cutoff)
+        if moved:
+            moved_total += moved
+            touched += 1
+
+    if touched == 0:
+        print("[OK] nothing to archive")
+        return 0
+
+    durum["last_updated_utc"] = _utc_now()
+    try:
+        writer.commit()
+    except Exception as e:
+        return _fail(f"failed to write DURUM.json: {e}")
+
+    print(f"[OK] archived {moved_total} history events from {touched} shots")
+    return 0
@@ -1,6 +1,12 @@
 import json
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
+from . import probe
+from .audit import is_safe_rel
+from .shot_table import ShotTable
+from .workspace import list_project_states
+
 
 def _fail(msg: str) -> int:
     print(f"[ERR] {msg}")
@@ -13,69 +19,131 @@ def _safe_str(x):
     return str(x)
 
 
-def cmd_listshots(args) -> int:
-    durum_path = Path(args.path)
+def _media(table: ShotTable, i: int, state_root: Path) -> str:
+    # cached probe of outputs['preview.mp4'] (one stat per unchanged file)
+    rel = (table.outputs(i) or {}).get("preview.mp4")
+    if not is_safe_rel(rel):
+        return "-"
+    return probe.format_media(probe.probe_video(state_root / rel))
+
+
+def _table_rows(table: ShotTable, status=None, phase=None, media_root: Path | None = None) -> list[tuple]:
+    # filters (optional); table rows are already in id order
+    rows = []
+    for i in table.select(status=status or None, phase=phase or None):
+        row = (
+            _safe_str(table.ids[i]),
+            _safe_str(table.phase_of(i)),
+            _safe_str(table.status_of(i)),
+            table.out_count[i],
+            _safe_str(table.prompt(i)),
+        )
+        if media_root is not None:
+            row += (_media(table, i, media_root),)
+        rows.append(row)
+    return rows
+
+
+def _print_rows(rows: list[tuple], project_col: list[str] | None = None, media: bool = False) -> None:
+    # table header (ID column widens for SH0001 / SC010_SH0001 style ids)
+    w = max([8] + [len(r[0]) for r in rows])
+    pw = max([8] + [len(p) for p in project_col]) if project_col is not None else 0
+    mw = max([5] + [len(r[5]) for r in rows]) if media else 0
+    prefix = f"{'PROJECT':<{pw}} " if project_col is not None else ""
+    mcol = f"{'MEDIA':<{mw}} " if media else ""
+    print(f"{prefix}{'ID':<{w}} {'PHASE':<8} {'STATUS':<12} {'OUT#':<5} {mcol}PROMPT")
+    print("-" * (72 + w + (pw + 1 if pw else 0) + (mw + 1 if mw else 0)))
+
+    for n, row in enumerate(rows):
+        sid, phase, status, out_count, prompt = row[:5]
+        p = prompt.replace("\n", " ").strip()
+        if len(p) > 60:
+            p = p[:57] + "..."
+        prefix = f"{project_col[n]:<{pw}} " if project_col is not None else ""
+        mcol = f"{row[5]:<{mw}} " if media else ""
+        print(f"{prefix}{sid:<{w}} {phase:<8} {status:<12} {str(out_count):<5} {mcol}{p}")
 
-    if not durum_path.exists() or not durum_path.is_file():
-        return _fail(f"cannot read {durum_path}")
 
+def _load_project(project_id: str, state_path: str, status, phase, media: bool = False):
+    """Worker: one project's rows + totals (runs in a separate process)."""
     try:
-        durum = json.loads(durum_path.read_text(encoding="utf-8"))
+        table = ShotTable.load(state_path)
     except Exception as e:
-        return _fail(f"invalid json: {e}")
+        return project_id, None, 0, 0, str(e), {}
+    rows = _table_rows(table, status, phase, Path(state_path).parent if media else None)
+    # new probe results go back to the parent, which saves the index once
+    return project_id, rows, table.count(), table.count(status="DONE"), "", probe.take_pending()
+
+
+def _list_workspace(args) -> int:
+    media = bool(getattr(args, "media", False))
+    states = list_project_states()
+    if not states:
+        return _fail("no projects/<id>/DURUM.json found")
+
+    with ProcessPoolExecutor(max_workers=min(len(states), 8)) as ex:
+        results = list(
+            ex.map(
+                _load_project,
+                [pid for pid, _ in states],
+                [str(p) for _, p in states],
+                [args.status] * len(states),
+                [args.phase] * len(states),
+                [media] * len(states),
+            )
+        )
 
-    shots = durum.get("shots")
-    if not isinstance(shots, dict):
-        return _fail("DURUM.json: 'shots' must be an object")
+    rows: list[tuple] = []
+    project_col: list[str] = []
+    failed = False
+    for pid, prow, _, _, err, probed in results:
+        probe.add_pending(probed)
+        if prow is None:
+            print(f"[ERR] {pid}: {err}")
+            failed = True
+            continue
+        rows.extend(prow)
+        project_col.extend([pid] * len(prow))
+    probe.save_index()
 
-    # collect
-    rows = []
-    for sid, shot in shots.items():
-        if not isinstance(shot, dict):
+    _print_rows(rows, project_col, media)
+
+    print("")
+    total = done = 0
+    for pid, prow, t, d, _, _ in results:
+        if prow is None:
             continue
+        total += t
+        done += d
+        print(f"{pid}: {t} shots | DONE: {d}")
+    print(f"TOTAL shots: {total} | DONE: {done} | projects: {len(results)}")
+    return 2 if failed else 0
 
-        status = shot.get("status", "")
-        phase = shot.get("phase", "")
-        prompt = ""
-        inputs = shot.get("inputs") or {}
-        if isinstance(inputs, dict):
-            prompt = inputs.get("prompt", "")
-
-        outputs = shot.get("outputs") or {}
-        out_count = len(outputs) if isinstance(outputs, dict) else 0
-
-        rows.append(
-            {
-                "id": _safe_str(sid),
-                "phase": _safe_str(phase),
-                "status": _safe_str(status),
-                "out_count": out_count,
-                "prompt": _safe_str(prompt),
-            }
-        )
 
-    # filters (optional)
-    if args.status:
-        rows = [r for r in rows if r["status"] == args.status]
-    if args.phase:
-        rows = [r for r in rows if r["phase"] == args.phase]
+def cmd_listshots(args) -> int:
+    if getattr(args, "all_projects", False):
+        return _list_workspace(args)
 
-    # sort by id
-    rows.sort(key=lambda r: r["id"])
+    durum_path = Path(args.path)
 
-    # table header
-    print(f"{'ID':<8} {'PHASE':<8} {'STATUS':<12} {'OUT#':<5} PROMPT")
-    print("-" * 80)
+    if not durum_path.exists() or not durum_path.is_file():
+        return _fail(f"cannot read {durum_path}")
 
-    for r in rows:
-        p = r["prompt"].replace("\n", " ").strip()
-        if len(p) > 60:
-            p = p[:57] + "..."
-        print(f"{r['id']:<8} {r['phase']:<8} {r['status']:<12} {str(r['out_count']):<5} {p}")
+    # one shot decoded at a time: the dict-of-dicts model is never built
+    try:
+        table = ShotTable.load(durum_path)
+    except json.JSONDecodeError as e:
+        return _fail(f"invalid json: {e}")
+    except ValueError as e:
+        return _fail(str(e))
+
+    media = bool(getattr(args, "media", False))
+    _print_rows(_table_rows(table, args.status, args.phase, durum_path.parent if media else None), media=media)
+    probe.save_index()
 
     # summary (total is ALL shots, not filtered)
-    total = len([1 for _, v in shots.items() if isinstance(v, dict)])
-    done = len([1 for _, v in shots.items() if isinstance(v, dict) and v.get("status") == "DONE"])
+    total = table.count()
+    done = table.count(status="DONE")
     print("")
     print(f"TOTAL shots: {total} | DONE: {done}")
 
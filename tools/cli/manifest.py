@@ -1,6 +1,10 @@
 ﻿import argparse, json, os, hashlib
 from datetime import datetime, timezone
 
+from .durum_io import write_json_atomic
+from .shot_index import sort_shot_ids
+from .statmap import StatMap
+
 SCHEMA = "cinev4/manifest@1"
 HASH_ALG = "sha256"
 
@@ -25,7 +29,8 @@ def _is_safe_relative(path: str) -> bool:
 def _collect_done_artifacts(durum: dict):
     shots = durum.get("shots", {}) or {}
     artifacts = []
-    for sid, sh in shots.items():
+    for sid in sort_shot_ids(shots.keys()):
+        sh = shots[sid]
         status = (sh or {}).get("status")
         if status != "DONE":
             continue
@@ -67,6 +72,8 @@ def main(argv=None):
 
     artifact_paths = _collect_done_artifacts(durum)
 
+    sm = StatMap.scan(os.path.join(repo_root, rel) for rel in artifact_paths if _is_safe_relative(rel))
+
     artifacts = []
     errors = []
     for rel in artifact_paths:
@@ -74,11 +81,12 @@ def main(argv=None):
             errors.append(f"BAD_PATH(not relative or escapes repo): {rel}")
             continue
         abs_path = os.path.join(repo_root, rel)
-        if not os.path.isfile(abs_path):
+        st = sm.stat(abs_path)
+        if st is None:
             errors.append(f"MISSING: {rel}")
             continue
 
-        size = os.path.getsize(abs_path)
+        size = st.size
         sha = _sha256_file(abs_path)
         artifacts.append({"path": rel.replace("\\", "/"), "size": size, "sha256": sha})
 
@@ -98,11 +106,7 @@ def main(argv=None):
     }
 
     out_path = os.path.join(rel_dir, "manifest.json")
-    tmp = out_path + ".tmp"
-    with open(tmp, "w", encoding="utf-8") as f:
-        json.dump(manifest, f, ensure_ascii=False, indent=2)
-        f.write("\n")
-    os.replace(tmp, out_path)
+    write_json_atomic(out_path, manifest)
 
     print("[OK] manifest written:", os.path.relpath(out_path, repo_root))
     print("[OK] artifacts:", len(artifacts))
@@ -0,0 +1,219 @@
+"""
+migrate-ids: validated bulk rewrite of shot ids (e.g. SH001 -> SH0001 or
+SH001 -> SC010_SH0001).
+
+- ids come from --width N (re-pad the SH number) and/or --map ids.json
+  (explicit {"old": "new"} object; wins over --width)
+- every new id must match shot_index.SHOT_ID_PATTERN and the final id set
+  must stay unique
+- outputs paths and history archive segment paths are rewritten where a
+  path segment equals the old id; such directories are renamed on disk
+- dry run by default; --apply performs directory moves, then one atomic
+  DURUM commit (moves are rolled back if the commit fails)
+"""
+from __future__ import annotations
+
+import json
+import re
+from datetime import datetime, timezone
+from pathlib import Path
+
+from .durum_io import DurumWriter
+from .history_archive import archive_marker
+from .shot_index import SCENE_PREFIX_PATTERN, SHOT_ID_PATTERN, is_valid_shot_id, sort_shot_ids
+
+# same scene prefix as SHOT_ID_PATTERN; any SH width (widening is what fixes short ones)
+_WIDEN_RE = re.compile(rf"^((?:{SCENE_PREFIX_PATTERN})?SH)([0-9]+)$")
+
+
+def _fail(msg: str) -> int:
+    print(f"[ERR] {msg}")
+    return 2
+
+
+def _utc_now() -> str:
+    return datetime.now(timezone.utc).replace(microsecond=0).isoformat().replace("+00:00", "Z")
+
+
+def _width_map(ids, width: int, errors: list) -> dict:
+    out = {}
+    for sid in ids:
+        m = _WIDEN_RE.match(str(sid))
+        if not m:
+            if "SH" in str(sid):
+                errors.append(f"{sid}: cannot re-pad, prefix does not match {SHOT_ID_PATTERN} (use --map)")
+            continue
+        prefix, digits = m.group(1), m.group(2)
+        n = int(digits)
+        if len(str(n)) > width:
+            errors.append(f"{sid}: number does not fit in --width {width}")
+            continue
+        new = f"{prefix}{n:0{width}d}"
+        if new != sid:
+            out[sid] = new
+    return out
+
+
+def _rewrite_path(rel: str, id_map: dict) -> tuple[str, int | None]:
+    """Returns (new_path, index of first rewritten segment or None)."""
+    segs = rel.split("/")
+    first = None
+    for i, s in enumerate(segs):
+        if s in id_map:
+            segs[i] = id_map[s]
+            if first is None:
+                first = i
+    return "/".join(segs), first
+
+
+def cmd_migrate_ids(args) -> int:
+    path = Path(args.path)
+    if not path.exists() or not path.is_file():
+        return _fail(f"cannot read {path}")
+    if args.width is None and args.map is None:
+        return _fail("migrate-ids requires --width and/or --map")
+    if args.width is not None and args.width < 3:
+        return _fail("--width must be >= 3")
+
+    writer = DurumWriter(path)
+    try:
+        durum = writer.durum
+    except Exception as e:
+        return _fail(f"invalid json: {e}")
+
+    shots = durum.get("shots")
+    if not isinstance(shots, dict):
+        return _fail("DURUM.json: 'shots' must be an object")
+
+    errors: list[str] = []
+
+    # 1) build old -> new map
+    id_map: dict = {}
+    if args.width is not None:
+        id_map.update(_width_map(shots.keys(), args.width, errors))
+    if args.map is not None:
+        try:
+            explicit = json.loads(Path(args.map).read_text(encoding="utf-8"))
+        except Exception as e:
+            return _fail(f"cannot read --map: {e}")
+        if not isinstance(explicit, dict):
+            return _fail("--map must be a JSON object {old_id: new_id}")
+        for old, new in explicit.items():
+            if old not in shots:
+                errors.append(f"{old}: not in DURUM (--map)")
+                continue
+            if new != old:
+                id_map[old] = new
+            else:
+                id_map.pop(old, None)
+
+    # 2) validate target ids
+    for old, new in id_map.items():
+        if not is_valid_shot_id(new):
+            errors.append(f"{old} -> {new}: does not match {SHOT_ID_PATTERN}")
+    final_ids: dict = {}
+    for sid in shots:
+        new = id_map.get(sid, sid)
+        if new in final_ids:
+            errors.append(f"{new}: id collision ({final_ids[new]} and {sid})")
+        else:
+            final_ids[new] = sid
+
+    # 3) plan path rewrites + directory moves
+    state_root = path.resolve().parent
+    rewrites = 0
+    moves: dict = {}
+    new_outputs: dict = {}
+    new_segments: dict = {}
+
+    def _plan(sid: str, rel: str) -> str:
+        nonlocal rewrites
+        new_rel, first = _rewrite_path(rel, id_map)
+        if first is None:
+            return rel
+        rewrites += 1
+        segs_old = rel.split("/")[: first + 1]
+        segs_new = new_rel.split("/")[: first + 1]
+        src = state_root.joinpath(*segs_old)
+        dst = state_root.joinpath(*segs_new)
+        if src.exists() and src not in moves:
+            if dst.exists():
+                errors.append(f"{sid}: cannot move {'/'.join(segs_old)} -> {'/'.join(segs_new)} (target exists)")
+            else:
+                moves[src] = dst
+        return new_rel
+
+    if id_map:
+        for sid, shot in shots.items():
+            if not isinstance(shot, dict):
+                continue
+            outputs = shot.get("outputs")
+            if isinstance(outputs, dict):
+                new_outputs[sid] = {
+                    k: (_plan(sid, v) if isinstance(v, str) else v) for k, v in outputs.items()
+                }
+            marker = archive_marker(shot)
+            if marker is not None:
+                new_segments[sid] = [
+                    dict(seg, path=_plan(sid, seg["path"])) for seg in marker.get("segments") or []
+                ]
+
+    if errors:
+        print("[FAIL] migrate-ids validation errors:")
+        for e in errors:
+            print(f"  - {e}")
+        return 1
+
+    if not id_map:
+        print("[OK] nothing to migrate")
+        return 0
+
+    print(f"[PLAN] ids: {len(id_map)} | path rewrites: {rewrites} | directory moves: {len(moves)}")
+    for old in sort_shot_ids(id_map):
+        print(f"  {old} -> {id_map[old]}")
+
+    if not args.apply:
+        print("[OK] dry run; re-run with --apply to migrate")
+        return 0
+
+    # 4) apply: directory moves first, then one DURUM commit
+    now = _utc_now()
+
+    def _mutate(d: dict) -> None:
+        old_shots = d["shots"]
+        rebuilt = {}
+        for sid in sort_shot_ids(final_ids.keys()):
+            old = final_ids[sid]
+            shot = old_shots[old]
+            if isinstance(shot, dict):
+                if old in new_outputs:
+                    shot["outputs"] = new_outputs[old]
+                if old in new_segments:
+                    archive_marker(shot)["segments"] = new_segments[old]
+                if old != sid:
+                    shot["id"] = sid
+                    hist = shot.get("history")
+                    if isinstance(hist, list):
+                        hist.append({"event": "ID_MIGRATED", "from": old, "to": sid, "at": now, "by": "cli"})
+            rebuilt[sid] = shot
+        d["shots"] = rebuilt
+        d["last_updated_utc"] = now
+
+    done_moves = []
+    try:
+        for src, dst in sorted(moves.items(), key=lambda kv: len(kv[0].parts), reverse=True):
+            dst.parent.mkdir(parents=True, exist_ok=True)
+            src.rename(dst)
+            done_moves.append((src, dst))
+        writer.queue(_mutate)
+        writer.commit()
+    except Exception as e:
+        for src, dst in reversed(done_moves):
+            try:
+                dst.rename(src)
+            except Exception:
+                pass
+        return _fail(f"migration failed, rolled back: {e}")
+
+    print(f"[OK] migrated {len(id_map)} shot ids")
+    return 0
@@ -0,0 +1,195 @@
+"""
+MP4 container sanity check and faststart remux, pure Python (no decode).
+
+check_mp4() walks the top-level ISO BMFF boxes (8/16-byte headers, one seek
+per box, O(boxes)) and reports:
+
+    {"ok": bool, "errors": [...], "warnings": [...], "boxes": ["ftyp", "free", "mdat", "moov"],
+     "moov_offset": 524, "mdat_offset": 36, "faststart": False}
+
+Errors: empty file, a first box that no MP4 starts with or a box type that
+is not 4 printable characters (not an MP4), an impossible box size, a box
+running past the end of the file (truncated upload), no moov or no mdat. A missing ftyp is only a warning
+(old QuickTime files start with moov / wide). faststart is True when moov
+comes before the first mdat: players and ffmpeg seeks then read the index
+from the head of the file instead of its tail.
+
+faststart(src, dst) writes a copy with moov moved in front of the first
+mdat: every stco / co64 chunk offset that pointed into the moved range is
+shifted by the moov size. Box payloads are copied as bytes; nothing is
+re-encoded. dst keeps its mode (or gets 0666 & ~umask when new).
+"""
+from __future__ import annotations
+
+import os
+import struct
+import tempfile
+from pathlib import Path
+from typing import NamedTuple
+
+from .durum_io import match_mode
+
+# boxes inside moov that hold other boxes on the way to stco / co64
+CONTAINERS = {b"moov", b"trak", b"mdia", b"minf", b"stbl", b"edts", b"dinf", b"mvex"}
+# what an MP4 / QuickTime file can start with
+FIRST_BOXES = {"ftyp", "styp", "moov", "mdat", "free", "skip", "wide", "pnot", "pdin", "uuid"}
+COPY_CHUNK = 1024 * 1024
+
+
+class Mp4Error(ValueError):
+    pass
+
+
+class Box(NamedTuple):
+    type: str
+    offset: int
+    size: int
+    header: int
+
+
+def _box_type_ok(t: bytes) -> bool:
+    return all(0x20 <= c < 0x7F or c == 0xA9 for c in t)  # 0xA9: QuickTime (c) atoms
+
+
+def read_boxes(path) -> tuple[list[Box], list[str]]:
+    """Top-level boxes and structural errors (parsing stops at the first error)."""
+    path = Path(path)
+    size = path.stat().st_size
+    boxes: list[Box] = []
+    if size == 0:
+        return boxes, ["empty file"]
+    with path.open("rb") as f:
+        pos = 0
+        while pos < size:
+            f.seek(pos)
+            head = f.read(16)
+            if len(head) < 8:
+                return boxes, [f"truncated box header at offset {pos}"]
+            n, t = struct.unpack_from(">I4s", head)
+            if not _box_type_ok(t) or (pos == 0 and t.decode("latin-1") not in FIRST_BOXES):
+                return boxes, [f"not an MP4 box at offset {pos} ({t!r})"]
+            hlen = 8
+            if n == 1:
+                if len(head) < 16:
+                    return boxes, [f"truncated box header at offset {pos}"]
+                n, hlen = struct.unpack_from(">Q", head, 8)[0], 16
+            elif n == 0:
+                n = size - pos  # box runs to end of file
+            name = t.decode("latin-1")
+            if n < hlen:
+                return boxes, [f"{name} box at offset {pos} has invalid size {n}"]
+            if pos + n > size:
+                return boxes, [f"{name} box at offset {pos} truncated ({size - pos} of {n} bytes present)"]
+            boxes.append(Box(name, pos, n, hlen))
+            pos += n
+    return boxes, []
+
+
+def check_mp4(path) -> dict:
+    """Structure report (see module docstring); never raises for bad content."""
+    try:
+        boxes, errors = read_boxes(path)
+    except OSError as e:
+        return {"ok": False, "errors": [f"cannot read: {e}"], "warnings": [], "boxes": [],
+                "moov_offset": None, "mdat_offset": None, "faststart": None}
+    warnings = []
+    types = [b.type for b in boxes]
+    moov = next((b for b in boxes if b.type == "moov"), None)
+    mdat = next((b for b in boxes if b.type == "mdat"), None)
+    if not errors:
+        if moov is None:
+            errors.append("no moov box")
+        if mdat is None:
+            errors.append("no mdat box")
+        if "ftyp" not in types:
+            warnings.append("no ftyp box")
+    return {
+        "ok": not errors,
+        "errors": errors,
+        "warnings": warnings,
+        "boxes": types,
+        "moov_offset": moov.offset if moov else None,
+        "mdat_offset": mdat.offset if mdat else None,
+        "faststart": moov.offset < mdat.offset if moov and mdat else None,
+    }
+
+
+def _shift_chunk_offsets(buf: bytearray, start: int, end: int, lo: int, hi: int, delta: int) -> None:
+    """Add delta to every stco / co64 entry in buf[start:end] that points into [lo, hi)."""
+    pos = start
+    while pos + 8 <= end:
+        n, t = struct.unpack_from(">I4s", buf, pos)
+        hlen = 8
+        if n == 1:
+            n, hlen = struct.unpack_from(">Q", buf, pos + 8)[0], 16
+        elif n == 0:
+            n = end - pos
+        if n < hlen or pos + n > end:
+            raise Mp4Error(f"bad {t!r} box inside moov at offset {pos}")
+        body = pos + hlen
+        if t in CONTAINERS:
+            _shift_chunk_offsets(buf, body, pos + n, lo, hi, delta)
+        elif t in (b"stco", b"co64"):
+            fmt = "I" if t == b"stco" else "Q"
+            count = struct.unpack_from(">I", buf, body + 4)[0]
+            if body + 8 + count * struct.calcsize(fmt) > pos + n:
+                raise Mp4Error(f"{t.decode()} entry count exceeds its box")
+            offsets = struct.unpack_from(f">{count}{fmt}", buf, body + 8)
+            shifted = [o + delta if lo <= o < hi else o for o in offsets]
+            if fmt == "I" and shifted and max(shifted) > 0xFFFFFFFF:
+                raise Mp4Error("chunk offsets exceed 32 bits after moving moov (stco would need co64)")
+            struct.pack_into(f">{count}{fmt}", buf, body + 8, *shifted)
+        pos += n
+
+
+def _copy_range(src, dst, offset: int, size: int) -> None:
+    src.seek(offset)
+    while size > 0:
+        chunk = src.read(min(COPY_CHUNK, size))
+        if not chunk:
+            raise Mp4Error("unexpected end of file while copying")
+        dst.write(chunk)
+        size -= len(chunk)
+
+
+def faststart(src, dst) -> bool:
+    """
+    Write src to dst with moov in front of the first mdat (atomic replace of dst).
+    Returns False, writing nothing, when src already is faststart.
+    """
+    src, dst = Path(src), Path(dst)
+    boxes, errors = read_boxes(src)
+    if errors:
+        raise Mp4Error(errors[0])
+    moov = next((b for b in boxes if b.type == "moov"), None)
+    mdat = next((b for b in boxes if b.type == "mdat"), None)
+    if moov is None or mdat is None:
+        raise Mp4Error("no moov box" if moov is None else "no mdat box")
+    if moov.offset < mdat.offset:
+        return False
+
+    with src.open("rb") as f:
+        f.seek(moov.offset)
+        buf = bytearray(f.read(moov.size))
+        # everything from the first mdat up to the old moov moves forward by moov.size
+        _shift_chunk_offsets(buf, moov.header, moov.size, mdat.offset, moov.offset, moov.size)
+
+        fd, tmp = tempfile.mkstemp(prefix=f".{dst.name}.", suffix=".tmp", dir=str(dst.parent))
+        try:
+            with os.fdopen(fd, "wb") as out:
+                match_mode(out.fileno(), dst)
+                for b in boxes:
+                    if b.offset == mdat.offset:
+                        out.write(buf)
+                    if b is not moov:
+                        _copy_range(f, out, b.offset, b.size)
+                out.flush()
+                os.fsync(out.fileno())
+            os.replace(tmp, dst)
+        except BaseException:
+            try:
+                os.unlink(tmp)
+            except OSError:
+                pass
+            raise
+    return True
@@ -1,7 +1,14 @@
+import csv
 import json
 from datetime import datetime, timezone
 from pathlib import Path
 
+from .durum_io import write_durum
+from .schema_compile import load_validator
+
+SHOT_SCHEMA_PATH = Path(__file__).resolve().parents[2] / "schema" / "shot.schema.json"
+
+
 def _fail(msg: str) -> int:
     print(f"[ERR] {msg}")
     return 2
@@ -14,33 +21,14 @@ def _utc_now() -> str:
         .replace("+00:00", "Z")
     )
 
-def cmd_newshot(args) -> int:
-    path = Path(args.path)
-
-    if not path.exists() or not path.is_file():
-        return _fail(f"cannot read {path}")
-
-    try:
-        durum = json.loads(path.read_text(encoding="utf-8"))
-    except Exception as e:
-        return _fail(f"invalid json: {e}")
 
-    shots = durum.get("shots")
-    if not isinstance(shots, dict):
-        return _fail("DURUM.json: 'shots' must be an object")
-
-    shot_id = args.shot_id
-    if shot_id in shots:
-        return _fail(f"shot already exists: {shot_id}")
-
-    now = _utc_now()
-
-    shots[shot_id] = {
+def _new_shot(shot_id: str, prompt, now: str, phase: str = "FAZ_1") -> dict:
+    return {
         "id": shot_id,
-        "phase": "FAZ_1",
+        "phase": phase,
         "status": "PLANNED",
         "inputs": {
-            "prompt": args.prompt
+            "prompt": prompt
         },
         "outputs": {},
         "history": [
@@ -58,13 +46,142 @@ def cmd_newshot(args) -> int:
         ]
     }
 
+
+def _shot_validator():
+    import jsonschema  # noqa: F401  (error messages)
+
+    return load_validator(SHOT_SCHEMA_PATH)
+
+
+def _schema_errors(validator, shot: dict) -> list[str]:
+    out = []
+    for err in sorted(validator.iter_errors(shot), key=lambda e: list(e.path)):
+        path = ".".join(str(p) for p in err.path) if err.path else "<root>"
+        out.append(f"{path}: {err.message}")
+    return out
+
+
+def _iter_records(src: Path):
+    """Stream (line_no, record) from .jsonl or .csv; record is a dict or an error string."""
+    suffix = src.suffix.lower()
+    with src.open("r", encoding="utf-8-sig", newline="") as f:
+        if suffix == ".csv":
+            reader = csv.DictReader(f)
+            for row in reader:
+                yield reader.line_num, {k.strip(): (v or "").strip() for k, v in row.items() if k}
+            return
+
+        for line_no, line in enumerate(f, start=1):
+            if not line.strip():
+                continue
+            try:
+                rec = json.loads(line)
+            except Exception as e:
+                yield line_no, f"invalid json: {e}"
+                continue
+            yield line_no, rec if isinstance(rec, dict) else "record must be an object"
+
+
+def _import_shots(durum: dict, src: Path, now: str) -> tuple[dict, list[str]]:
+    shots = durum["shots"]
+    validator = _shot_validator()
+
+    seen = set(shots.keys())
+    new_shots: dict = {}
+    errors: list[str] = []
+
+    for line_no, rec in _iter_records(src):
+        where = f"{src.name}:{line_no}"
+        if isinstance(rec, str):
+            errors.append(f"{where}: {rec}")
+            continue
+
+        shot_id = rec.get("id") or rec.get("shot_id")
+        if not isinstance(shot_id, str) or not shot_id.strip():
+            errors.append(f"{where}: missing id")
+            continue
+        shot_id = shot_id.strip()
+
+        if shot_id in seen:
+            origin = "in input" if shot_id in new_shots else "in DURUM"
+            errors.append(f"{where}: {shot_id}: shot already exists ({origin})")
+            continue
+        seen.add(shot_id)
+
+        shot = _new_shot(shot_id, rec.get("prompt"), now, rec.get("phase") or "FAZ_1")
+        bad = _schema_errors(validator, shot)
+        if bad:
+            errors.extend(f"{where}: {shot_id}:{e}" for e in bad)
+            continue
+        new_shots[shot_id] = shot
+
+    return new_shots, errors
+
+
+def cmd_newshot(args) -> int:
+    path = Path(args.path)
+
+    if not path.exists() or not path.is_file():
+        return _fail(f"cannot read {path}")
+
+    from_file = getattr(args, "from_file", None)
+    if from_file is None and (not args.shot_id or args.prompt is None):
+        return _fail("newshot requires shot_id and --prompt (or --from shots.jsonl|.csv)")
+    if from_file is not None and args.shot_id:
+        return _fail("use either shot_id or --from, not both")
+
+    try:
+        durum = json.loads(path.read_text(encoding="utf-8"))
+    except Exception as e:
+        return _fail(f"invalid json: {e}")
+
+    shots = durum.get("shots")
+    if not isinstance(shots, dict):
+        return _fail("DURUM.json: 'shots' must be an object")
+
+    now = _utc_now()
+
+    if from_file is not None:
+        src = Path(from_file)
+        if not src.is_file():
+            return _fail(f"cannot read {src}")
+        try:
+            new_shots, errors = _import_shots(durum, src, now)
+        except ImportError:
+            return _fail("Missing dependency: jsonschema. Install with: python -m pip install jsonschema")
+
+        if errors:
+            print(f"[ERR] {len(errors)} error(s) in {src}; nothing written")
+            for e in errors:
+                print(f"  - {e}")
+            return 2
+        if not new_shots:
+            return _fail(f"no shots in {src}")
+    else:
+        shot_id = args.shot_id
+        if shot_id in shots:
+            return _fail(f"shot already exists: {shot_id}")
+
+        shot = _new_shot(shot_id, args.prompt, now)
+        try:
+            bad = _schema_errors(_shot_validator(), shot)
+        except ImportError:
+            return _fail("Missing dependency: jsonschema. Install with: python -m pip install jsonschema")
+        if bad:
+            return _fail(f"{shot_id}: " + "; ".join(bad))
+        new_shots = {shot_id: shot}
+
+    shots.update(new_shots)
     durum["shots"] = shots
     durum["last_updated_utc"] = now
 
-    path.write_text(
-        json.dumps(durum, ensure_ascii=False, indent=2),
-        encoding="utf-8"
-    )
+    try:
+        write_durum(path, durum, touched=list(new_shots))
+    except Exception as e:
+        return _fail(f"failed to write DURUM.json: {e}")
 
-    print(f"[OK] created shot {shot_id}")
+    if len(new_shots) == 1:
+        print(f"[OK] created shot {next(iter(new_shots))}")
+    else:
+        print(f"[OK] created {len(new_shots)} shots")
     return 0
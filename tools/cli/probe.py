@@ -0,0 +1,202 @@
+"""
+Video probe metadata (duration, fps, resolution, codec), read once per file.
+
+probe_video() asks ffprobe when it is installed, otherwise OpenCV's capture
+properties (codec = FOURCC). Results are kept in one index file,
+<cache>/probe/index.json, keyed by absolute path and validated by the stat
+fingerprint (size, mtime_ns, inode): probing an unchanged file again costs one
+os.stat (the index is loaded once per process). Callers that already hold a
+stat result (StatMap) can pass its fingerprint and skip even that.
+
+    {"duration": 12.4, "fps": 25.0, "width": 1920, "height": 1080,
+     "codec": "h264", "frames": 310, "source": "ffprobe"}
+
+Values are None when the container does not say. Unreadable files give None
+and are not cached. Call save_index() once at the end of a command (the index
+is merged with what other processes wrote in the meantime); process pools
+pass take_pending() results back to the parent, which add_pending()s them.
+"""
+from __future__ import annotations
+
+import json
+import os
+import shutil
+import subprocess
+from pathlib import Path
+
+from .cache import cache_dir
+from .durum_io import write_json_atomic
+
+PROBE_VERSION = 1
+
+_INDEX: dict | None = None
+_DIRTY: dict[str, dict] = {}
+
+
+def _index_path() -> Path:
+    return cache_dir("probe") / "index.json"
+
+
+def _load_index() -> dict:
+    global _INDEX
+    if _INDEX is None:
+        try:
+            data = json.loads(_index_path().read_text(encoding="utf-8"))
+            _INDEX = data["entries"] if data.get("version") == PROBE_VERSION else {}
+        except Exception:
+            _INDEX = {}
+    return _INDEX
+
+
+def save_index() -> None:
+    """Write new entries (merged with the file as it is now); no-op when nothing changed."""
+    global _INDEX
+    if not _DIRTY:
+        return
+    try:
+        data = json.loads(_index_path().read_text(encoding="utf-8"))
+        entries = data["entries"] if data.get("version") == PROBE_VERSION else {}
+    except Exception:
+        entries = {}
+    entries.update(_DIRTY)
+    try:
+        write_json_atomic(_index_path(), {"version": PROBE_VERSION, "entries": entries})
+    except Exception:
+        return  # read-only cache: probed again next run
+    _INDEX = entries
+    _DIRTY.clear()
+
+
+def take_pending() -> dict:
+    """New entries not yet saved, removed from this process (batch workers hand them to the parent)."""
+    out = dict(_DIRTY)
+    _DIRTY.clear()
+    return out
+
+
+def add_pending(entries: dict) -> None:
+    _load_index().update(entries)
+    _DIRTY.update(entries)
+
+
+def fingerprint(path) -> list | None:
+    """[size, mtime_ns, inode] or None when the file is missing."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return [st.st_size, st.st_mtime_ns, st.st_ino]
+
+
+def _ffprobe(path: Path) -> dict | None:
+    cmd = [
+        "ffprobe", "-v", "error", "-select_streams", "v:0",
+        "-show_entries", "stream=codec_name,r_frame_rate,duration,width,height,nb_frames:format=duration",
+        "-of", "json", str(path),
+    ]
+    try:
+        r = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, check=True)
+        data = json.loads(r.stdout or b"{}")
+    except Exception:
+        return None
+    streams = data.get("streams") or []
+    if not streams:
+        return None
+    st = streams[0]
+
+    fps = None
+    num, _, den = str(st.get("r_frame_rate") or "").partition("/")
+    try:
+        fps = float(num) / float(den or 1) or None
+    except (ValueError, ZeroDivisionError):
+        pass
+    duration = None
+    for v in (st.get("duration"), (data.get("format") or {}).get("duration")):
+        try:
+            duration = float(v)
+            break
+        except (TypeError, ValueError):
+            continue
+    try:
+        frames = int(st.get("nb_frames"))
+    except (TypeError, ValueError):
+        frames = None
+    return {
+        "duration": duration,
+        "fps": fps,
+        "width": st.get("width") if isinstance(st.get("width"), int) else None,
+        "height": st.get("height") if isinstance(st.get("height"), int) else None,
+        "codec": st.get("codec_name") or None,
+        "frames": frames,
+        "source": "ffprobe",
+    }
+
+
+def _cv2_probe(path: Path) -> dict | None:
+    try:
+        import cv2
+    except ImportError:
+        return None
+    cap = cv2.VideoCapture(str(path))
+    try:
+        if not cap.isOpened():
+            return None
+        fps = cap.get(cv2.CAP_PROP_FPS) or 0.0
+        count = int(cap.get(cv2.CAP_PROP_FRAME_COUNT) or 0)
+        w = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH) or 0)
+        h = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT) or 0)
+        fourcc = int(cap.get(cv2.CAP_PROP_FOURCC) or 0)
+    finally:
+        cap.release()
+    codec = "".join(chr((fourcc >> (8 * i)) & 0xFF) for i in range(4)).strip("\x00 ").lower() or None
+    return {
+        "duration": round(count / fps, 6) if fps > 0 and count > 0 else None,
+        "fps": fps if fps > 0 else None,
+        "width": w or None,
+        "height": h or None,
+        "codec": codec,
+        "frames": count or None,
+        "source": "opencv",
+    }
+
+
+def probe_uncached(path) -> dict | None:
+    path = Path(path)
+    info = _ffprobe(path) if shutil.which("ffprobe") else None
+    return info or _cv2_probe(path)
+
+
+def probe_video(path, fp: list | None = None) -> dict | None:
+    """Metadata of a video file (see module docstring); fp: known stat fingerprint."""
+    path = Path(path).resolve()
+    fp = fp if fp is not None else fingerprint(path)
+    if fp is None:
+        return None
+    key = str(path)
+    entry = _load_index().get(key)
+    if entry is not None and entry.get("fp") == fp:
+        return entry["info"]
+
+    info = probe_uncached(path)
+    if info is None:
+        return None
+    entry = {"fp": fp, "info": info}
+    _INDEX[key] = entry
+    _DIRTY[key] = entry
+    return info
+
+
+def format_media(info: dict | None) -> str:
+    """12.40s 25fps 1920x1080 h264 (listshots column)."""
+    if not info:
+        return "-"
+    parts = []
+    if info.get("duration") is not None:
+        parts.append(f"{info['duration']:.2f}s")
+    if info.get("fps"):
+        parts.append(f"{info['fps']:.3g}fps")
+    if info.get("width") and info.get("height"):
+        parts.append(f"{info['width']}x{info['height']}")
+    if info.get("codec"):
+        parts.append(str(info["codec"]))
+    return " ".join(parts) or "-"
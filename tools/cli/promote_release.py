@@ -1,6 +1,9 @@
 import argparse, json, os
 from datetime import datetime, timezone
 
+from .durum_io import write_durum
+from .shot_table import ShotTable
+
 
 def _utc_now_z() -> str:
     return datetime.now(timezone.utc).replace(microsecond=0).isoformat().replace("+00:00", "Z")
@@ -16,12 +19,6 @@ def _read_json(path: str) -> dict:
         return json.load(f)
 
 
-def _write_json(path: str, data: dict) -> None:
-    with open(path, "w", encoding="utf-8") as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
-        f.write("\n")
-
-
 def _parse_shots_any(value):
     """
     Accept:
@@ -69,7 +66,7 @@ def cmd_promote_release(args) -> int:
 
     # selection
     if args.all_done:
-        selected = [sid for sid, sh in shots.items() if isinstance(sh, dict) and sh.get("status") == "DONE"]
+        selected = ShotTable.from_durum(durum).ids_where(status="DONE")
     else:
         selected = _parse_shots_any(args.shots)
         if not selected:
@@ -120,7 +117,7 @@ def cmd_promote_release(args) -> int:
     durum["last_updated_utc"] = now
 
     try:
-        _write_json(path, durum)
+        write_durum(path, durum, touched=selected)
     except Exception as e:
         return _fail(f"cannot write {path}: {e}")
 
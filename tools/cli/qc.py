@@ -1,11 +1,29 @@
 import json
 import hashlib
-import subprocess
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from datetime import datetime, timezone
 
-import cv2
-from jsonschema import validate, ValidationError
+from .durum_io import write_durum, write_json_atomic
+from .face_detect import get_detector
+from .history_archive import archive_marker, full_history, hot_history
+from . import qc_cache
+from . import probe
+from .mp4 import check_mp4
+from .perceptual import frame_hashes
+from .qc_frames import read_frames, sample_frames, samples_for_phase, write_frames
+from .qc_incremental import (
+    DEFAULT_REUSE_DIFF, boxes_from_json, boxes_to_json, face_key, frame_change, previous_qc,
+)
+from .qc_metrics import THRESHOLD_KEYS, frame_metrics, threshold_errors
+from .qc_timing import StageTimer, add_shared_stage, record_write_timing
+from .ref_index import DEFAULT_MAX_DISTANCE, DESCRIPTOR_VERSION, best_distance, ref_descriptor
+from .schema_compile import load_validator
+from .shot_index import sort_shot_ids
+
+QC_SCHEMA = Path(__file__).resolve().parents[2] / "schema" / "qc.schema.json"
 
 
 def _sha256_file(p: Path) -> str:
@@ -35,16 +53,27 @@ def _load_json(p: str) -> dict:
     return json.loads(Path(p).read_text(encoding="utf-8"))
 
 
-def _find_faz2_char_id(shot: dict) -> str | None:
-    """Find last FAZ2_LOCKS event and extract character_lock.id from its note JSON."""
-    hist = shot.get("history", [])
+def _last_faz2_locks(hist) -> dict | None:
     if not isinstance(hist, list):
         return None
-
-    last = None
-    for e in hist:
+    for e in reversed(hist):
         if isinstance(e, dict) and e.get("event") == "FAZ2_LOCKS":
-            last = e
+            return e
+    return None
+
+
+def _find_faz2_char_id(shot: dict, state_root: Path | None = None) -> str | None:
+    """Find last FAZ2_LOCKS event and extract character_lock.id from its note JSON.
+
+    Hot history is searched first; archived segments are only read when the
+    event is not there (and state_root is known).
+    """
+    last = _last_faz2_locks(hot_history(shot))
+    if last is None and state_root is not None and archive_marker(shot) is not None:
+        try:
+            last = _last_faz2_locks(full_history(shot, state_root))
+        except Exception:
+            last = None
 
     if not last:
         return None
@@ -68,68 +97,135 @@ def _find_faz2_char_id(shot: dict) -> str | None:
     cid = cl.get("id")
     return cid if isinstance(cid, str) and cid.strip() else None
 
-def _extract_frames_ffmpeg(preview_path: Path, frames_dir: Path) -> list[Path]:
-    """Extract 3 frames within a 1s clip using ffmpeg. Returns list of frame paths created."""
-    frames_dir.mkdir(parents=True, exist_ok=True)
-    out_paths: list[Path] = []
-
-    # video ~1.00s, so sample within duration
-    stamps = [0.2, 0.5, 0.8]
-    for i, t in enumerate(stamps, start=1):
-        out_img = frames_dir / f"f{i:02d}.png"
-        cmd = [
-            "ffmpeg",
-            "-y",
-            "-ss",
-            str(t),
-            "-i",
-            str(preview_path),
-            "-frames:v",
-            "1",
-            "-update",
-            "1",
-            str(out_img),
-        ]
-        subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, check=True)
-        if out_img.exists() and out_img.stat().st_size > 0:
-            out_paths.append(out_img)
-
-    return out_paths
-
-def _detect_face_any(frames: list[Path]) -> bool:
-    """Detect face in any frame using OpenCV Haar cascade."""
-    cascade_path = Path(cv2.data.haarcascades) / "haarcascade_frontalface_default.xml"
-    face_cascade = cv2.CascadeClassifier(str(cascade_path))
-
-    for fp in frames:
-        img = cv2.imread(str(fp))
-        if img is None:
-            continue
-        gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
-        faces = face_cascade.detectMultiScale(gray, scaleFactor=1.1, minNeighbors=5, minSize=(60, 60))
-        if len(faces) > 0:
-            return True
-    return False
-
-
-def cmd_qc(args) -> int:
-    durum_path = args.durum
-    shot_id = args.shot_id
-    # state root = DURUM.json'un bulunduğu klasör
-    state_root = Path(durum_path).resolve().parent
-
-    # out_dir: relative verilirse state_root altında çöz
-    out_dir = Path(args.out)
-    out_dir = out_dir.resolve() if out_dir.is_absolute() else (state_root / out_dir).resolve()
-
-
-    durum = _load_json(durum_path)
-    shots = durum.get("shots", {})
-    shot = shots.get(shot_id)
+def _detect_face_any(frames) -> bool:
+    """Detect face in any frame (BGR arrays); see face_detect.FaceDetector."""
+    return get_detector().any_face(frames)
+
+
+def _qc_options(args) -> dict:
+    """Per-run QC options (plain dict: passed to batch worker processes)."""
+    return {
+        "use_cache": not getattr(args, "no_cache", False),
+        "samples": getattr(args, "samples", None),
+        "keyframes": bool(getattr(args, "keyframes", False)),
+        "keep_frames": bool(getattr(args, "keep_frames", False)),
+        "identity_threshold": getattr(args, "identity_threshold", None),
+        "thresholds": {k: getattr(args, k, None) for k in THRESHOLD_KEYS},
+        "reuse_diff": getattr(args, "reuse_diff", None),
+    }
 
-    if not isinstance(shot, dict):
-        return _fail(f"{shot_id}: shot not found in DURUM")
 
+def _reuse_face(frames, prior: dict, ref_path: Path):
+    """
+    (face_detected, identity, boxes) without detection: the previous version's
+    face boxes on the new frames, identity recomputed against ref.jpg.
+    None when the stored boxes don't fit these frames.
+    """
+    ref_desc = ref_descriptor(ref_path)
+    if ref_desc is None:
+        return prior["face_detected"], {"ref_face": False, "distance": None}, None
+    boxes = boxes_from_json(prior["face_boxes"] or [], frames.shape[1:])
+    if boxes is None or len(boxes) != len(frames):
+        return None
+    return any(boxes), {"ref_face": True, "distance": best_distance(frames, boxes, ref_desc)}, boxes
+
+
+def _frame_stage(
+    preview_path: Path, out_dir: Path, ref_path: Path | None, n: int, keyframes: bool, keep_frames: bool,
+    timer: StageTimer, media: dict | None, prior: dict | None = None, reuse_diff: float = 0.0,
+) -> dict:
+    """
+    {"frames_extracted", "face_detected", "identity", "face_boxes", "picture", "incremental", "errors",
+     "warnings", "sampling", "cacheable"}
+    ref_path=None: picture metrics only (no character check, so a decode failure is a warning).
+    prior: qc_incremental.previous_qc() result; its face boxes are reused (identity
+    still recomputed) when the frames changed by at most reuse_diff.
+    """
+    failed = ["frame_extract_failed"]
+    res = {"frames_extracted": 0, "face_detected": False, "identity": {}, "face_boxes": None, "picture": {},
+           "incremental": {}, "errors": failed if ref_path else [], "warnings": [] if ref_path else failed,
+           "sampling": {}, "cacheable": False}
+    try:
+        # one decode session into a preallocated gray array; nothing hits the disk
+        sample = sample_frames(preview_path, n, keyframes, timer, media or {})
+        timer.bytes_read += preview_path.stat().st_size
+        if keep_frames:
+            with timer.stage("frame_write"):
+                write_frames(sample.frames, out_dir / "_qc_frames")
+    except Exception:
+        return res
+    res["sampling"] = {
+        "duration_sec": sample.duration,
+        "fps": sample.fps,
+        "sample_stamps": sample.stamps,
+        "keyframe_seek": sample.keyframes,
+    }
+    if len(sample.frames) == 0:
+        return res
+
+    timer.frames += len(sample.frames)
+
+    # black / freeze / blur + perceptual hashes (similar index) on the same frames
+    with timer.stage("metrics"):
+        res["picture"] = {**frame_metrics(sample.frames), **frame_hashes(sample.frames)}
+    res.update(frames_extracted=len(sample.frames), errors=[], warnings=[], cacheable=True)
+    if ref_path is None:
+        return res
+
+    if prior is not None and reuse_diff > 0:
+        # re-render: compare with the previous version at the same stamps
+        with timer.stage("incremental"):
+            change = None
+            if prior["stamps"] == sample.stamps:
+                try:
+                    change = frame_change(sample.frames, read_frames(prior["preview"], sample.stamps))
+                except Exception:
+                    change = None
+            face = _reuse_face(sample.frames, prior, ref_path) if change is not None and change <= reuse_diff else None
+        reused = face is not None
+        res["incremental"] = {
+            "prior_qc": prior["qc_rel"], "frame_change": change, "threshold": reuse_diff, "reused": reused,
+        }
+        if reused:
+            face_detected, identity, boxes = face
+            res.update(
+                face_detected=face_detected,
+                identity=identity,
+                face_boxes=boxes_to_json(boxes, sample.frames.shape[1:]) if boxes is not None else None,
+                errors=[] if face_detected else ["no_face_detected_in_preview"],
+                cacheable=False,  # the cache only holds results of a full detection
+            )
+            return res
+
+    with timer.stage("detect"):
+        # reference descriptor: computed once per ref.jpg (on-disk index), then memoized
+        ref_desc = ref_descriptor(ref_path)
+        if ref_desc is None:
+            face_detected = _detect_face_any(sample.frames)
+            identity = {"ref_face": False, "distance": None}
+        else:
+            boxes = get_detector().detect_all(sample.frames)
+            face_detected = any(boxes)
+            identity = {"ref_face": True, "distance": best_distance(sample.frames, boxes, ref_desc)}
+            res["face_boxes"] = boxes_to_json(boxes, sample.frames.shape[1:])  # for the next re-render
+
+    res.update(
+        face_detected=face_detected,
+        identity=identity,
+        errors=[] if face_detected else ["no_face_detected_in_preview"],
+    )
+    return res
+
+
+def run_shot_qc(state_root: Path, shot_id: str, shot: dict, out_dir: Path, opts: dict | None = None) -> dict:
+    """
+    QC one shot: writes <out_dir>/qc.json and returns {"shot_id", "cache_hit", "qc",
+    "outputs" (DURUM outputs to merge), "qc_rel", "qc_write", "frames", "seconds"}.
+    DURUM itself is not touched; callers merge "outputs" and write state once.
+    """
+    opts = opts or {}
+    t0 = time.perf_counter()
+    timer = StageTimer()
     out_dir.mkdir(parents=True, exist_ok=True)
 
     qc_path = out_dir / "qc.json"
@@ -144,19 +240,19 @@ def cmd_qc(args) -> int:
         errors.append("missing preview.mp4")
 
     # base metrics
-    metrics = {
-        "preview_exists": preview_exists,
-        "preview_bytes": int(preview_path.stat().st_size) if preview_exists else 0,
-        "preview_sha256": _sha256_file(preview_path) if preview_exists else "",
-        "preview_mtime_utc": _utc_iso_from_mtime(preview_path) if preview_exists else "",
-    }
+    with timer.stage("hash"):
+        metrics = {
+            "preview_exists": preview_exists,
+            "preview_bytes": int(preview_path.stat().st_size) if preview_exists else 0,
+            "preview_sha256": _sha256_file(preview_path) if preview_exists else "",
+            "preview_mtime_utc": _utc_iso_from_mtime(preview_path) if preview_exists else "",
+        }
+    timer.bytes_read += metrics["preview_bytes"]
 
     # -------------------------------
     # FAZ_2 Passive Character Check
     # -------------------------------
-    state_root = Path(durum_path).resolve().parent
-
-    char_id = _find_faz2_char_id(shot)
+    char_id = _find_faz2_char_id(shot, state_root)
     if not char_id:
         warnings.append("FAZ2_LOCKS missing or invalid; character check not evaluated")
 
@@ -171,22 +267,99 @@ def cmd_qc(args) -> int:
 
     frames_extracted = 0
     face_detected = False
+    identity: dict = {}
+    cache_hit = False
 
-    if preview_exists and char_id and ref_exists:
-        try:
-            frames_dir = out_dir / "_qc_frames"
-            frames = _extract_frames_ffmpeg(preview_path, frames_dir)
-            frames_extracted = len(frames)
-            if frames_extracted == 0:
-                errors.append("frame_extract_failed")
-            else:
-                face_detected = _detect_face_any(frames)
-                if not face_detected:
-                    errors.append("no_face_detected_in_preview")
-        except Exception:
-            errors.append("frame_extract_failed")
+    container_ok = preview_exists
+    if preview_exists:
+        # box structure only (no decode): truncated / non-MP4 files fail here, before any decoder runs
+        with timer.stage("container"):
+            container = check_mp4(preview_path)
+        metrics["container"] = {k: container[k] for k in ("boxes", "moov_offset", "mdat_offset", "faststart")}
+        container_ok = container["ok"]
+        if not container_ok:
+            errors.append("preview_container_invalid")
+            warnings.extend(f"preview.mp4: {e}" for e in container["errors"])
+        elif container["faststart"] is False:
+            warnings.append("preview.mp4 is not faststart (moov after mdat); render --faststart rewrites it")
+
+    if container_ok:
+        # container metadata: probed once per file, then one stat per run
+        with timer.stage("probe"):
+            media = probe.probe_video(preview_path)
+        metrics["media"] = media or {}
+
+        # face / identity only with a character ref; picture metrics always
+        face_ref = ref_path if char_id and ref_exists else None
+        # N frames spread over the clip; N per phase unless --samples
+        n = opts.get("samples") or samples_for_phase(shot.get("phase"))
+        keyframes = bool(opts.get("keyframes"))
+        keep_frames = bool(opts.get("keep_frames"))
+
+        # same preview + ref + character + algorithm -> same frame/face result
+        with timer.stage("hash"):
+            ref_sha = _sha256_file(face_ref) if face_ref else ""
+        if face_ref:
+            timer.bytes_read += face_ref.stat().st_size
+            metrics["face_key"] = face_key(char_id, ref_sha, get_detector().config(), DESCRIPTOR_VERSION)
+        key = None
+        if opts.get("use_cache", True):
+            config = {
+                "sampling": {"n": n, "keyframes": keyframes},
+                "detector": get_detector().config(),
+                "identity": DESCRIPTOR_VERSION,
+            }
+            key = qc_cache.qc_cache_key(metrics["preview_sha256"], ref_sha, char_id if face_ref else "", config)
+        # --keep-frames wants the frames on disk, so it always decodes
+        with timer.stage("cache"):
+            stage = qc_cache.get(key) if key and not keep_frames else None
+        cache_hit = stage is not None
+
+        if stage is None:
+            # previous version of this shot (re-render): its face boxes may be reusable (opt-in)
+            reuse_diff = opts.get("reuse_diff")
+            reuse_diff = DEFAULT_REUSE_DIFF if reuse_diff is None else float(reuse_diff)
+            prior = None
+            if face_ref and reuse_diff > 0:
+                prior = previous_qc(state_root, shot, out_dir, metrics["face_key"])
+            stage = _frame_stage(
+                preview_path, out_dir, face_ref, n, keyframes, keep_frames, timer, media, prior, reuse_diff,
+            )
+            if key and stage.pop("cacheable"):
+                with timer.stage("cache"):
+                    qc_cache.put(key, {**stage, "incremental": {}})  # the comparison belongs to this run
+
+        frames_extracted = int(stage["frames_extracted"])
+        face_detected = bool(stage["face_detected"])
+        identity = stage.get("identity") or {}
+        errors.extend(stage["errors"])
+        warnings.extend(stage["warnings"])
+        metrics.update(stage["sampling"])
+        metrics.update(stage["picture"])
+        if stage.get("face_boxes") is not None:
+            metrics["face_boxes"] = stage["face_boxes"]
+        if stage.get("incremental"):
+            metrics["incremental"] = stage["incremental"]
+        errors.extend(threshold_errors(stage["picture"], opts.get("thresholds") or {}))
+
+    # identity: closest preview face vs. the character's reference descriptor
+    threshold = opts.get("identity_threshold")
+    threshold = DEFAULT_MAX_DISTANCE if threshold is None else float(threshold)
+    identity_distance = identity.get("distance")
+    if not identity:
+        identity_status = "NOT_EVALUATED"
+    elif not identity.get("ref_face"):
+        identity_status = "NO_REF_FACE"
+        warnings.append(f"no face detected in {ref_rel}; identity not checked")
+    elif identity_distance is None:
+        identity_status = "NO_PREVIEW_FACE"
+    elif identity_distance > threshold:
+        identity_status = "MISMATCH"
+        errors.append("identity_mismatch")
+    else:
+        identity_status = "MATCH"
 
-    # Passive status logic (no identity embedding yet)
+    # Passive status logic (face presence + reference identity)
     if not char_id:
         passive_status = "NOT_EVALUATED"
     elif not ref_exists:
@@ -197,6 +370,8 @@ def cmd_qc(args) -> int:
         passive_status = "FAIL_NO_FRAMES"
     elif not face_detected:
         passive_status = "FAIL_NO_FACE"
+    elif identity_status == "MISMATCH":
+        passive_status = "FAIL_IDENTITY"
     else:
         passive_status = "PASSIVE_OK"
 
@@ -206,7 +381,11 @@ def cmd_qc(args) -> int:
     metrics["ref_exists"] = bool(ref_exists)
     metrics["frames_extracted"] = int(frames_extracted)
     metrics["face_detected"] = bool(face_detected)
+    metrics["identity_status"] = identity_status
+    metrics["identity_distance"] = identity_distance
+    metrics["identity_threshold"] = threshold
     metrics["character_passive_status"] = passive_status
+    metrics["cache_hit"] = cache_hit
 
     # artifacts
     artifacts = [
@@ -225,39 +404,218 @@ def cmd_qc(args) -> int:
         "artifacts": artifacts,
     }
 
-    # self-validate qc against schema
-    try:
-        schema_path = Path(__file__).resolve().parents[2] / "schema" / "qc.schema.json"
-        qc_schema = json.loads(schema_path.read_text(encoding="utf-8"))
-        validate(instance=qc, schema=qc_schema)
-    except ValidationError:
+    # self-validate qc against schema (compiled, cached per process)
+    metrics["timing"] = timer.to_json()  # validated shape; final numbers set below
+    with timer.stage("schema_validate"):
+        valid = load_validator(QC_SCHEMA).is_valid(qc)
+    if not valid:
         qc["ok"] = False
         qc["errors"].append("qc.json does not conform to schema")
 
-    qc_path.write_text(json.dumps(qc, ensure_ascii=False, indent=2), encoding="utf-8")
-
-    # write outputs into DURUM
-    outputs = shot.get("outputs")
-    if not isinstance(outputs, dict):
-        shot["outputs"] = {}
-        outputs = shot["outputs"]
+    metrics["timing"] = timer.to_json()
+    with timer.stage("qc_write"):
+        write_json_atomic(qc_path, qc)
 
     # relative paths (state_root baz alınır)
     qc_rel = qc_path.relative_to(state_root).as_posix()
-    outputs["qc.json"] = qc_rel
-
+    outputs = {"qc.json": qc_rel}
     if preview_exists:
-        preview_rel = preview_path.relative_to(state_root).as_posix()
-        outputs["preview.mp4"] = preview_rel
+        outputs["preview.mp4"] = preview_path.relative_to(state_root).as_posix()
+
+    return {
+        "shot_id": shot_id,
+        "cache_hit": cache_hit,
+        "qc": qc,
+        "outputs": outputs,
+        "qc_rel": qc_rel,
+        "qc_write": timer.to_json()["stages"]["qc_write"],  # cannot be in the file it times
+        "frames": 0 if cache_hit else int(frames_extracted),  # frames decoded in this run
+        "seconds": time.perf_counter() - t0,
+    }
+
 
+def _write_state(durum_path: Path, durum: dict, state_root: Path, results: list[dict]) -> None:
+    """
+    Merge outputs and write DURUM once (every qc.json is already on disk), then
+    record qc_write and the shared state_write in the qc-timing sidecar.
+    """
+    sw = StageTimer()
+    with sw.stage("state_write"):
+        _merge_outputs(durum, results)
+        write_durum(durum_path, durum, touched=[r["shot_id"] for r in results])
+    entries = {}
+    for r in results:
+        entry = {"utc": r["qc"]["utc"], "stages": {"qc_write": r["qc_write"]}}
+        add_shared_stage(entry, "state_write", sw, len(results))
+        entries[r["qc_rel"]] = entry
+    record_write_timing(state_root, entries)
+
+
+def _merge_outputs(durum: dict, results: list[dict]) -> None:
+    shots = durum.get("shots", {})
+    for r in results:
+        shot = shots[r["shot_id"]]
+        outputs = shot.get("outputs")
+        if not isinstance(outputs, dict):
+            shot["outputs"] = {}
+            outputs = shot["outputs"]
+        outputs.update(r["outputs"])
     durum["last_updated_utc"] = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
-    Path(durum_path).write_text(
-        json.dumps(durum, ensure_ascii=False, indent=2),
-        encoding="utf-8"
-    )
 
-    print(f"[OK] {shot_id}: wrote {qc_rel}")
-    return 0
+
+def _resolve_out_dir(state_root: Path, out) -> Path:
+    # out_dir: relative verilirse state_root altında çöz
+    out_dir = Path(out)
+    return out_dir.resolve() if out_dir.is_absolute() else (state_root / out_dir).resolve()
+
+
+def _default_out_dir(state_root: Path, shot: dict) -> Path | None:
+    """Batch mode: QC next to the shot's current preview.mp4."""
+    rel = (shot.get("outputs") or {}).get("preview.mp4")
+    if not isinstance(rel, str) or not rel.strip():
+        return None
+    return _resolve_out_dir(state_root, Path(rel).parent)
+
+
+def _qc_worker(state_root: str, shot_id: str, shot: dict, out_dir: str, opts: dict | None = None) -> dict:
+    """ProcessPool entry: one shot. The cascade stays loaded in the worker."""
+    try:
+        r = run_shot_qc(Path(state_root), shot_id, shot, Path(out_dir), opts)
+        r["probe_entries"] = probe.take_pending()  # saved once by the parent
+        return r
+    except Exception as e:
+        return {"shot_id": shot_id, "error": f"{type(e).__name__}: {e}", "frames": 0, "seconds": 0.0}
+
+
+def _select_batch(args, shots: dict) -> list[str]:
+    if args.all:
+        ids = list(shots)
+    elif args.status:
+        want = args.status.strip().upper()
+        ids = [sid for sid, sh in shots.items()
+               if isinstance(sh, dict) and str(sh.get("status") or "").upper() == want]
+    else:
+        ids = list(args.shots)
+    return sort_shot_ids(ids)
 
 
+def _print_summary(results: list[dict], wall: float) -> None:
+    w = max([8] + [len(r["shot_id"]) for r in results])
+    print(f"{'ID':<{w}} {'QC':<5} {'PASSIVE':<16} {'FRAMES':<7} {'SEC':<7} DETAIL")
+    print("-" * (60 + w))
+    for r in results:
+        if "error" in r:
+            print(f"{r['shot_id']:<{w}} {'ERR':<5} {'-':<16} {0:<7} {0.0:<7.2f} {r['error']}")
+            continue
+        qc = r["qc"]
+        m = qc.get("metrics") or {}
+        detail = "; ".join(qc.get("errors") or []) or r["qc_rel"]
+        if r.get("cache_hit"):
+            detail += " (cache hit)"
+        elif (m.get("incremental") or {}).get("reused"):
+            detail += f" (reused {m['incremental']['prior_qc']})"
+        print(
+            f"{r['shot_id']:<{w}} {'ok' if qc.get('ok') else 'FAIL':<5} "
+            f"{m.get('character_passive_status', ''):<16} {r['frames']:<7} {r['seconds']:<7.2f} {detail}"
+        )
+    frames = sum(r["frames"] for r in results)
+    ok = sum(1 for r in results if "error" not in r and r["qc"].get("ok"))
+    hits = sum(1 for r in results if r.get("cache_hit"))
+    fps = frames / wall if wall > 0 else 0.0
+    print("")
+    print(f"shots: {len(results)} | qc ok: {ok} | cache hits: {hits} | frames: {frames} | wall: {wall:.2f}s | {fps:.1f} frames/sec")
+
+
+def _cmd_qc_batch(args, durum_path: Path, state_root: Path) -> int:
+    durum = _load_json(str(durum_path))
+    shots = durum.get("shots", {})
+
+    ids = _select_batch(args, shots)
+    if not ids:
+        return _fail("no shots selected for QC")
+
+    jobs_list = []
+    for sid in ids:
+        shot = shots.get(sid)
+        if not isinstance(shot, dict):
+            return _fail(f"{sid}: shot not found in DURUM")
+        out_dir = _default_out_dir(state_root, shot)
+        if out_dir is None:
+            return _fail(f"{sid}: outputs['preview.mp4'] not set (use single-shot qc with --out)")
+        jobs_list.append((sid, shot, out_dir))
+
+    opts = _qc_options(args)
+    n_jobs = args.jobs if args.jobs and args.jobs > 0 else min(len(jobs_list), os.cpu_count() or 1)
+    t0 = time.perf_counter()
+    if n_jobs <= 1 or len(jobs_list) == 1:
+        results = [_qc_worker(str(state_root), sid, sh, str(od), opts) for sid, sh, od in jobs_list]
+    else:
+        with ProcessPoolExecutor(max_workers=n_jobs) as ex:
+            results = list(ex.map(
+                _qc_worker,
+                [str(state_root)] * len(jobs_list),
+                [sid for sid, _, _ in jobs_list],
+                [sh for _, sh, _ in jobs_list],
+                [str(od) for _, _, od in jobs_list],
+                [opts] * len(jobs_list),
+            ))
+    wall = time.perf_counter() - t0
+
+    for r in results:
+        probe.add_pending(r.pop("probe_entries", None) or {})
+    probe.save_index()
+
+    # one atomic DURUM write for every shot that produced a qc.json
+    done = [r for r in results if "error" not in r]
+    if done:
+        _write_state(durum_path, durum, state_root, done)
+
+    _print_summary(results, wall)
+    return 0 if len(done) == len(results) else 1
 
+
+def cmd_qc(args) -> int:
+    durum_path = Path(args.durum)
+    # state root = DURUM.json'un bulunduğu klasör
+    state_root = durum_path.resolve().parent
+
+    if getattr(args, "samples", None) is not None and args.samples < 1:
+        return _fail("--samples must be >= 1")
+    if getattr(args, "identity_threshold", None) is not None and not 0.0 <= args.identity_threshold <= 1.0:
+        return _fail("--identity-threshold must be within [0, 1]")
+    if getattr(args, "reuse_diff", None) is not None and args.reuse_diff < 0:
+        return _fail("--reuse-diff must be >= 0 (0 disables incremental QC)")
+
+    batch = bool(getattr(args, "all", False) or getattr(args, "status", None) or getattr(args, "shots", None))
+    if batch:
+        if args.shot_id:
+            return _fail("use either shot_id or --shots/--status/--all, not both")
+        if args.out:
+            return _fail("--out is per shot; batch QC writes next to each shot's preview.mp4")
+        return _cmd_qc_batch(args, durum_path, state_root)
+
+    shot_id = args.shot_id
+    if not shot_id:
+        return _fail("qc requires shot_id (or --shots/--status/--all)")
+
+    durum = _load_json(str(durum_path))
+    shots = durum.get("shots", {})
+    shot = shots.get(shot_id)
+
+    if not isinstance(shot, dict):
+        return _fail(f"{shot_id}: shot not found in DURUM")
+
+    out_dir = _resolve_out_dir(state_root, args.out) if args.out else _default_out_dir(state_root, shot)
+    if out_dir is None:
+        return _fail(f"{shot_id}: --out is required (outputs['preview.mp4'] not set)")
+
+    r = run_shot_qc(state_root, shot_id, shot, out_dir, _qc_options(args))
+    probe.save_index()
+
+    # write outputs into DURUM
+    _write_state(durum_path, durum, state_root, [r])
+
+    incremental = r["qc"]["metrics"].get("incremental") or {}
+    note = " (cache hit)" if r["cache_hit"] else (f" (reused {incremental['prior_qc']})" if incremental.get("reused") else "")
+    print(f"[OK] {shot_id}: wrote {r['qc_rel']}{note}")
+    return 0
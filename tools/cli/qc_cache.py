@@ -0,0 +1,53 @@
+"""
+Content-keyed QC result cache.
+
+The expensive part of QC (frame sampling, picture metrics, face detection)
+depends only on the preview bytes, the character's ref.jpg, the character id
+and the QC algorithm / its configuration (ref/char are "" for shots without
+a character check). Results are stored under <cache>/qc/ keyed by
+
+    sha256(canonical {preview_sha256, ref_sha256, char_id, algo, config})
+
+so re-running qc on an unchanged shot reuses them; qc.json is still written
+fresh and carries metrics.cache_hit. Bump QC_ALGO_VERSION whenever the
+sampling / detection code changes in a way the config does not capture.
+"""
+from __future__ import annotations
+
+import json
+
+from .cache import cache_dir
+from .canonical_json import sha256_json
+
+QC_ALGO_VERSION = "4"
+
+
+def qc_cache_key(preview_sha256: str, ref_sha256: str, char_id: str, config: dict) -> str:
+    return sha256_json({
+        "preview_sha256": preview_sha256,
+        "ref_sha256": ref_sha256,
+        "char_id": char_id,
+        "algo": QC_ALGO_VERSION,
+        "config": config,
+    })
+
+
+def _entry_path(key: str):
+    return cache_dir("qc", key[:2]) / f"{key}.json"
+
+
+def get(key: str) -> dict | None:
+    try:
+        data = json.loads(_entry_path(key).read_text(encoding="utf-8"))
+    except Exception:
+        return None
+    return data if isinstance(data, dict) and data.get("key") == key else None
+
+
+def put(key: str, result: dict) -> None:
+    from .durum_io import write_json_atomic
+
+    try:
+        write_json_atomic(_entry_path(key), {**result, "key": key})
+    except Exception:
+        pass  # read-only cache: QC result is still correct, just not reused
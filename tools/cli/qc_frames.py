@@ -0,0 +1,217 @@
+"""
+QC frame sampling: one decode session per preview, frames kept in memory.
+
+sample_frames() takes duration / fps / size from probe.probe_video (cached per
+file; callers may pass what they already probed), spreads N timestamps across
+the clip (centre of N equal segments), opens the preview once with
+cv2.VideoCapture and seeks to each. When OpenCV cannot open the container, a
+single ffmpeg call with a select filter pipes all frames as raw gray on stdout.
+
+Frames come back as one preallocated uint8 array of shape (n, h, w), gray
+(what detection and the metrics need); decoded BGR frames are converted
+straight into it and ffmpeg output is read into it with readinto(), so no
+per-frame encode/decode or file round trip happens.
+
+keyframes=True trades exact stamps for speed: ffmpeg decodes keyframes only
+(-skip_frame nokey) and takes the first keyframe at/after each stamp. Needs
+ffmpeg; without it (or when no keyframe follows a stamp) exact seeking is used.
+
+N comes from SAMPLES_BY_PHASE (DEFAULT_SAMPLES for other phases) unless the
+caller overrides it. read_frames() still samples fixed stamps.
+
+Nothing is written to disk unless asked: write_frames() stores debug copies
+(qc --keep-frames: <out>/_qc_frames/f01.png, f02.png, ...).
+"""
+from __future__ import annotations
+
+import shutil
+import subprocess
+from pathlib import Path
+from typing import NamedTuple
+
+import cv2
+import numpy as np
+
+from .probe import probe_video
+from .qc_timing import timed
+
+# fixed stamps for read_frames(); also what sampling assumes when the
+# duration cannot be probed (previews used to be ~1.00s)
+DEFAULT_STAMPS = (0.2, 0.5, 0.8)
+ASSUMED_DURATION = 1.0
+
+DEFAULT_SAMPLES = 3
+SAMPLES_BY_PHASE = {
+    "FAZ_1": 3,
+    "FAZ_2": 5,  # character check: more chances to catch the face
+}
+
+
+class FrameSample(NamedTuple):
+    frames: np.ndarray  # (n, h, w) uint8 gray
+    stamps: list[float]  # stamps[i] is where frames[i] was taken; stamps that did not decode are dropped
+    duration: float | None
+    fps: float | None
+    keyframes: bool
+
+
+def samples_for_phase(phase) -> int:
+    return SAMPLES_BY_PHASE.get(str(phase or ""), DEFAULT_SAMPLES)
+
+
+def spread_stamps(duration: float | None, n: int) -> list[float]:
+    """n stamps at the centres of n equal segments of [0, duration)."""
+    d = duration if duration and duration > 0 else ASSUMED_DURATION
+    n = max(1, int(n))
+    return [round(d * (i + 0.5) / n, 3) for i in range(n)]
+
+
+def _empty() -> np.ndarray:
+    return np.empty((0, 0, 0), np.uint8)
+
+
+def _probe_cap(cap) -> tuple[float | None, float | None]:
+    """(duration seconds, fps) from an open capture; None when unknown."""
+    fps = cap.get(cv2.CAP_PROP_FPS) or 0.0
+    count = cap.get(cv2.CAP_PROP_FRAME_COUNT) or 0.0
+    if fps <= 0:
+        return None, None
+    return (count / fps if count > 0 else None), fps
+
+
+def _seek_read(cap, stamps) -> tuple[np.ndarray, list]:
+    """(frames, the stamps they were decoded at)."""
+    w = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
+    h = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+    if w <= 0 or h <= 0:
+        return _empty(), []
+    out = np.empty((len(stamps), h, w), np.uint8)
+    bgr = np.empty((h, w, 3), np.uint8)  # decode buffer, reused for every stamp
+    kept = []
+    for t in stamps:
+        if not cap.set(cv2.CAP_PROP_POS_MSEC, float(t) * 1000.0):
+            continue
+        ok, img = cap.read(bgr)
+        if not ok or img is None or img.shape[:2] != (h, w):
+            continue
+        cv2.cvtColor(img, cv2.COLOR_BGR2GRAY, dst=out[len(kept)])
+        kept.append(t)
+    return out[:len(kept)], kept
+
+
+def _read_frames_cv2(preview_path: Path, stamps) -> tuple[np.ndarray, list] | None:
+    cap = cv2.VideoCapture(str(preview_path))
+    try:
+        if not cap.isOpened():
+            return None
+        return _seek_read(cap, stamps)
+    finally:
+        cap.release()
+
+
+def _sample_cv2(preview_path: Path, n: int, info: dict, timer=None) -> FrameSample | None:
+    with timed(timer, "extract"):
+        cap = cv2.VideoCapture(str(preview_path))
+    try:
+        if not cap.isOpened():
+            return None
+        duration, fps = info.get("duration"), info.get("fps")
+        if duration is None:
+            duration, fps = _probe_cap(cap)
+        stamps = spread_stamps(duration, n)
+        with timed(timer, "extract"):
+            frames, stamps = _seek_read(cap, stamps)
+        return FrameSample(frames, stamps, duration, fps, False)
+    finally:
+        cap.release()
+
+
+def _select_expr(stamps) -> str:
+    return "+".join(f"(lt(prev_pts*TB\\,{t})*gte(pts*TB\\,{t}))" for t in stamps)
+
+
+def _read_frames_ffmpeg(preview_path: Path, stamps, size, keyframes: bool = False) -> np.ndarray:
+    """
+    All stamps in one ffmpeg run: select the first (key)frame at/after each stamp.
+    The output does not say which stamp a frame belongs to, so it is all
+    stamps or nothing (a stamp past the end, or two stamps on one frame, give
+    fewer frames than stamps).
+    """
+    w, h = size
+    if shutil.which("ffmpeg") is None or not w or not h:
+        return _empty()
+    cmd = ["ffmpeg", "-v", "error"]
+    if keyframes:
+        cmd += ["-skip_frame", "nokey"]
+    cmd += [
+        "-i", str(preview_path),
+        "-vf", f"select='{_select_expr(stamps)}'", "-fps_mode", "passthrough",
+        "-f", "rawvideo", "-pix_fmt", "gray", "-",
+    ]
+    out = np.empty((len(stamps), h, w), np.uint8)
+    k = 0
+    with subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL) as p:
+        while k < len(stamps):
+            view = memoryview(out[k]).cast("B")
+            got = 0
+            while got < len(view):
+                n = p.stdout.readinto(view[got:])
+                if not n:
+                    break
+                got += n
+            if got < len(view):
+                break
+            k += 1
+        p.stdout.close()
+    return out if k == len(stamps) else _empty()
+
+
+def read_frames(preview_path, stamps=DEFAULT_STAMPS) -> np.ndarray:
+    """Gray frames (n, h, w) at `stamps` (seconds); frames that cannot be decoded are skipped."""
+    preview_path = Path(preview_path)
+    res = _read_frames_cv2(preview_path, stamps)
+    if res is not None:
+        return res[0]
+    info = probe_video(preview_path) or {}
+    return _read_frames_ffmpeg(preview_path, stamps, (info.get("width"), info.get("height")))
+
+
+def sample_frames(
+    preview_path, n: int = DEFAULT_SAMPLES, keyframes: bool = False, timer=None, info: dict | None = None
+) -> FrameSample:
+    """
+    n frames spread across the whole preview (see module docstring).
+    timer: qc_timing.StageTimer; info: probe.probe_video result when the caller has it.
+    """
+    preview_path = Path(preview_path)
+    if info is None:
+        with timed(timer, "probe"):
+            info = probe_video(preview_path)
+    info = info or {}
+    size = (info.get("width"), info.get("height"))
+    stamps = spread_stamps(info.get("duration"), n)
+
+    if keyframes and shutil.which("ffmpeg") is not None:
+        with timed(timer, "extract"):
+            frames = _read_frames_ffmpeg(preview_path, stamps, size, keyframes=True)
+        if len(frames):
+            return FrameSample(frames, stamps, info.get("duration"), info.get("fps"), True)
+
+    sample = _sample_cv2(preview_path, n, info, timer)
+    if sample is not None:
+        return sample
+
+    with timed(timer, "extract"):
+        frames = _read_frames_ffmpeg(preview_path, stamps, size)
+    return FrameSample(frames, stamps, info.get("duration"), info.get("fps"), False)
+
+
+def write_frames(frames, frames_dir: Path) -> list[Path]:
+    """Debug copies of sampled frames (qc --keep-frames)."""
+    frames_dir.mkdir(parents=True, exist_ok=True)
+    out = []
+    for i, img in enumerate(frames, start=1):
+        fp = frames_dir / f"f{i:02d}.png"
+        if cv2.imwrite(str(fp), img):
+            out.append(fp)
+    return out
@@ -0,0 +1,120 @@
+"""
+Incremental QC: reuse the previous version's face detection when a re-render
+barely changed the picture (opt-in: qc --reuse-diff).
+
+A re-render (outputs/v0020 -> outputs/v0021) usually leaves most of the shot
+alone. QC looks up the shot's previous QC from DURUM outputs: outputs['qc.json']
+still names the last QC'd version after render has moved outputs['preview.mp4'],
+and outputs['preview.mp4'] names it when qc --out runs before render. The
+previous result is usable when it ran detection itself (not a reuse of its
+own predecessor), with the same character, ref.jpg and detector
+configuration (metrics.face_key) and the same sample stamps.
+
+The previous preview is then decoded at the new sample stamps and compared
+with frame_change(): frames are scaled to 128x128 and cut into 16x16 blocks,
+and the change is the largest mean |a - b| of any block in any frame
+(0..255). A change confined to the face still moves its block, where a
+whole-frame mean would dilute it. At or below the threshold (qc --reuse-diff;
+DEFAULT_REUSE_DIFF = 0 = off) detection is skipped: the previous
+metrics.face_boxes (stored relative to the frame size) are placed on the new
+frames and identity is recomputed from them against ref.jpg. Above it QC
+runs in full. Either way qc.json records metrics.incremental.
+"""
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+from .audit import is_safe_rel
+from .canonical_json import sha256_json
+
+DEFAULT_REUSE_DIFF = 0.0
+THUMB = (128, 128)
+BLOCK = 16
+
+
+def face_key(char_id: str, ref_sha256: str, detector_config: dict, descriptor_version) -> str:
+    """Everything besides the frames that the face / identity result depends on."""
+    return sha256_json({
+        "char_id": char_id,
+        "ref_sha256": ref_sha256,
+        "detector": detector_config,
+        "identity": descriptor_version,
+    })
+
+
+def _candidates(shot: dict) -> list[str]:
+    outputs = shot.get("outputs") or {}
+    rels = [outputs.get("qc.json")]
+    preview = outputs.get("preview.mp4")
+    if isinstance(preview, str):
+        rels.append((Path(preview).parent / "qc.json").as_posix())
+    return [r for r in rels if is_safe_rel(r)]
+
+
+def previous_qc(state_root: Path, shot: dict, out_dir: Path, key: str) -> dict | None:
+    """
+    {"qc_rel", "preview", "stamps", "face_detected", "face_boxes"} of the
+    previous version's QC, or None when there is none that can be reused.
+    face_boxes is None when the ref has no face (detection then only answered
+    face_detected, and nothing else is needed).
+    """
+    out_dir = out_dir.resolve()
+    for rel in _candidates(shot):
+        qc_path = (state_root / rel).resolve()
+        if qc_path.parent == out_dir:
+            continue
+        try:
+            qc = json.loads(qc_path.read_text(encoding="utf-8"))
+        except Exception:
+            continue
+        m = qc.get("metrics") if isinstance(qc, dict) else None
+        if not isinstance(m, dict) or m.get("face_key") != key:
+            continue
+        if (m.get("incremental") or {}).get("reused") or not m.get("frames_extracted"):
+            continue
+        boxes = m.get("face_boxes")
+        if m.get("identity_status") != "NO_REF_FACE" and not isinstance(boxes, list):
+            continue  # identity needs the face boxes
+        preview = qc_path.parent / "preview.mp4"
+        if not preview.is_file():
+            continue
+        return {
+            "qc_rel": rel,
+            "preview": preview,
+            "stamps": m.get("sample_stamps"),
+            "face_detected": bool(m.get("face_detected")),
+            "face_boxes": boxes if m.get("identity_status") != "NO_REF_FACE" else None,
+        }
+    return None
+
+
+def frame_change(a: np.ndarray, b: np.ndarray) -> float | None:
+    """Largest per-block mean abs difference of two (n, h, w) gray stacks; None if they don't pair up."""
+    if a.ndim != 3 or a.shape[0] == 0 or a.shape[0] != b.shape[0]:
+        return None
+    ta = np.stack([cv2.resize(f, THUMB, interpolation=cv2.INTER_AREA) for f in a]).astype(np.int16)
+    tb = np.stack([cv2.resize(f, THUMB, interpolation=cv2.INTER_AREA) for f in b]).astype(np.int16)
+    n, h, w = ta.shape
+    blocks = np.abs(ta - tb).reshape(n, h // BLOCK, BLOCK, w // BLOCK, BLOCK).mean(axis=(2, 4))
+    return round(float(blocks.max()), 3)
+
+
+def boxes_to_json(boxes_per_frame, shape) -> list:
+    """Detector boxes as [x, y, w, h] fractions of the frame, so they fit a re-render at another size."""
+    h, w = shape
+    return [[[round(bx / w, 5), round(by / h, 5), round(bw / w, 5), round(bh / h, 5)] for bx, by, bw, bh in boxes]
+            for boxes in boxes_per_frame]
+
+
+def boxes_from_json(data, shape) -> list | None:
+    """Pixel boxes for frames of `shape` from boxes_to_json() output; None if malformed."""
+    h, w = shape
+    try:
+        return [[(round(x * w), round(y * h), max(1, round(bw * w)), max(1, round(bh * h))) for x, y, bw, bh in boxes]
+                for boxes in data]
+    except (TypeError, ValueError):
+        return None
@@ -0,0 +1,64 @@
+"""
+Picture metrics on the frames QC already decoded (no extra decode).
+
+frames is the (n, h, w) uint8 gray stack from qc_frames.sample_frames; every
+metric is computed over the whole stack at once:
+
+- luma_mean            mean gray level per frame (black frames)
+- frame_diff_mean      mean |frame[i+1] - frame[i]| between consecutive samples
+                       (freeze: samples are spread over the clip, so a still
+                       picture gives ~0 everywhere)
+- laplacian_var        variance of the 4-neighbour Laplacian per frame (blur)
+
+Thresholds are optional (qc --black-luma / --freeze-diff / --blur-var); when
+set they turn the metrics into errors:
+
+- black_frames         some frame has luma_mean < black_luma
+- frozen_preview       >= 2 frames and every frame_diff_mean < freeze_diff
+- blurry_preview       median laplacian_var < blur_var
+"""
+from __future__ import annotations
+
+import numpy as np
+
+THRESHOLD_KEYS = ("black_luma", "freeze_diff", "blur_var")
+
+
+def _r(values) -> list[float]:
+    return [round(float(v), 3) for v in values]
+
+
+def frame_metrics(frames: np.ndarray) -> dict:
+    if frames.ndim != 3 or len(frames) == 0:
+        return {}
+    luma = frames.mean(axis=(1, 2))
+
+    f = frames.astype(np.int16)
+    diff = np.abs(np.diff(f, axis=0)).mean(axis=(1, 2)) if len(frames) > 1 else np.zeros(0)
+
+    lap = f[:, :-2, 1:-1] + f[:, 2:, 1:-1] + f[:, 1:-1, :-2] + f[:, 1:-1, 2:] - 4 * f[:, 1:-1, 1:-1]
+    lap_var = lap.reshape(len(frames), -1).var(axis=1) if lap.size else np.zeros(len(frames))
+
+    return {
+        "luma_mean": _r(luma),
+        "luma_min": round(float(luma.min()), 3),
+        "frame_diff_mean": _r(diff),
+        "frame_diff_max": round(float(diff.max()), 3) if diff.size else None,
+        "laplacian_var": _r(lap_var),
+        "laplacian_var_median": round(float(np.median(lap_var)), 3),
+    }
+
+
+def threshold_errors(m: dict, thresholds: dict) -> list[str]:
+    """Errors for the thresholds that are set (None = not checked)."""
+    if not m:
+        return []
+    errors = []
+    if thresholds.get("black_luma") is not None and m["luma_min"] < thresholds["black_luma"]:
+        errors.append("black_frames")
+    if (thresholds.get("freeze_diff") is not None and m["frame_diff_max"] is not None
+            and m["frame_diff_max"] < thresholds["freeze_diff"]):
+        errors.append("frozen_preview")
+    if thresholds.get("blur_var") is not None and m["laplacian_var_median"] < thresholds["blur_var"]:
+        errors.append("blurry_preview")
+    return errors
@@ -0,0 +1,221 @@
+"""
+QC stage timing: where a qc run spends its time.
+
+StageTimer measures wall (perf_counter) and CPU (process_time: all threads of
+the process, so the detector pool is included) per named stage, plus frames
+processed and bytes read. run_shot_qc stores it as metrics.timing in qc.json
+(shape in schema/qc.schema.json):
+
+    {"stages": {"hash": {"wall_sec", "cpu_sec"}, ...},
+     "frames": 5, "bytes_read": 123456, "wall_sec": 0.41, "cpu_sec": 0.52}
+
+Stages: hash, container (MP4 box check), cache, probe, extract, frame_write
+(--keep-frames), metrics, incremental (previous version decode + frame diff,
+plus identity from the reused face boxes; re-renders only), detect (ref
+descriptor + detection + identity), schema_validate, qc_write, state_write.
+bytes_read counts hashed bytes plus the preview size for a decode (the
+decoder may read less when it seeks).
+
+qc.json is written once, before DURUM, so two stages cannot be in it: its
+own qc_write and the DURUM write (state_write) that follows. Those go to the
+sidecar <state_root>/qc_timing.json, keyed by the qc.json path and its utc:
+
+    {"qc": {"outputs/v0001/qc.json": {"utc": "...", "stages": {
+        "qc_write": {"wall_sec", "cpu_sec"},
+        "state_write": {"wall_sec", "cpu_sec", "shared_by": 3}}}}}
+
+In batch QC one DURUM write covers every shot, so each shot records it with
+shared_by = number of shots. The sidecar is written after DURUM; losing it
+loses timing only.
+
+qc-timing aggregates metrics.timing over the qc.json of every shot, with
+the sidecar stages of that same qc.json (matching utc) merged in.
+"""
+from __future__ import annotations
+
+import json
+import time
+from contextlib import contextmanager, nullcontext
+from pathlib import Path
+
+from .audit import durum_stat_map
+from .durum_io import write_json_atomic
+from .shot_table import ShotTable
+
+STAGE_ORDER = (
+    "hash", "container", "cache", "probe", "extract", "frame_write", "metrics", "incremental", "detect",
+    "schema_validate", "qc_write", "state_write",
+)
+SIDECAR = "qc_timing.json"
+
+
+def _fail(msg: str) -> int:
+    print(f"[ERR] {msg}")
+    return 2
+
+
+class StageTimer:
+    def __init__(self):
+        self.stages: dict[str, dict] = {}
+        self.frames = 0
+        self.bytes_read = 0
+        self._wall0 = time.perf_counter()
+        self._cpu0 = time.process_time()
+
+    @contextmanager
+    def stage(self, name: str):
+        w, c = time.perf_counter(), time.process_time()
+        try:
+            yield
+        finally:
+            self.add(name, time.perf_counter() - w, time.process_time() - c)
+
+    def add(self, name: str, wall: float, cpu: float) -> None:
+        s = self.stages.setdefault(name, {"wall_sec": 0.0, "cpu_sec": 0.0})
+        s["wall_sec"] += wall
+        s["cpu_sec"] += cpu
+
+    def to_json(self) -> dict:
+        return {
+            "stages": {
+                k: {"wall_sec": round(v["wall_sec"], 6), "cpu_sec": round(max(0.0, v["cpu_sec"]), 6)}
+                for k, v in self.stages.items()
+            },
+            "frames": int(self.frames),
+            "bytes_read": int(self.bytes_read),
+            "wall_sec": round(time.perf_counter() - self._wall0, 6),
+            "cpu_sec": round(max(0.0, time.process_time() - self._cpu0), 6),
+        }
+
+
+def timed(timer: StageTimer | None, name: str):
+    """timer.stage(name), or a no-op when there is no timer."""
+    return timer.stage(name) if timer is not None else nullcontext()
+
+
+def add_shared_stage(timing: dict, name: str, timer: StageTimer, shared_by: int) -> None:
+    """Copy a stage measured once for several shots (batch DURUM write) into one shot's stages."""
+    s = timer.stages[name]
+    timing.setdefault("stages", {})[name] = {
+        "wall_sec": round(s["wall_sec"], 6),
+        "cpu_sec": round(max(0.0, s["cpu_sec"]), 6),
+        "shared_by": int(shared_by),
+    }
+
+
+def load_write_timing(state_root) -> dict:
+    """{qc_rel: {"utc", "stages"}} from the sidecar ({} when missing or unreadable)."""
+    try:
+        data = json.loads((Path(state_root) / SIDECAR).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    qc = data.get("qc") if isinstance(data, dict) else None
+    return qc if isinstance(qc, dict) else {}
+
+
+def record_write_timing(state_root, entries: dict) -> None:
+    """Merge {qc_rel: {"utc", "stages"}} into the sidecar (one atomic write)."""
+    data = load_write_timing(state_root)
+    data.update(entries)
+    try:
+        write_json_atomic(Path(state_root) / SIDECAR, {"qc": data})
+    except OSError:
+        pass  # timing only: DURUM and every qc.json are already committed
+
+
+# ---------------------------------------------------------------------------
+# qc-timing
+# ---------------------------------------------------------------------------
+
+def aggregate_timing(timings: list[dict]) -> dict:
+    """Per-stage totals over many metrics.timing blocks (shared stages split by shared_by)."""
+    stages: dict[str, dict] = {}
+    for t in timings:
+        for name, s in (t.get("stages") or {}).items():
+            share = max(1, int(s.get("shared_by") or 1))
+            a = stages.setdefault(name, {"shots": 0, "wall_sec": 0.0, "cpu_sec": 0.0, "max_wall_sec": 0.0})
+            a["shots"] += 1
+            a["wall_sec"] += float(s.get("wall_sec") or 0.0) / share
+            a["cpu_sec"] += float(s.get("cpu_sec") or 0.0) / share
+            a["max_wall_sec"] = max(a["max_wall_sec"], float(s.get("wall_sec") or 0.0))
+
+    total_wall = sum(a["wall_sec"] for a in stages.values())
+    order = {n: i for i, n in enumerate(STAGE_ORDER)}
+    rows = []
+    for name in sorted(stages, key=lambda n: (-stages[n]["wall_sec"], order.get(n, len(order)), n)):
+        a = stages[name]
+        rows.append({
+            "stage": name,
+            "shots": a["shots"],
+            "wall_sec": round(a["wall_sec"], 6),
+            "cpu_sec": round(a["cpu_sec"], 6),
+            "mean_wall_sec": round(a["wall_sec"] / a["shots"], 6),
+            "max_wall_sec": round(a["max_wall_sec"], 6),
+            "wall_share": round(a["wall_sec"] / total_wall, 4) if total_wall > 0 else 0.0,
+        })
+    return {
+        "shots": len(timings),
+        "frames": sum(int(t.get("frames") or 0) for t in timings),
+        "bytes_read": sum(int(t.get("bytes_read") or 0) for t in timings),
+        "wall_sec": round(total_wall, 6),
+        "stages": rows,
+    }
+
+
+def collect_timings(durum: dict, base_dir, jobs: int = 8, status=None, phase=None) -> tuple[list[dict], int]:
+    """(metrics.timing of every selected shot's qc.json, shots whose qc.json has no timing)"""
+    base_dir = Path(base_dir).resolve()
+    shots = durum["shots"]
+    table = ShotTable.from_durum(durum)
+    sm = durum_stat_map(durum, base_dir, jobs)
+    writes = load_write_timing(base_dir)
+    timings, without = [], 0
+    for i in table.select(status=status or None, phase=phase or None):
+        shot = shots[table.ids[i]]
+        rel = (shot.get("outputs") or {}).get("qc.json") if isinstance(shot, dict) else None
+        if not isinstance(rel, str) or not rel:
+            continue
+        qc = sm.read_json(base_dir / rel)
+        t = ((qc or {}).get("metrics") or {}).get("timing") if isinstance(qc, dict) else None
+        if isinstance(t, dict):
+            w = writes.get(rel)
+            if isinstance(w, dict) and w.get("utc") == qc.get("utc") and isinstance(w.get("stages"), dict):
+                t = {**t, "stages": {**(t.get("stages") or {}), **w["stages"]}}
+            timings.append(t)
+        else:
+            without += 1
+    return timings, without
+
+
+def cmd_qc_timing(args) -> int:
+    durum_path = Path(args.path)
+    if not durum_path.is_file():
+        return _fail(f"cannot read {durum_path}")
+    try:
+        durum = json.loads(durum_path.read_text(encoding="utf-8"))
+    except Exception as e:
+        return _fail(f"invalid json: {e}")
+    if not isinstance(durum.get("shots"), dict):
+        return _fail("DURUM.json: 'shots' must be an object")
+
+    timings, without = collect_timings(durum, durum_path.parent, args.jobs, args.status, args.phase)
+    agg = aggregate_timing(timings)
+    agg["shots_without_timing"] = without
+
+    if args.json:
+        print(json.dumps(agg, ensure_ascii=False, indent=2))
+        return 0
+
+    print(f"{'STAGE':<16} {'SHOTS':>6} {'WALL s':>10} {'CPU s':>10} {'MEAN s':>9} {'MAX s':>9} {'SHARE':>7}")
+    print("-" * 73)
+    for r in agg["stages"]:
+        print(
+            f"{r['stage']:<16} {r['shots']:>6} {r['wall_sec']:>10.3f} {r['cpu_sec']:>10.3f} "
+            f"{r['mean_wall_sec']:>9.4f} {r['max_wall_sec']:>9.4f} {r['wall_share'] * 100:>6.1f}%"
+        )
+    print("")
+    print(
+        f"shots: {agg['shots']} | frames: {agg['frames']} | bytes read: {agg['bytes_read']} | "
+        f"stage wall: {agg['wall_sec']:.3f}s | without timing: {without}"
+    )
+    return 0
@@ -0,0 +1,125 @@
+"""
+readiness: which shots can advance, and why not.
+
+Evaluates the AUTHORITATIVE_TRANSITIONS gates of transition.py (via
+gate_reasons, so the rules and messages are the same) for every shot in one
+pass, instead of trying `transition` shot by shot. All shots share one
+StatMap: output presence is resolved with one scandir per directory and each
+qc.json is parsed at most once.
+
+DONE -> RELEASE additionally reports the release-gate lock on FAZ_2 shots
+(qc.json ok:true and metrics.character_passive_status == PASSIVE_OK), which
+`release` would otherwise only hit after building the release.
+"""
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+from .audit import durum_stat_map
+from .shot_table import ShotTable
+from .statmap import StatMap
+from .transition import AUTHORITATIVE_TRANSITIONS, IMMUTABLE_STATUSES, gate_reasons
+
+
+def _fail(msg: str) -> int:
+    print(f"[ERR] {msg}")
+    return 2
+
+
+def _faz2_release_reasons(shot: dict, base_dir: Path, sm: StatMap) -> list[str]:
+    qc_rel = (shot.get("outputs") or {}).get("qc.json")
+    if not isinstance(qc_rel, str) or not qc_rel:
+        return ["FAZ_2 release gate requires outputs['qc.json']"]
+    qc = sm.read_json(base_dir / qc_rel)
+    if not isinstance(qc, dict):
+        return [f"FAZ_2 release gate: qc.json missing or unreadable: {qc_rel}"]
+    if qc.get("ok") is not True:
+        return ["FAZ_2 release gate: qc.json must be ok:true"]
+    if (qc.get("metrics") or {}).get("character_passive_status") != "PASSIVE_OK":
+        return ["FAZ_2 release gate: requires character_passive_status == PASSIVE_OK"]
+    return []
+
+
+def shot_readiness(shot_id: str, shot, base_dir: Path, sm: StatMap) -> dict:
+    """{"shot_id", "phase", "status", "next": [{"to", "ready", "reasons"}]}"""
+    if not isinstance(shot, dict):
+        return {"shot_id": shot_id, "phase": None, "status": None,
+                "next": [], "note": "shot value must be object"}
+
+    cur = str(shot.get("status") or "").strip().upper()
+    row = {"shot_id": shot_id, "phase": shot.get("phase"), "status": cur, "next": []}
+
+    if not cur:
+        row["note"] = "shot status missing"
+        return row
+    if cur in IMMUTABLE_STATUSES:
+        row["note"] = f"immutable status: {cur}"
+        return row
+    if cur not in AUTHORITATIVE_TRANSITIONS:
+        row["note"] = f"no authoritative transition from {cur}"
+        return row
+
+    for to in sorted(AUTHORITATIVE_TRANSITIONS[cur]):
+        reasons = gate_reasons(cur, to, shot, base_dir, sm)
+        if cur == "DONE" and to == "RELEASE" and shot.get("phase") == "FAZ_2":
+            reasons += _faz2_release_reasons(shot, base_dir, sm)
+        row["next"].append({"to": to, "ready": not reasons, "reasons": reasons})
+    return row
+
+
+def build_readiness(durum: dict, base_dir, jobs: int = 8, status=None, phase=None) -> list[dict]:
+    base_dir = Path(base_dir).resolve()
+    shots = durum["shots"]
+    table = ShotTable.from_durum(durum)
+    sm = durum_stat_map(durum, base_dir, jobs)
+    return [
+        shot_readiness(table.ids[i], shots[table.ids[i]], base_dir, sm)
+        for i in table.select(status=status or None, phase=phase or None)
+    ]
+
+
+def _print_table(rows: list[dict]) -> None:
+    w = max([8] + [len(r["shot_id"]) for r in rows])
+    print(f"{'ID':<{w}} {'PHASE':<8} {'STATUS':<12} {'NEXT':<12} {'READY':<6} BLOCKING")
+    print("-" * (72 + w))
+    for r in rows:
+        nexts = r["next"] or [{"to": "-", "ready": False, "reasons": [r.get("note", "")]}]
+        for n in nexts:
+            ready = "yes" if n["ready"] else "no"
+            why = "; ".join(n["reasons"])
+            print(f"{r['shot_id']:<{w}} {str(r['phase'] or ''):<8} {r['status'] or '':<12} {n['to']:<12} {ready:<6} {why}")
+
+
+def cmd_readiness(args) -> int:
+    durum_path = Path(args.path)
+    if not durum_path.is_file():
+        return _fail(f"cannot read {durum_path}")
+
+    try:
+        durum = json.loads(durum_path.read_text(encoding="utf-8"))
+    except Exception as e:
+        return _fail(f"invalid json: {e}")
+
+    if not isinstance(durum.get("shots"), dict):
+        return _fail("DURUM.json: 'shots' must be an object")
+
+    rows = build_readiness(durum, durum_path.parent, args.jobs, args.status, args.phase)
+    if args.ready_only:
+        rows = [r for r in rows if any(n["ready"] for n in r["next"])]
+
+    ready = sum(1 for r in rows if any(n["ready"] for n in r["next"]))
+    terminal = sum(1 for r in rows if not r["next"])
+    blocked = len(rows) - ready - terminal
+
+    if args.json:
+        print(json.dumps(
+            {"shots": rows, "totals": {"ready": ready, "blocked": blocked, "terminal": terminal}},
+            ensure_ascii=False, indent=2,
+        ))
+        return 0
+
+    _print_table(rows)
+    print("")
+    print(f"READY: {ready} | BLOCKED: {blocked} | TERMINAL: {terminal}")
+    return 0
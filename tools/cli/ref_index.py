@@ -0,0 +1,147 @@
+"""
+Character reference descriptors for the FAZ_2 identity check (CPU only).
+
+The face in assets/characters/<id>/ref.jpg is detected once (largest face),
+cropped, equalized and turned into an LBP descriptor: 8-neighbour local
+binary pattern codes on a 64x64 crop, one 256-bin histogram per cell of a
+4x4 grid, each cell L1-normalized. Preview faces get the same descriptor and
+are compared with a per-cell chi-square distance (0 = identical, 1 = disjoint).
+
+Descriptors are stored in <cache>/ref_index/ keyed by the ref.jpg sha256 (plus
+descriptor version and detector config) and memoized per process, so the
+reference work happens once per character, not once per shot QC. A ref.jpg
+with no detectable face is stored too (empty descriptor).
+
+No trained model: the distance only separates clearly different faces.
+DEFAULT_MAX_DISTANCE is deliberately loose; tighten it with
+qc --identity-threshold once calibrated on real shots.
+"""
+from __future__ import annotations
+
+import io
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+from .cache import cache_dir, sha256_bytes
+from .canonical_json import sha256_json
+from .face_detect import FaceDetector
+
+DESCRIPTOR_VERSION = "lbp-4x4-v1"
+DEFAULT_MAX_DISTANCE = 0.5
+
+CROP = 64
+GRID = 4
+# (dy, dx) of the 8 neighbours, clockwise from top-left; bit i = neighbour i >= centre
+_NEIGHBOURS = ((-1, -1), (-1, 0), (-1, 1), (0, 1), (1, 1), (1, 0), (1, -1), (0, -1))
+
+_MEMO: dict[str, np.ndarray | None] = {}
+_REF_DETECTOR: FaceDetector | None = None
+
+
+def _ref_detector() -> FaceDetector:
+    # refs are small portraits: search down to the cascade window, single thread
+    global _REF_DETECTOR
+    if _REF_DETECTOR is None:
+        _REF_DETECTOR = FaceDetector(min_size=(24, 24), threads=1)
+    return _REF_DETECTOR
+
+
+def lbp_codes(gray: np.ndarray) -> np.ndarray:
+    """8-bit LBP code per interior pixel ((h-2, w-2) uint8)."""
+    g = gray.astype(np.int16)
+    h, w = g.shape
+    c = g[1:-1, 1:-1]
+    codes = np.zeros((h - 2, w - 2), np.uint8)
+    for bit, (dy, dx) in enumerate(_NEIGHBOURS):
+        codes |= (g[1 + dy:h - 1 + dy, 1 + dx:w - 1 + dx] >= c).astype(np.uint8) << bit
+    return codes
+
+
+def face_descriptor(gray: np.ndarray, box) -> np.ndarray:
+    """(GRID*GRID, 256) float32 descriptor of the face at box=(x, y, w, h) in `gray`."""
+    x, y, w, h = (int(v) for v in box)
+    crop = gray[max(0, y):y + h, max(0, x):x + w]
+    crop = cv2.equalizeHist(cv2.resize(crop, (CROP + 2, CROP + 2), interpolation=cv2.INTER_AREA))
+    codes = lbp_codes(crop)
+
+    cell = CROP // GRID
+    cell_idx = (np.arange(CROP) // cell)[:, None] * GRID + (np.arange(CROP) // cell)[None, :]
+    hist = np.bincount((cell_idx * 256 + codes).ravel(), minlength=GRID * GRID * 256)
+    return (hist.reshape(GRID * GRID, 256) / float(cell * cell)).astype(np.float32)
+
+
+def descriptor_distance(a: np.ndarray, b: np.ndarray) -> float:
+    """Mean per-cell chi-square distance in [0, 1]."""
+    s = a + b
+    d = np.divide((a - b) ** 2, s, out=np.zeros_like(s), where=s > 0)
+    return float(0.5 * d.sum(axis=1).mean())
+
+
+def _largest(boxes):
+    return max(boxes, key=lambda b: int(b[2]) * int(b[3])) if boxes else None
+
+
+def _index_key(ref_sha256: str) -> str:
+    return sha256_json({
+        "ref_sha256": ref_sha256,
+        "descriptor": DESCRIPTOR_VERSION,
+        "detector": _ref_detector().config(),
+    })
+
+
+def _entry_path(key: str) -> Path:
+    return cache_dir("ref_index", key[:2]) / f"{key}.npz"
+
+
+def _load(key: str) -> tuple[bool, np.ndarray | None]:
+    try:
+        with np.load(_entry_path(key)) as z:
+            desc = z["desc"]
+    except Exception:
+        return False, None
+    return True, (desc if desc.size else None)
+
+
+def _store(key: str, desc: np.ndarray | None) -> None:
+    from .durum_io import write_bytes_atomic
+
+    buf = io.BytesIO()
+    np.savez(buf, desc=desc if desc is not None else np.zeros((0,), np.float32))
+    try:
+        write_bytes_atomic(_entry_path(key), buf.getvalue())
+    except Exception:
+        pass  # read-only cache: recomputed next time
+
+
+def compute_ref_descriptor(ref_bytes: bytes) -> np.ndarray | None:
+    gray = cv2.imdecode(np.frombuffer(ref_bytes, np.uint8), cv2.IMREAD_GRAYSCALE)
+    if gray is None:
+        return None
+    box = _largest(_ref_detector().detect(gray))
+    return face_descriptor(gray, box) if box is not None else None
+
+
+def ref_descriptor(ref_path) -> np.ndarray | None:
+    """Descriptor of the largest face in ref.jpg; None when it has no detectable face."""
+    data = Path(ref_path).read_bytes()
+    key = _index_key(sha256_bytes(data))
+    if key in _MEMO:
+        return _MEMO[key]
+    found, desc = _load(key)
+    if not found:
+        desc = compute_ref_descriptor(data)
+        _store(key, desc)
+    _MEMO[key] = desc
+    return desc
+
+
+def best_distance(frames, boxes_per_frame, ref_desc: np.ndarray) -> float | None:
+    """Smallest distance between any preview face and the reference (None: no faces)."""
+    best = None
+    for gray, boxes in zip(frames, boxes_per_frame):
+        for box in boxes:
+            d = descriptor_distance(face_descriptor(gray, box), ref_desc)
+            best = d if best is None else min(best, d)
+    return best
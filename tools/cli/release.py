@@ -5,6 +5,14 @@ from datetime import datetime, timezone
 from pathlib import Path
 import subprocess
 
+from . import probe
+from .canonical_json import STATE_HASH_MODE
+from .durum_io import write_json_atomic
+from .shot_table import ShotTable
+from .state_hash_cache import state_digest
+from .statmap import StatMap
+from .validate_cache import stat_fingerprint
+
 
 def _utc_id() -> str:
     # e.g. 20260101T221530Z
@@ -36,6 +44,7 @@ def cmd_release(args) -> int:
     if not durum_path.exists() or not durum_path.is_file():
         return _fail(f"cannot read {durum_path}")
 
+    fingerprint = stat_fingerprint(durum_path)  # before the read: the hash cache must describe what we read
     try:
         durum = json.loads(durum_path.read_text(encoding="utf-8"))
     except Exception as e:
@@ -45,10 +54,9 @@ def cmd_release(args) -> int:
     if not isinstance(shots, dict):
         return _fail("DURUM.json: 'shots' must be an object")
 
-    done_ids = []
-    for sid, shot in shots.items():
-        if isinstance(shot, dict) and shot.get("status") == "DONE":
-            done_ids.append(sid)
+    table = ShotTable.from_durum(durum)
+    done_rows = table.select(status="DONE")
+    done_ids = [table.ids[i] for i in done_rows]
 
     if len(done_ids) == 0:
         return _fail("no DONE shots found; nothing to release")
@@ -66,21 +74,32 @@ def cmd_release(args) -> int:
         "hash_alg": "sha256",
         "release_id": release_id,
         "source_durum_rel": durum_path.name,
-        "durum_sha256": _sha256_file(durum_path.resolve()),
+        "durum_sha256": state_digest(durum_path, durum, fingerprint),
+        "durum_hash_mode": STATE_HASH_MODE,
         "created_utc": datetime.now(timezone.utc).replace(microsecond=0).isoformat().replace("+00:00", "Z"),
         "totals": {"done_shots": 0, "files": 0, "bytes": 0},
         "shots": [],
         "artifacts": [],  # <-- v4 strict: MUST be non-empty
     }
 
+    # existence of every DONE output, one scandir per directory
+    sm = StatMap.scan(
+        durum_dir / rel
+        for i in done_rows
+        for rel in (table.outputs(i) or {}).values()
+        if isinstance(rel, str) and rel.strip()
+    )
+
     # Ensure directory exists
     release_dir.mkdir(parents=True, exist_ok=True)
     total_files = 0
     total_bytes = 0
+    runtime_sec = 0.0
+    runtime_unknown = 0
 
-    for sid in sorted(done_ids):
-        shot = shots[sid]
-        outputs = shot.get("outputs") if isinstance(shot, dict) else None
+    for i in done_rows:
+        sid = table.ids[i]
+        outputs = table.outputs(i)
         if not isinstance(outputs, dict) or len(outputs) == 0:
             return _fail(f"{sid}: DONE requires non-empty outputs")
 
@@ -93,8 +112,8 @@ def cmd_release(args) -> int:
 
         shot_block = {
             "shot_id": sid,
-            "phase": shot.get("phase") if isinstance(shot, dict) else None,
-            "status": shot.get("status") if isinstance(shot, dict) else None,
+            "phase": table.phase_of(i),
+            "status": table.status_of(i),
             "files": [],
         }
 
@@ -109,7 +128,7 @@ def cmd_release(args) -> int:
                 return _fail(f"{sid}: outputs['{out_key}'] must be a non-empty string path")
 
             src = (durum_dir / rel).resolve()
-            if not src.exists() or not src.is_file():
+            if not sm.is_file(durum_dir / rel):
                 return _fail(f"{sid}: outputs['{out_key}'] file missing on disk: {rel}")
 
             # Destination filename: keep key name but use original suffix if needed
@@ -128,14 +147,23 @@ def cmd_release(args) -> int:
             sha = _sha256_file(dest)
             rel_dest = str(Path(sid) / dest_name).replace("\\", "/")
 
-            shot_block["files"].append({
+            file_entry = {
                 "key": out_key,
                 "source": rel,
                 "path": rel_dest,
                 "dest": rel_dest,
                 "bytes": size,
                 "sha256": sha,
-            })
+            }
+            if out_key == "preview.mp4":
+                # cached probe of the source: one stat when it was probed before (qc, listshots)
+                info = probe.probe_video(src)
+                file_entry["media"] = info
+                if info and info.get("duration") is not None:
+                    runtime_sec += info["duration"]
+                else:
+                    runtime_unknown += 1
+            shot_block["files"].append(file_entry)
 
             # v4 strict artifact path is REPO-relative
             artifact_path = str(Path("releases") / release_id / sid / dest_name).replace("\\", "/")
@@ -152,10 +180,13 @@ def cmd_release(args) -> int:
     manifest["totals"]["done_shots"] = len(done_ids)
     manifest["totals"]["files"] = total_files
     manifest["totals"]["bytes"] = total_bytes
+    manifest["totals"]["runtime_sec"] = round(runtime_sec, 3)
+    manifest["totals"]["runtime_unknown"] = runtime_unknown
+    probe.save_index()
 
     # Write manifest.json and release.json (same content, different filename for convenience)
-    (release_dir / "manifest.json").write_text(json.dumps(manifest, indent=2), encoding="utf-8")
-    (release_dir / "release.json").write_text(json.dumps(manifest, indent=2), encoding="utf-8")
+    write_json_atomic(release_dir / "manifest.json", manifest)
+    write_json_atomic(release_dir / "release.json", manifest)
 
     # --- CineV4: enforce release-gate after building release ---
     project_id = getattr(args, "project", None) or durum.get("active_project")
@@ -6,6 +6,9 @@ import sys
 import hashlib
 from pathlib import Path
 
+from .durum_io import write_durum
+from .mp4 import Mp4Error, check_mp4, faststart
+
 # strict by default: do not overwrite existing preview.mp4 unless --force
 STRICT_RENDER = True
 
@@ -35,6 +38,9 @@ def cmd_render(args) -> int:
         STRICT_RENDER = False
 
     repo_root = Path(__file__).resolve().parents[2]  # tools/cli/render.py -> repo root
+    # --project: outputs root is the project's state dir (projects/<id>/)
+    if getattr(args, "state_root", None):
+        repo_root = Path(args.state_root).resolve()
 
     # args
     durum_path = Path(args.path)
@@ -103,6 +109,28 @@ def cmd_render(args) -> int:
     except Exception:
         pass
 
+    # container sanity (box headers only): a truncated / non-MP4 src fails before anything is written
+    container = check_mp4(src_path)
+    if not container["ok"]:
+        return _fail(f"src is not a valid MP4: {'; '.join(container['errors'])}")
+
+    # --faststart: stage a remux with moov in front; it is what gets compared and installed
+    staged = None
+    if getattr(args, "faststart", False) and container["faststart"] is False:
+        staged = out_dir / ".preview.faststart.mp4"
+        try:
+            faststart(src_path, staged)
+        except (Mp4Error, OSError) as e:
+            return _fail(f"faststart remux failed: {e}")
+    try:
+        return _install(durum_path, durum, shot_id, shot, outputs, out_rel, staged or src_path, dst)
+    finally:
+        if staged is not None:
+            staged.unlink(missing_ok=True)
+
+
+def _install(durum_path: Path, durum: dict, shot_id: str, shot: dict, outputs: dict, out_rel: str,
+             src_path: Path, dst: Path) -> int:
     # idempotency + overwrite policy
     if dst.exists():
         try:
@@ -117,7 +145,7 @@ def cmd_render(args) -> int:
             outputs["preview.mp4"] = f"{out_rel}/preview.mp4"
             shot["outputs"] = outputs
             try:
-                durum_path.write_text(json.dumps(durum, indent=2, ensure_ascii=False), encoding="utf-8")
+                write_durum(durum_path, durum, touched=[shot_id])
             except Exception as e:
                 return _fail(f"failed to write DURUM: {e}")
             return _ok(f"{shot_id}: preview.mp4 already up-to-date ({out_rel}/preview.mp4)")
@@ -137,7 +165,7 @@ def cmd_render(args) -> int:
     shot["outputs"] = outputs
 
     try:
-        durum_path.write_text(json.dumps(durum, indent=2, ensure_ascii=False), encoding="utf-8")
+        write_durum(durum_path, durum, touched=[shot_id])
     except Exception as e:
         return _fail(f"failed to write DURUM: {e}")
 
@@ -151,6 +179,7 @@ def main(argv=None) -> int:
     p.add_argument("shot_id", help="Shot id (e.g. SH001)")
     p.add_argument("--out", required=True, help="Output dir (must be under outputs/)")
     p.add_argument("--src", required=False, default=None, help="Source preview.mp4 (default: shot.outputs['preview.mp4'])")
+    p.add_argument("--faststart", action="store_true", help="Remux so moov precedes mdat (cheap seeks); no re-encode")
     args = p.parse_args(argv)
     return cmd_render(args)
 
@@ -0,0 +1,300 @@
+"""
+Compiled JSON-schema validators.
+
+The schemas we ship (schema/shot.schema.json, schema/qc.schema.json,
+schema/cinev3/durum.schema.json) use a small keyword subset. compile_schema()
+turns such a schema into plain Python check functions (generated source,
+one function per schema node) that return True/False at dict-access speed.
+
+- generated source is cached on disk under <cache>/schema/, keyed by the
+  schema's sha256 and COMPILER_VERSION
+- on failure, CompiledValidator.iter_errors() falls back to jsonschema's
+  Draft7Validator so error messages stay exactly what they were
+- a schema using any keyword outside the supported subset is not compiled;
+  that validator simply delegates everything to jsonschema
+
+Annotations ($schema, $id, title, description, format, ...) are ignored,
+matching Draft7Validator without a format checker.
+"""
+from __future__ import annotations
+
+import json
+import re
+from pathlib import Path
+
+from .cache import cache_dir, sha256_bytes
+
+COMPILER_VERSION = "1"
+
+_ANNOTATIONS = {
+    "$schema", "$id", "$comment", "title", "description", "format",
+    "default", "examples", "definitions", "readOnly", "writeOnly",
+}
+_SUPPORTED = _ANNOTATIONS | {
+    "type", "enum", "const", "pattern", "minLength", "maxLength",
+    "required", "properties", "additionalProperties", "minProperties", "maxProperties",
+    "items", "minItems", "maxItems", "minimum", "maximum", "$ref",
+}
+
+_TYPE_CHECKS = {
+    "object": "isinstance({x}, dict)",
+    "array": "isinstance({x}, list)",
+    "string": "isinstance({x}, str)",
+    "boolean": "isinstance({x}, bool)",
+    "null": "{x} is None",
+    "number": "(isinstance({x}, (int, float)) and not isinstance({x}, bool))",
+    "integer": "((isinstance({x}, int) and not isinstance({x}, bool)) or (isinstance({x}, float) and {x}.is_integer()))",
+}
+
+
+class UnsupportedSchema(Exception):
+    pass
+
+
+class _Gen:
+    def __init__(self, root: dict):
+        self.root = root
+        self.lines: list[str] = []
+        self.consts: list[str] = []
+        self.n = 0
+        self.refs: dict[str, str] = {}
+
+    def const(self, expr: str) -> str:
+        name = f"_K{len(self.consts)}"
+        self.consts.append(f"{name} = {expr}")
+        return name
+
+    def ref(self, ref: str) -> str:
+        if ref in self.refs:
+            return self.refs[ref]
+        if not ref.startswith("#/"):
+            raise UnsupportedSchema(f"$ref {ref}")
+        node = self.root
+        for part in ref[2:].split("/"):
+            part = part.replace("~1", "/").replace("~0", "~")
+            if not isinstance(node, dict) or part not in node:
+                raise UnsupportedSchema(f"$ref {ref}")
+            node = node[part]
+        name = f"_v{self.n}"
+        self.n += 1
+        self.refs[ref] = name
+        self.emit(node, name)
+        return name
+
+    def node(self, schema) -> str:
+        name = f"_v{self.n}"
+        self.n += 1
+        self.emit(schema, name)
+        return name
+
+    def emit(self, schema, name: str) -> None:
+        if schema is True or schema == {}:
+            self.lines += [f"def {name}(x):", "    return True", ""]
+            return
+        if schema is False:
+            self.lines += [f"def {name}(x):", "    return False", ""]
+            return
+        if not isinstance(schema, dict):
+            raise UnsupportedSchema(repr(schema))
+
+        unknown = set(schema) - _SUPPORTED
+        if unknown:
+            raise UnsupportedSchema(", ".join(sorted(unknown)))
+
+        body: list[str] = []
+
+        # draft-7: siblings of $ref are ignored
+        if "$ref" in schema:
+            target = self.ref(schema["$ref"])
+            self.lines += [f"def {name}(x):", f"    return {target}(x)", ""]
+            return
+
+        t = schema.get("type")
+        if t is not None:
+            types = [t] if isinstance(t, str) else list(t)
+            if any(tt not in _TYPE_CHECKS for tt in types):
+                raise UnsupportedSchema(f"type {t}")
+            cond = " or ".join(_TYPE_CHECKS[tt].format(x="x") for tt in types)
+            body.append(f"    if not ({cond}):\n        return False")
+
+        if "enum" in schema:
+            vals = schema["enum"]
+            if not all(isinstance(v, str) for v in vals):
+                raise UnsupportedSchema("non-string enum")
+            k = self.const(f"frozenset({sorted(vals)!r})")
+            body.append(f"    if not (isinstance(x, str) and x in {k}):\n        return False")
+
+        if "const" in schema:
+            v = schema["const"]
+            if not isinstance(v, str):
+                raise UnsupportedSchema("non-string const")
+            body.append(f"    if not (isinstance(x, str) and x == {v!r}):\n        return False")
+
+        # strings
+        s_checks = []
+        if "minLength" in schema:
+            s_checks.append(f"len(x) < {int(schema['minLength'])}")
+        if "maxLength" in schema:
+            s_checks.append(f"len(x) > {int(schema['maxLength'])}")
+        if "pattern" in schema:
+            k = self.const(f"re.compile({schema['pattern']!r})")
+            s_checks.append(f"{k}.search(x) is None")
+        if s_checks:
+            body.append("    if isinstance(x, str):")
+            for c in s_checks:
+                body.append(f"        if {c}:\n            return False")
+
+        # numbers
+        n_checks = []
+        if "minimum" in schema:
+            n_checks.append(f"x < {schema['minimum']!r}")
+        if "maximum" in schema:
+            n_checks.append(f"x > {schema['maximum']!r}")
+        if n_checks:
+            body.append("    if isinstance(x, (int, float)) and not isinstance(x, bool):")
+            for c in n_checks:
+                body.append(f"        if {c}:\n            return False")
+
+        # objects
+        o_lines = []
+        for key in schema.get("required") or []:
+            o_lines.append(f"        if {key!r} not in x:\n            return False")
+        if "minProperties" in schema:
+            o_lines.append(f"        if len(x) < {int(schema['minProperties'])}:\n            return False")
+        if "maxProperties" in schema:
+            o_lines.append(f"        if len(x) > {int(schema['maxProperties'])}:\n            return False")
+        props = schema.get("properties") or {}
+        for key, sub in props.items():
+            fn = self.node(sub)
+            o_lines.append(f"        if {key!r} in x and not {fn}(x[{key!r}]):\n            return False")
+        if "additionalProperties" in schema:
+            ap = schema["additionalProperties"]
+            known = self.const(f"frozenset({sorted(props)!r})")
+            if ap is False:
+                o_lines.append(f"        for k in x:\n            if k not in {known}:\n                return False")
+            elif ap is not True and ap != {}:
+                fn = self.node(ap)
+                o_lines.append(
+                    f"        for k, v in x.items():\n"
+                    f"            if k not in {known} and not {fn}(v):\n"
+                    f"                return False"
+                )
+        if o_lines:
+            body.append("    if isinstance(x, dict):")
+            body.extend(o_lines)
+
+        # arrays
+        a_lines = []
+        if "minItems" in schema:
+            a_lines.append(f"        if len(x) < {int(schema['minItems'])}:\n            return False")
+        if "maxItems" in schema:
+            a_lines.append(f"        if len(x) > {int(schema['maxItems'])}:\n            return False")
+        if "items" in schema:
+            items = schema["items"]
+            if not isinstance(items, (dict, bool)):
+                raise UnsupportedSchema("tuple items")
+            fn = self.node(items)
+            a_lines.append(f"        for v in x:\n            if not {fn}(v):\n                return False")
+        if a_lines:
+            body.append("    if isinstance(x, list):")
+            body.extend(a_lines)
+
+        self.lines += [f"def {name}(x):"] + body + ["    return True", ""]
+
+
+def generate_source(schema: dict) -> str:
+    """Python source defining `check(instance) -> bool` for `schema`."""
+    g = _Gen(schema)
+    entry = g.node(schema)
+    out = [
+        f"# generated by tools/cli/schema_compile.py (compiler v{COMPILER_VERSION}); do not edit",
+        "import re",
+        "",
+    ]
+    out += g.consts + [""] + g.lines + [f"check = {entry}", ""]
+    return "\n".join(out)
+
+
+def _load_source(src: str, filename: str):
+    ns: dict = {}
+    exec(compile(src, filename, "exec"), ns)
+    return ns["check"]
+
+
+def compile_schema(schema: dict, name: str = "schema"):
+    """Returns a check function, using/refreshing the on-disk cache. Raises UnsupportedSchema."""
+    key = sha256_bytes(
+        (COMPILER_VERSION + "\n" + json.dumps(schema, sort_keys=True, separators=(",", ":"))).encode("utf-8")
+    )
+    safe = re.sub(r"[^A-Za-z0-9_.-]", "_", name)
+    cached = None
+    try:
+        cached = cache_dir("schema") / f"{safe}-{key[:16]}.py"
+        if cached.is_file():
+            return _load_source(cached.read_text(encoding="utf-8"), str(cached))
+    except Exception:
+        cached = None  # unreadable cache / read-only fs: regenerate in memory
+
+    src = generate_source(schema)
+    check = _load_source(src, f"<compiled {safe}>")
+    if cached is not None:
+        try:
+            from .durum_io import write_bytes_atomic
+
+            write_bytes_atomic(cached, src.encode("utf-8"))
+        except Exception:
+            pass
+    return check
+
+
+class CompiledValidator:
+    """
+    Drop-in for the parts of Draft7Validator we use (iter_errors / is_valid).
+
+    The compiled check runs first; jsonschema is only consulted when it fails
+    (for messages) or when the schema could not be compiled.
+    """
+
+    def __init__(self, schema: dict, name: str = "schema"):
+        self.schema = schema
+        self._jsv = None
+        try:
+            self._check = compile_schema(schema, name)
+        except UnsupportedSchema:
+            self._check = None
+
+    @property
+    def compiled(self) -> bool:
+        return self._check is not None
+
+    def _jsonschema(self):
+        if self._jsv is None:
+            from jsonschema import Draft7Validator
+
+            self._jsv = Draft7Validator(self.schema)
+        return self._jsv
+
+    def is_valid(self, instance) -> bool:
+        if self._check is not None:
+            return self._check(instance)
+        return self._jsonschema().is_valid(instance)
+
+    def iter_errors(self, instance):
+        if self._check is not None and self._check(instance):
+            return iter(())
+        return self._jsonschema().iter_errors(instance)
+
+
+_VALIDATORS: dict = {}
+
+
+def load_validator(schema_path) -> CompiledValidator:
+    """Process-wide memoized validator for a schema file."""
+    p = Path(schema_path).resolve()
+    raw = p.read_bytes()
+    key = (str(p), sha256_bytes(raw))
+    v = _VALIDATORS.get(key)
+    if v is None:
+        v = CompiledValidator(json.loads(raw.decode("utf-8-sig")), p.stem)
+        _VALIDATORS[key] = v
+    return v
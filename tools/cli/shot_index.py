@@ -0,0 +1,35 @@
+"""
+Shot id rules and the natural order shared by every command.
+
+Accepted ids (schema/shot.schema.json):
+    SH001, SH0001, SH12345 ...          (3+ digits)
+    SC010_SH0001                        (scene-qualified)
+
+Lexicographic order breaks as soon as widths differ (SH1000 < SH999), so
+every command that orders shots (listshots, release, manifest, bundle,
+promote-release) goes through natural_key() / ShotTable, which keeps ids
+in this order once per load (ShotTable.index_of is the O(log n) lookup).
+"""
+from __future__ import annotations
+
+import re
+
+SCENE_PREFIX_PATTERN = r"SC[0-9]{2,}_"
+SHOT_ID_PATTERN = rf"^(?:{SCENE_PREFIX_PATTERN})?SH[0-9]{{3,}}$"
+_SHOT_ID_RE = re.compile(SHOT_ID_PATTERN)
+_DIGITS_RE = re.compile(r"(\d+)")
+
+
+def is_valid_shot_id(sid) -> bool:
+    return isinstance(sid, str) and _SHOT_ID_RE.match(sid) is not None
+
+
+def natural_key(sid) -> tuple:
+    """SH2 < SH10 < SH999 < SH1000; ties (SH01 vs SH001) fall back to the raw string."""
+    s = str(sid)
+    parts = _DIGITS_RE.split(s)
+    return (tuple(int(p) if i % 2 else p for i, p in enumerate(parts)), s)
+
+
+def sort_shot_ids(ids) -> list:
+    return sorted(ids, key=natural_key)
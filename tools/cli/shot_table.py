@@ -0,0 +1,271 @@
+"""
+Columnar, array-backed view of DURUM shots.
+
+Loading DURUM gives a dict-of-dicts per shot. For bulk work (select by
+status/phase, sort, count) on large projects that is heavy, so commands can
+build a ShotTable instead:
+
+- status / phase are interned into small integer codes stored in `array`s
+- shot ids are kept in one natural-order sequence (row index == sort position,
+  see shot_index.natural_key)
+- outputs / history are kept as compact JSON bytes and decoded on access
+
+ShotTable.load() decodes DURUM.json one shot at a time (the top-level object
+and "shots" are walked with the stdlib decoder's raw_decode), so the full
+dict-of-dicts is never built: peak memory is the JSON text plus the table.
+from_durum() is for callers that already hold the dict.
+
+The table is read-only; mutations still go through the DURUM dict.
+"""
+from __future__ import annotations
+
+import json
+import re
+from array import array
+from bisect import bisect_left
+from pathlib import Path
+
+from .shot_index import natural_key, sort_shot_ids
+
+
+_WS = re.compile(r"[ \t\n\r]*")
+_DECODER = json.JSONDecoder()
+
+
+def _compact(value) -> bytes:
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def _ws(s: str, i: int) -> int:
+    return _WS.match(s, i).end()
+
+
+def _scan_object(s: str, i: int, on_member) -> int:
+    """
+    Walk the JSON object starting at s[i] ('{'): on_member(key, value_index)
+    must consume the value and return the index after it. Returns the index
+    after the closing brace.
+    """
+    if s[i:i + 1] != "{":
+        raise json.JSONDecodeError("Expecting '{'", s, i)
+    i = _ws(s, i + 1)
+    if s[i:i + 1] == "}":
+        return i + 1
+    while True:
+        if s[i:i + 1] != '"':
+            raise json.JSONDecodeError("Expecting property name enclosed in double quotes", s, i)
+        key, i = json.decoder.scanstring(s, i + 1)
+        i = _ws(s, i)
+        if s[i:i + 1] != ":":
+            raise json.JSONDecodeError("Expecting ':' delimiter", s, i)
+        i = _ws(s, on_member(key, _ws(s, i + 1)))
+        if s[i:i + 1] == "}":
+            return i + 1
+        if s[i:i + 1] != ",":
+            raise json.JSONDecodeError("Expecting ',' delimiter", s, i)
+        i = _ws(s, i + 1)
+
+
+class _Interner:
+    """Maps raw values (str / None) to dense integer codes."""
+
+    __slots__ = ("names", "codes")
+
+    def __init__(self):
+        self.names: list = []
+        self.codes: dict = {}
+
+    def code(self, value) -> int:
+        try:
+            c = self.codes.get(value)
+        except TypeError:
+            value = str(value)
+            c = self.codes.get(value)
+        if c is None:
+            c = len(self.names)
+            self.names.append(value)
+            self.codes[value] = c
+        return c
+
+    def lookup(self, value) -> int | None:
+        try:
+            return self.codes.get(value)
+        except TypeError:
+            return self.codes.get(str(value))
+
+
+class ShotTable:
+    __slots__ = (
+        "meta",
+        "ids",
+        "status",
+        "phase",
+        "out_count",
+        "_status_names",
+        "_phase_names",
+        "_prompts",
+        "_outputs",
+        "_history",
+    )
+
+    def __init__(self):
+        self.meta: dict = {}
+        self.ids: list[str] = []
+        self.status = array("H")
+        self.phase = array("H")
+        self.out_count = array("I")
+        self._status_names = _Interner()
+        self._phase_names = _Interner()
+        self._prompts: list[str] = []
+        self._outputs: list[bytes | None] = []
+        self._history: list[bytes | None] = []
+
+    # -------------------------
+    # construction
+    # -------------------------
+    @classmethod
+    def from_durum(cls, durum: dict) -> "ShotTable":
+        t = cls()
+        t.meta = {k: v for k, v in durum.items() if k != "shots"}
+
+        shots = durum.get("shots")
+        if not isinstance(shots, dict):
+            raise ValueError("DURUM.json: 'shots' must be an object")
+
+        for sid in sort_shot_ids(k for k, v in shots.items() if isinstance(v, dict)):
+            t._append(str(sid), cls._row(shots[sid]))
+        return t
+
+    @classmethod
+    def load(cls, path) -> "ShotTable":
+        """Load DURUM.json straight into a table, decoding one shot at a time."""
+        return cls.from_json_text(Path(path).read_text(encoding="utf-8"))
+
+    @classmethod
+    def from_json_text(cls, text: str) -> "ShotTable":
+        t = cls()
+        rows: dict[str, tuple] = {}  # compact rows; a repeated id keeps the last one, like json.loads
+        shots_seen = False
+
+        def on_shot(sid: str, j: int) -> int:
+            shot, end = _DECODER.raw_decode(text, j)
+            if isinstance(shot, dict):
+                rows[sid] = cls._row(shot)
+            else:
+                rows.pop(sid, None)
+            return end
+
+        def on_member(key: str, j: int) -> int:
+            nonlocal shots_seen
+            if key == "shots":
+                rows.clear()
+                shots_seen = text[j:j + 1] == "{"
+                if shots_seen:
+                    return _scan_object(text, j, on_shot)
+            value, end = _DECODER.raw_decode(text, j)
+            if key != "shots":
+                t.meta[key] = value
+            return end
+
+        i = _ws(text, 0)
+        if text[i:i + 1] != "{":
+            json.loads(text)  # invalid JSON raises here with the usual message
+            raise ValueError("DURUM.json must be an object")
+        end = _ws(text, _scan_object(text, i, on_member))
+        if end != len(text):
+            raise json.JSONDecodeError("Extra data", text, end)
+        if not shots_seen:
+            raise ValueError("DURUM.json: 'shots' must be an object")
+
+        for sid in sort_shot_ids(rows):
+            t._append(sid, rows.pop(sid))
+        return t
+
+    @staticmethod
+    def _row(shot: dict) -> tuple:
+        """(status, phase, prompt, out_count, outputs bytes, history bytes) of one shot."""
+        inputs = shot.get("inputs") or {}
+        prompt = inputs.get("prompt", "") if isinstance(inputs, dict) else ""
+        outputs = shot.get("outputs")
+        history = shot.get("history")
+        return (
+            shot.get("status"),
+            shot.get("phase"),
+            prompt,
+            len(outputs) if isinstance(outputs, dict) else 0,
+            _compact(outputs) if outputs else None,
+            _compact(history) if history else None,
+        )
+
+    def _append(self, sid: str, row: tuple) -> None:
+        status, phase, prompt, out_count, outputs, history = row
+        self.ids.append(sid)
+        self.status.append(self._status_names.code(status))
+        self.phase.append(self._phase_names.code(phase))
+        self._prompts.append(prompt)
+        self.out_count.append(out_count)
+        self._outputs.append(outputs)
+        self._history.append(history)
+
+    # -------------------------
+    # row access
+    # -------------------------
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def index_of(self, sid: str) -> int | None:
+        i = bisect_left(self.ids, natural_key(sid), key=natural_key)
+        if i < len(self.ids) and self.ids[i] == sid:
+            return i
+        return None
+
+    def __contains__(self, sid) -> bool:
+        return self.index_of(sid) is not None
+
+    def status_of(self, i: int):
+        return self._status_names.names[self.status[i]]
+
+    def phase_of(self, i: int):
+        return self._phase_names.names[self.phase[i]]
+
+    def prompt(self, i: int):
+        return self._prompts[i]
+
+    def outputs(self, i: int):
+        raw = self._outputs[i]
+        return json.loads(raw) if raw is not None else {}
+
+    def history(self, i: int) -> list:
+        raw = self._history[i]
+        return json.loads(raw) if raw is not None else []
+
+    # -------------------------
+    # bulk operations
+    # -------------------------
+    def select(self, status=None, phase=None) -> list[int]:
+        """Row indices (in id order) matching all given filters."""
+        rows = range(len(self.ids))
+        if status is not None:
+            code = self._status_names.lookup(status)
+            if code is None:
+                return []
+            col = self.status
+            rows = [i for i in rows if col[i] == code]
+        if phase is not None:
+            code = self._phase_names.lookup(phase)
+            if code is None:
+                return []
+            col = self.phase
+            rows = [i for i in rows if col[i] == code]
+        return list(rows)
+
+    def ids_where(self, status=None, phase=None) -> list[str]:
+        return [self.ids[i] for i in self.select(status=status, phase=phase)]
+
+    def count(self, status=None, phase=None) -> int:
+        if status is None and phase is None:
+            return len(self.ids)
+        if phase is None:
+            code = self._status_names.lookup(status)
+            return 0 if code is None else self.status.count(code)
+        return len(self.select(status=status, phase=phase))
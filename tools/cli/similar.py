@@ -0,0 +1,224 @@
+"""
+similar: shots whose previews look like another shot's preview.
+
+QC stores a pHash per sampled frame (metrics.frame_phash). The hashes of
+all shots live in a persistent multi-index (perceptual.MultiIndex layout) in
+SQLite under <cache>/similar/ (one database per state root):
+
+    shots(sid, qc, size, mtime_ns, frames)
+    chunks(t, c, sid, i, h)   -- clustered on (t, c): table t, 16-bit chunk c
+
+`similar SH041` looks up each frame hash of SH041 (Hamming radius, default
+10 of 64 bits) by probing only the chunk neighbourhoods perceptual.chunk_probes()
+names, so a query reads the candidate rows, not every stored hash.
+
+On every run the shots table is brought in line with the qc.json files DURUM
+references: qc.json stats come from one StatMap (size + mtime_ns) and only
+shots whose qc.json is new, changed or gone have their rows rewritten.
+If the cache directory is not writable the index is built in memory.
+"""
+from __future__ import annotations
+
+import json
+import sqlite3
+from pathlib import Path
+
+from .audit import durum_stat_map, is_safe_rel
+from .cache import cache_dir, sha256_bytes
+from .perceptual import chunk_probes, chunks, from_hex, hamming
+from .shot_index import sort_shot_ids
+
+INDEX_VERSION = 2
+DEFAULT_RADIUS = 10
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (k TEXT PRIMARY KEY, v TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS shots (
+    sid TEXT PRIMARY KEY, qc TEXT NOT NULL, size INTEGER NOT NULL, mtime_ns INTEGER NOT NULL,
+    frames INTEGER NOT NULL);
+CREATE TABLE IF NOT EXISTS chunks (
+    t INTEGER NOT NULL, c INTEGER NOT NULL, sid TEXT NOT NULL, i INTEGER NOT NULL, h TEXT NOT NULL,
+    PRIMARY KEY (t, c, sid, i)) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS chunks_sid ON chunks (sid, t);
+"""
+
+
+def _fail(msg: str) -> int:
+    print(f"[ERR] {msg}")
+    return 2
+
+
+def _index_path(state_root: Path) -> Path:
+    return cache_dir("similar") / f"{sha256_bytes(str(state_root).encode('utf-8'))[:16]}.sqlite"
+
+
+def _chunk_rows(sid: str, hashes: list[str]):
+    for i, hx in enumerate(hashes):
+        for t, c in enumerate(chunks(from_hex(hx))):
+            yield t, c, sid, i, hx
+
+
+class SimilarIndex:
+    def __init__(self, state_root):
+        self.state_root = Path(state_root).resolve()
+        self.path = _index_path(self.state_root)
+        self.shots: dict[str, dict] = {}  # sid -> {"qc", "fp", "frames"}
+        self.updated = 0
+        self.checked = 0
+        self.db = self._open()
+
+    def _open(self) -> sqlite3.Connection:
+        want = {"version": str(INDEX_VERSION), "state_root": str(self.state_root)}
+        try:
+            db = sqlite3.connect(str(self.path))
+            db.executescript(_SCHEMA)
+            if dict(db.execute("SELECT k, v FROM meta")) != want:
+                with db:
+                    db.executescript("DELETE FROM meta; DELETE FROM shots; DELETE FROM chunks;")
+                    db.executemany("INSERT INTO meta VALUES (?, ?)", want.items())
+        except sqlite3.Error:
+            db = sqlite3.connect(":memory:")  # read-only / broken cache: rebuilt every run
+            db.executescript(_SCHEMA)
+        for sid, qc, size, mtime_ns, frames in db.execute("SELECT sid, qc, size, mtime_ns, frames FROM shots"):
+            self.shots[sid] = {"qc": qc, "fp": [size, mtime_ns], "frames": frames}
+        return db
+
+    def refresh(self, durum: dict, jobs: int = 8) -> None:
+        """Bring the index in line with the qc.json files DURUM references now."""
+        sm = durum_stat_map(durum, self.state_root, jobs)
+        current: dict[str, tuple[str, list]] = {}
+        for sid, shot in (durum.get("shots") or {}).items():
+            rel = (shot.get("outputs") or {}).get("qc.json") if isinstance(shot, dict) else None
+            if not is_safe_rel(rel):
+                continue
+            st = sm.stat(self.state_root / rel)
+            if st is not None:
+                current[sid] = (rel, [st.size, st.mtime_ns])
+
+        removed = [sid for sid in self.shots if sid not in current]
+        changed = {}
+        for sid, (rel, fp) in current.items():
+            old = self.shots.get(sid)
+            if old is not None and old["qc"] == rel and old["fp"] == fp:
+                continue
+            qc = sm.read_json(self.state_root / rel)
+            hashes = ((qc or {}).get("metrics") or {}).get("frame_phash") if isinstance(qc, dict) else None
+            changed[sid] = (rel, fp, [h for h in hashes or [] if isinstance(h, str) and len(h) == 16])
+        self.updated = len(removed) + len(changed)
+        if not self.updated:
+            return
+        try:
+            with self.db:  # one transaction: the index never holds half an update
+                for sid in removed + list(changed):
+                    self.db.execute("DELETE FROM chunks WHERE sid = ?", (sid,))
+                    self.db.execute("DELETE FROM shots WHERE sid = ?", (sid,))
+                for sid, (rel, fp, hashes) in changed.items():
+                    self.db.execute("INSERT INTO shots VALUES (?, ?, ?, ?, ?)", (sid, rel, fp[0], fp[1], len(hashes)))
+                    self.db.executemany("INSERT INTO chunks VALUES (?, ?, ?, ?, ?)",
+                                        _chunk_rows(sid, hashes))
+        except (sqlite3.Error, ValueError):
+            # read-only cache: rebuild this run in memory from scratch
+            self.db = sqlite3.connect(":memory:")
+            self.db.executescript(_SCHEMA)
+            self.shots = {}
+            self.refresh(durum, jobs)
+            return
+        for sid in removed:
+            del self.shots[sid]
+        for sid, (rel, fp, hashes) in changed.items():
+            self.shots[sid] = {"qc": rel, "fp": fp, "frames": len(hashes)}
+
+    def hashes(self, shot_id: str) -> list[str]:
+        """shot_id's frame hashes, in frame order."""
+        return [h for (h,) in self.db.execute(
+            "SELECT h FROM chunks WHERE sid = ? AND t = 0 ORDER BY i", (shot_id,))]
+
+    def frame_count(self) -> int:
+        return sum(e["frames"] for e in self.shots.values())
+
+    def query(self, shot_id: str, radius: int = DEFAULT_RADIUS) -> list[dict]:
+        """Other shots with frames within radius of shot_id's frames, best first."""
+        hits: dict[str, dict] = {}
+        self.checked = 0
+        for qi, hx in enumerate(self.hashes(shot_id)):
+            h = from_hex(hx)
+            cands = set()
+            for t, probes in enumerate(chunk_probes(h, radius)):
+                marks = ",".join("?" * len(probes))
+                cands.update(self.db.execute(
+                    f"SELECT sid, i, h FROM chunks WHERE t = ? AND c IN ({marks})", (t, *probes)))
+            self.checked += len(cands)
+            for sid, _, other in cands:
+                if sid == shot_id:
+                    continue
+                d = hamming(h, from_hex(other))
+                if d > radius:
+                    continue
+                r = hits.setdefault(sid, {"shot_id": sid, "matched": set(), "min_distance": d})
+                r["matched"].add(qi)
+                r["min_distance"] = min(r["min_distance"], d)
+        rows = [
+            {"shot_id": r["shot_id"], "frames_matched": len(r["matched"]), "min_distance": r["min_distance"]}
+            for r in hits.values()
+        ]
+        order = {sid: i for i, sid in enumerate(sort_shot_ids(hits.keys()))}
+        rows.sort(key=lambda r: (-r["frames_matched"], r["min_distance"], order[r["shot_id"]]))
+        return rows
+
+
+def cmd_similar(args) -> int:
+    durum_path = Path(args.path)
+    if not durum_path.is_file():
+        return _fail(f"cannot read {durum_path}")
+    try:
+        durum = json.loads(durum_path.read_text(encoding="utf-8"))
+    except Exception as e:
+        return _fail(f"invalid json: {e}")
+    shots = durum.get("shots")
+    if not isinstance(shots, dict):
+        return _fail("DURUM.json: 'shots' must be an object")
+    if args.shot_id not in shots:
+        return _fail(f"{args.shot_id}: shot not found in DURUM")
+    if args.radius < 0:
+        return _fail("--radius must be >= 0")
+
+    index = SimilarIndex(durum_path.parent)
+    index.refresh(durum, args.jobs)
+    entry = index.shots.get(args.shot_id)
+    if not entry or not entry["frames"]:
+        return _fail(f"{args.shot_id}: no frame hashes (qc.json missing or made before perceptual hashing; re-run qc)")
+
+    rows = index.query(args.shot_id, args.radius)
+    for r in rows:
+        outputs = shots[r["shot_id"]].get("outputs") or {}
+        r["frames"] = index.shots[r["shot_id"]]["frames"]
+        r["preview"] = outputs.get("preview.mp4", "")
+
+    if args.json:
+        print(json.dumps({
+            "shot_id": args.shot_id,
+            "radius": args.radius,
+            "frames": entry["frames"],
+            "similar": rows,
+            "indexed_shots": len(index.shots),
+            "indexed_frames": index.frame_count(),
+            "candidates_checked": index.checked,
+        }, ensure_ascii=False, indent=2))
+        return 0
+
+    preview = (shots[args.shot_id].get("outputs") or {}).get("preview.mp4", "")
+    print(f"{args.shot_id}: {entry['frames']} frame hashes, {preview or '-'}")
+    if not rows:
+        print(f"[OK] no similar previews within {args.radius} bits")
+        return 0
+    w = max([8] + [len(r["shot_id"]) for r in rows])
+    print(f"{'ID':<{w}} {'MATCHED':<9} {'MIN_DIST':<9} PREVIEW")
+    print("-" * (40 + w))
+    for r in rows:
+        print(f"{r['shot_id']:<{w}} {str(r['frames_matched']) + '/' + str(entry['frames']):<9} "
+              f"{r['min_distance']:<9} {r['preview']}")
+    print("")
+    print(
+        f"similar: {len(rows)} | indexed shots: {len(index.shots)} | "
+        f"frames: {index.frame_count()} | candidates checked: {index.checked}"
+    )
+    return 0
@@ -0,0 +1,99 @@
+"""
+Persistent per-shot hashes for the whole-state hash (canonical_json.StateHasher).
+
+A DURUM write that knows which shots it touched (write_durum(touched=...))
+stores the per-shot hashes, the digest and the stat fingerprint (size,
+mtime_ns, inode) of the file it left on disk:
+
+    <cache>/state_hash/<sha256 of the absolute DURUM path>[:16].json
+    {"version": 1, "durum": "/abs/DURUM.json", "file": [size, mtime_ns, inode],
+     "shots": {"SH001": "<sha256>", ...}, "digest": "<sha256>"}
+
+The next such write starts from those hashes when DURUM on disk is still the
+file they describe and re-hashes only the top-level fields and the touched
+shots. A write without touched (or over a file the entry does not describe)
+skips the cache; its new fingerprint makes the entry stale. release takes
+the digest straight from a fresh entry and otherwise hashes in full and
+stores the result for the writes that follow.
+
+touched is trusted: the caller must have read DURUM from the file that is on
+disk when it writes (the same condition under which its write does not drop
+a concurrent update). Writers that do not pass touched lose nothing but the
+shortcut. Safe to delete.
+"""
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+from .cache import cache_dir, sha256_bytes
+from .canonical_json import StateHasher
+from .validate_cache import stat_fingerprint
+
+CACHE_VERSION = 1
+
+
+def _cache_path(durum_path: Path) -> Path:
+    return cache_dir("state_hash") / (sha256_bytes(str(durum_path).encode("utf-8"))[:16] + ".json")
+
+
+def load(durum_path, fingerprint) -> dict | None:
+    """The entry for durum_path if it describes the file with `fingerprint`, else None."""
+    durum_path = Path(durum_path).resolve()
+    if fingerprint is None:
+        return None
+    try:
+        data = json.loads(_cache_path(durum_path).read_text(encoding="utf-8"))
+    except Exception:
+        return None
+    if (not isinstance(data, dict) or data.get("version") != CACHE_VERSION or data.get("durum") != str(durum_path)
+            or data.get("file") != fingerprint or not isinstance(data.get("shots"), dict)):
+        return None
+    return data
+
+
+def save(durum_path, hasher: StateHasher) -> None:
+    """Store hasher's hashes for the file now at durum_path (call right after writing it)."""
+    from .durum_io import write_json_atomic
+
+    durum_path = Path(durum_path).resolve()
+    try:
+        write_json_atomic(_cache_path(durum_path), {
+            "version": CACHE_VERSION,
+            "durum": str(durum_path),
+            "file": stat_fingerprint(durum_path),
+            "shots": hasher.shot_hashes,
+            "digest": hasher.digest(),
+        })
+    except (OSError, ValueError):
+        pass  # a cache: the next release hashes in full
+
+
+def hasher_for_write(durum_path, durum: dict, touched) -> StateHasher | None:
+    """
+    StateHasher for `durum` (about to replace durum_path) built from the cached
+    hashes plus the touched shot ids; None when the entry cannot be trusted.
+    """
+    entry = load(durum_path, stat_fingerprint(durum_path))
+    if entry is None:
+        return None
+    hasher = StateHasher(durum, entry["shots"])
+    for sid in touched:
+        hasher.update_shot(sid)
+    return hasher
+
+
+def state_digest(durum_path, durum: dict, fingerprint) -> str:
+    """
+    Whole-state hash of `durum`, read from durum_path while it had `fingerprint`:
+    the cached digest when the entry describes that file, a full hash otherwise.
+    """
+    # a file replaced between the stat and the read has a new inode: never trust that pairing
+    unchanged = fingerprint is not None and stat_fingerprint(durum_path) == fingerprint
+    entry = load(durum_path, fingerprint) if unchanged else None
+    if entry is not None and isinstance(entry.get("digest"), str):
+        return entry["digest"]
+    hasher = StateHasher(durum)
+    if unchanged:
+        save(durum_path, hasher)
+    return hasher.digest()
@@ -0,0 +1,174 @@
+"""
+Batched file-existence / size lookups.
+
+Commands used to call exists()/is_file()/getsize() once per output path; on
+NFS each of those is a round trip. StatMap groups the paths by directory and
+resolves each directory with a single os.scandir() (directories in parallel):
+
+- a path whose name is not in its directory listing is missing, no stat needed
+- present files are stat'ed once (DirEntry.stat(); free on Windows) and the
+  result is kept for the rest of the run
+
+Build one StatMap per command run and pass it to whatever needs it (audit,
+validate, transition gates, release, manifest, readiness).
+
+    sm = StatMap.scan(paths)          # referenced files only
+    sm.walk(outputs_root)             # + every file under a tree (orphans)
+    sm.stat(p) -> FileStat | None     # None = missing / not a regular file
+    sm.read_json(p)                   # parsed once per run (None if missing/bad)
+"""
+from __future__ import annotations
+
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import NamedTuple
+
+
+class FileStat(NamedTuple):
+    size: int
+    mtime_ns: int
+
+
+def _key(path) -> str:
+    return os.path.normpath(os.path.abspath(os.fspath(path)))
+
+
+def _scan_one(d: str, wanted: set | None):
+    """(dir, {file names} | None, {name: FileStat}, [sub dirs])"""
+    files: set[str] = set()
+    stats: dict[str, FileStat] = {}
+    subdirs: list[str] = []
+    try:
+        with os.scandir(d) as it:
+            for e in it:
+                try:
+                    if e.is_dir():
+                        subdirs.append(e.path)
+                        continue
+                    if not e.is_file():
+                        continue
+                    files.add(e.name)
+                    if wanted is not None and e.name in wanted:
+                        st = e.stat()
+                        stats[e.name] = FileStat(st.st_size, st.st_mtime_ns)
+                except OSError:
+                    continue
+    except OSError:
+        return d, None, stats, subdirs
+    return d, files, stats, subdirs
+
+
+class StatMap:
+    def __init__(self, jobs: int = 8):
+        self.jobs = max(1, jobs)
+        self._files: dict[str, set | None] = {}  # dir -> file names (None: dir missing)
+        self._stats: dict[str, FileStat] = {}  # abs path -> stat of a present file
+        self._subdirs: dict[str, list] = {}  # dir -> child directories
+        self._json: dict[str, object] = {}  # abs path -> parsed JSON (None: unreadable)
+        self.scandirs = 0
+
+    @classmethod
+    def scan(cls, paths, jobs: int = 8) -> "StatMap":
+        sm = cls(jobs)
+        sm.add(paths)
+        return sm
+
+    def _run(self, work: dict[str, set | None]) -> None:
+        if not work:
+            return
+        if self.jobs == 1 or len(work) == 1:
+            results = [_scan_one(d, w) for d, w in work.items()]
+        else:
+            with ThreadPoolExecutor(max_workers=min(self.jobs, len(work))) as ex:
+                results = list(ex.map(_scan_one, work.keys(), work.values()))
+
+        for d, files, stats, subs in results:
+            self.scandirs += 1
+            self._files[d] = files
+            self._subdirs[d] = subs
+            for name, st in stats.items():
+                self._stats[os.path.join(d, name)] = st
+
+    def add(self, paths) -> None:
+        """Resolve more paths (directories not seen yet are scanned)."""
+        work: dict[str, set] = {}
+        for p in paths:
+            k = _key(p)
+            if k in self._stats:
+                continue
+            d, name = os.path.split(k)
+            if d in self._files and name not in (self._files[d] or ()):
+                continue  # already known missing
+            work.setdefault(d, set()).add(name)
+
+        # directories listed before (e.g. by walk) only need the stats
+        for d in [d for d in work if d in self._files]:
+            for name in work.pop(d):
+                self._stat_late(os.path.join(d, name))
+        self._run(work)
+
+    def walk(self, root, skip_prefix: str = "_") -> None:
+        """List every directory under root (level by level, in parallel); see files_under()."""
+        level = [_key(root)]
+        while level:
+            self._run({d: None for d in level if d not in self._files})
+            level = [
+                c for d in level for c in self._subdirs.get(d, ())
+                if not (skip_prefix and os.path.basename(c).startswith(skip_prefix))
+            ]
+
+    def _stat_late(self, k: str) -> FileStat | None:
+        try:
+            st = os.stat(k)
+        except OSError:
+            return None
+        fs = self._stats[k] = FileStat(st.st_size, st.st_mtime_ns)
+        return fs
+
+    def stat(self, path) -> FileStat | None:
+        k = _key(path)
+        fs = self._stats.get(k)
+        if fs is not None:
+            return fs
+        d, name = os.path.split(k)
+        if d not in self._files:
+            self.add([k])
+            return self._stats.get(k)
+        if name not in (self._files[d] or ()):
+            return None
+        return self._stat_late(k)
+
+    def is_file(self, path) -> bool:
+        return self.stat(path) is not None
+
+    def size(self, path) -> int | None:
+        fs = self.stat(path)
+        return fs.size if fs is not None else None
+
+    def read_json(self, path):
+        """Parsed JSON of a present file, cached for the run; None when missing or invalid."""
+        k = _key(path)
+        if k not in self._json:
+            data = None
+            if self.stat(k) is not None:
+                try:
+                    with open(k, "r", encoding="utf-8") as f:
+                        data = json.load(f)
+                except Exception:
+                    data = None
+            self._json[k] = data
+        return self._json[k]
+
+    def files_under(self, root, skip_prefix: str = "_"):
+        """Every listed file below root, skipping directories whose name starts with skip_prefix."""
+        r = _key(root)
+        for d in sorted(self._files):
+            files = self._files[d]
+            if not files or not (d == r or d.startswith(r + os.sep)):
+                continue
+            rel_parts = os.path.relpath(d, r).split(os.sep)
+            if skip_prefix and any(p.startswith(skip_prefix) for p in rel_parts if p != "."):
+                continue
+            for name in sorted(files):
+                yield os.path.join(d, name)
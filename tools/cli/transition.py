@@ -4,6 +4,9 @@ import os
 import sys
 from pathlib import Path
 
+from .durum_io import write_durum
+from .statmap import StatMap
+
 
 IMMUTABLE_STATUSES = {"RELEASE"}
 
@@ -15,11 +18,89 @@ AUTHORITATIVE_TRANSITIONS = {
     "RELEASE": set(),  # terminal
 }
 
+QC_DONE_FILES_MSG = "QC -> DONE requires qc.json and preview.mp4 file to exist on disk"
+QC_DONE_OK_MSG = "QC -> DONE requires qc.json ok==true"
+
+
 def _fail(msg: str) -> int:
     print("[ERR]", msg)
     return 2
 
 
+def _path_rule(rel) -> str | None:
+    rel_path = Path(rel)
+
+    if rel_path.is_absolute():
+        return "absolute paths are not allowed in outputs"
+
+    if ".." in rel_path.parts:
+        return "path traversal detected in outputs"
+
+    if not str(rel).startswith("outputs/"):
+        return "outputs must be inside outputs/ directory"
+    return None
+
+
+def gate_reasons(cur: str, to_status: str, shot: dict, base_dir, sm: StatMap | None = None) -> list[str]:
+    """
+    Blocking reasons for the cur -> to_status gate (empty list: gate passes).
+    The first reason is what `transition` reports. Only the gates themselves;
+    callers check AUTHORITATIVE_TRANSITIONS / IMMUTABLE_STATUSES first.
+
+    sm: the run's StatMap (file presence + parsed qc.json); readiness passes
+    one shared map for all shots, transition builds a small one.
+    """
+    base_dir = Path(base_dir)
+    outputs = shot.get("outputs") or {}
+    reasons: list[str] = []
+
+    # -------------------------
+    # IN_PROGRESS -> QC gate
+    # -------------------------
+    if cur == "IN_PROGRESS" and to_status == "QC":
+        if not isinstance(outputs, dict) or len(outputs) == 0:
+            reasons.append("IN_PROGRESS -> QC requires non-empty outputs")
+
+    # -------------------------
+    # QC -> DONE hard gate
+    # -------------------------
+    if cur == "QC" and to_status == "DONE":
+        qc_rel = outputs.get("qc.json")
+        prev_rel = outputs.get("preview.mp4")
+
+        # key yoksa
+        if not qc_rel or not prev_rel:
+            return [QC_DONE_FILES_MSG]
+
+        if sm is None:
+            sm = StatMap.scan([base_dir / qc_rel, base_dir / prev_rel])
+
+        for rel in [qc_rel, prev_rel]:
+            why = _path_rule(rel)
+            # dosya disk'te yoksa da AYNI mesaj dön
+            if why is None and not sm.is_file(base_dir / rel):
+                why = QC_DONE_FILES_MSG
+            if why:
+                if why not in reasons:
+                    reasons.append(why)
+                continue
+
+            # qc.json ok==true şartı (S5 için)
+            if rel is qc_rel:
+                qc_data = sm.read_json(base_dir / qc_rel)
+                if not isinstance(qc_data, dict) or qc_data.get("ok") is not True:
+                    reasons.append(QC_DONE_OK_MSG)
+
+    # -------------------------
+    # DONE -> RELEASE gate
+    # -------------------------
+    if cur == "DONE" and to_status == "RELEASE":
+        if not outputs:
+            reasons.append("DONE -> RELEASE requires outputs")
+
+    return reasons
+
+
 def cmd_transition(args) -> int:
     path = getattr(args, "durum", None) or getattr(args, "path", None) or getattr(args, "durum_json", None)
     shot_id = getattr(args, "shot_id", None) or getattr(args, "shot", None) or getattr(args, "id", None)
@@ -69,60 +150,9 @@ def cmd_transition(args) -> int:
     if not allowed or to_status not in allowed:
         return _fail(f"invalid transition: {cur} -> {to_status}")
 
-    # -------------------------
-    # IN_PROGRESS -> QC gate
-    # -------------------------
-    if cur == "IN_PROGRESS" and to_status == "QC":
-        outputs = shot.get("outputs") or {}
-        if not isinstance(outputs, dict) or len(outputs) == 0:
-            return _fail("IN_PROGRESS -> QC requires non-empty outputs")
-
-    # -------------------------
-    # QC -> DONE hard gate
-    # -------------------------
-    if cur == "QC" and to_status == "DONE":
-        outputs = shot.get("outputs") or {}
-        qc_rel = outputs.get("qc.json")
-        prev_rel = outputs.get("preview.mp4")
-
-        # key yoksa
-        if not qc_rel or not prev_rel:
-            return _fail("QC -> DONE requires qc.json and preview.mp4 file to exist on disk")
-
-        for rel in [qc_rel, prev_rel]:
-            rel_path = Path(rel)
-
-            if rel_path.is_absolute():
-                return _fail("absolute paths are not allowed in outputs")
-
-            if ".." in rel_path.parts:
-                return _fail("path traversal detected in outputs")
-
-            if not str(rel).startswith("outputs/"):
-                return _fail("outputs must be inside outputs/ directory")
-
-            full = (p.parent / rel_path).resolve()
-
-            # dosya disk'te yoksa da AYNI mesaj dön
-            if not full.exists():
-                return _fail("QC -> DONE requires qc.json and preview.mp4 file to exist on disk")
-            # qc.json ok==true şartı (S5 için)
-            try:
-                qc_abs = (p.parent / Path(qc_rel)).resolve()
-                qc_data = json.loads(qc_abs.read_text(encoding="utf-8"))
-            except Exception:
-                return _fail("QC -> DONE requires qc.json ok==true")
-
-            if qc_data.get("ok") is not True:
-                return _fail("QC -> DONE requires qc.json ok==true")
-
-    # -------------------------
-    # DONE -> RELEASE gate
-    # -------------------------
-    if cur == "DONE" and to_status == "RELEASE":
-        outputs = shot.get("outputs") or {}
-        if not outputs:
-            return _fail("DONE -> RELEASE requires outputs")
+    reasons = gate_reasons(cur, to_status, shot, p.parent)
+    if reasons:
+        return _fail(reasons[0])
 
     # APPLY TRANSITION (genel)
     shot["status"] = to_status
@@ -130,10 +160,7 @@ def cmd_transition(args) -> int:
     durum["shots"] = shots
 
     try:
-        p.write_text(
-            json.dumps(durum, indent=2, ensure_ascii=False) + "\n",
-            encoding="utf-8",
-        )
+        write_durum(p, durum, touched=[shot_id])
     except Exception as e:
         return _fail(f"failed to write DURUM.json: {e}")
 
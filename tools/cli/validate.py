@@ -4,8 +4,19 @@ from __future__ import annotations
 import json
 import os
 import sys
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
 from datetime import datetime, timezone
 
+from .schema_compile import load_validator
+from .shot_index import sort_shot_ids
+from .statmap import StatMap
+from .validate_cache import ValidationCache
+
+ROOT_KEY = "<root>"
+
+# below this many shots a process pool costs more than it saves
+_PARALLEL_MIN_SHOTS = 256
+
 
 def _fail(msg: str) -> int:
     print(f"[FAIL] {msg}", file=sys.stderr)
@@ -33,9 +44,201 @@ def _is_iso_utc_z(s: str) -> bool:
         return True
     except Exception:
         return False
-    
+
 from pathlib import Path
 
+QC_SCHEMA_PATH = Path(__file__).resolve().parents[2] / "schema" / "qc.schema.json"
+
+
+class Report:
+    """
+    Validation result grouped by shot (errors on top-level fields go under
+    "<root>"). Stops accepting errors once max_errors is reached.
+    """
+
+    def __init__(self, durum_path: str, fmt: str, max_errors: int = 0):
+        self.durum_path = str(durum_path)
+        self.fmt = fmt
+        self.max_errors = max_errors
+        self.errors: dict[str, list[str]] = {}
+        self.count = 0
+        self.truncated = False
+        self.shots_total = 0
+        self.checked = 0
+
+    @property
+    def full(self) -> bool:
+        return bool(self.max_errors) and self.count >= self.max_errors
+
+    def add(self, key: str, msg: str) -> None:
+        if self.full:
+            self.truncated = True
+            return
+        self.errors.setdefault(key, []).append(msg)
+        self.count += 1
+
+    def extend(self, key: str, msgs) -> None:
+        for m in msgs:
+            self.add(key, m)
+
+    def to_json(self) -> dict:
+        keys = sorted(k for k in self.errors if k != ROOT_KEY)
+        order = ([ROOT_KEY] if ROOT_KEY in self.errors else []) + sort_shot_ids(keys)
+        return {
+            "ok": self.count == 0,
+            "durum": self.durum_path,
+            "format": self.fmt,
+            "shots": self.shots_total,
+            "checked": self.checked,
+            "error_count": self.count,
+            "truncated": self.truncated,
+            "errors": {k: self.errors[k] for k in order},
+        }
+
+
+def _schema_msgs(errors) -> list[str]:
+    out = []
+    for err in sorted(errors, key=lambda e: [str(p) for p in e.path]):
+        path = ".".join(str(p) for p in err.path) if err.path else ROOT_KEY
+        out.append(f"{path}: {err.message}")
+    return out
+
+
+def _qc_rel(shot):
+    """outputs['qc.json'] as declared (any type; None when not declared)."""
+    outputs = shot.get("outputs") if isinstance(shot, dict) else None
+    if not isinstance(outputs, dict) or "qc.json" not in outputs:
+        return None
+    return outputs["qc.json"]
+
+
+def _qc_errors(base_dir: Path, shot: dict, present: bool | None = None) -> list[str]:
+    """present: qc.json existence from the run's StatMap (None: stat it here)."""
+    qc_rel = _qc_rel(shot)
+    if qc_rel is None:
+        return []
+    if not isinstance(qc_rel, str) or not qc_rel.strip():
+        return [f"outputs['qc.json'] must be a non-empty string path, got {qc_rel!r}"]
+
+    qc_path = (base_dir / qc_rel).resolve()
+
+    if not (qc_path.exists() if present is None else present):
+        return [f"qc.json declared but file missing: {qc_rel}"]
+
+    if not QC_SCHEMA_PATH.exists():
+        return []
+
+    try:
+        qc_data = _load_json(str(qc_path))
+    except Exception as e:
+        return [f"qc.json unreadable: {e}"]
+
+    qc_errors = sorted(load_validator(QC_SCHEMA_PATH).iter_errors(qc_data), key=lambda e: [str(p) for p in e.path])
+    if qc_errors:
+        msg = "; ".join([f"{'/'.join(map(str, e.path))}: {e.message}" for e in qc_errors])
+        return [f"qc.json schema invalid: {msg}"]
+    return []
+
+
+def _check_shots(durum_path: str, shot_schema_path: str | None, items: list) -> list[tuple[str, list[str]]]:
+    """
+    Worker: per-shot checks for one shard of (shot_id, shot, qc_present) items.
+    shot_schema_path is None for CineV3 (its schema is checked on the document).
+    Validators are compiled/loaded once per process (load_validator memoizes).
+    """
+    base_dir = Path(durum_path).parent
+    v = load_validator(shot_schema_path) if shot_schema_path else None
+
+    out = []
+    for shot_id, shot, qc_present in items:
+        errs: list[str] = []
+        if not isinstance(shot, dict):
+            out.append((shot_id, ["shot value must be object"]))
+            continue
+
+        # enforce key==id consistency
+        if shot.get("id") != shot_id:
+            errs.append("shot.id must equal the key name")
+
+        if v is not None:
+            errs.extend(_schema_msgs(v.iter_errors(shot)))
+
+        errs.extend(_qc_errors(base_dir, shot, qc_present))
+        out.append((shot_id, errs))
+    return out
+
+
+def _shards(items: list, jobs: int) -> list[list]:
+    size = max(64, -(-len(items) // (jobs * 4)))
+    return [items[i:i + size] for i in range(0, len(items), size)]
+
+
+def _run_shot_checks(report: Report, durum_path: str, shot_schema_path, shots: dict, todo: list[str], jobs: int) -> list[str]:
+    """Runs per-shot checks (sharded over a process pool when worth it); returns the shot ids that passed."""
+    # qc.json existence for the whole batch: one scandir per directory
+    base_dir = Path(durum_path).parent
+    qc_paths = {sid: base_dir / rel for sid in todo if isinstance(rel := _qc_rel(shots[sid]), str) and rel.strip()}
+    sm = StatMap.scan(qc_paths.values())
+    items = [
+        (sid, shots[sid], sm.is_file(qc_paths[sid]) if sid in qc_paths else None)
+        for sid in todo
+    ]
+    passed: list[str] = []
+
+    def collect(results):
+        for sid, errs in results:
+            report.checked += 1
+            if errs:
+                report.extend(sid, errs)
+            else:
+                passed.append(sid)
+
+    if jobs <= 1 or len(items) < _PARALLEL_MIN_SHOTS:
+        for shard in _shards(items, 1):
+            collect(_check_shots(durum_path, shot_schema_path, shard))
+            if report.full:
+                report.truncated = report.truncated or report.checked < len(items)
+                break
+        return passed
+
+    ex = ProcessPoolExecutor(max_workers=jobs)
+    try:
+        pending = {ex.submit(_check_shots, durum_path, shot_schema_path, shard) for shard in _shards(items, jobs)}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for f in done:
+                collect(f.result())
+            if report.full and pending:
+                report.truncated = True
+                break
+    finally:
+        ex.shutdown(wait=True, cancel_futures=True)
+    return passed
+
+
+def _emit(report: Report, as_json: bool) -> int:
+    if as_json:
+        print(json.dumps(report.to_json(), ensure_ascii=False, indent=2))
+        return 0 if report.count == 0 else 1
+
+    if report.count == 0:
+        suffix = "cinev3 " if report.fmt == "cinev3" else ""
+        return _ok(f"{report.durum_path} is valid ({suffix}shots={report.shots_total}, checked={report.checked})")
+
+    print("[FAIL] Validation errors:", file=sys.stderr)
+    for key, msgs in report.to_json()["errors"].items():
+        for m in msgs:
+            print(f"  - {m}" if key == ROOT_KEY else f"  - {key}: {m}", file=sys.stderr)
+    if report.truncated:
+        print(f"  ... stopped after {report.count} error(s) (--max-errors)", file=sys.stderr)
+    return 1
+
+
+def _jobs(args) -> int:
+    n = getattr(args, "jobs", 0) or 0
+    return n if n > 0 else min(8, os.cpu_count() or 1)
+
+
 def cmd_validate(args) -> int:
     repo_root = Path(__file__).resolve().parents[2]
 
@@ -45,194 +248,147 @@ def cmd_validate(args) -> int:
     except Exception as e:
         return _fail(f"Cannot read DURUM file: {e}")
 
+    opts = {
+        "full": getattr(args, "full", False),
+        "jobs": _jobs(args),
+        "max_errors": getattr(args, "max_errors", 0) or 0,
+        "as_json": getattr(args, "json", False),
+    }
+
     # CineV2 format
     if "active_project" in durum and "current_focus" in durum and "last_updated_utc" in durum:
         schema_path = repo_root / "schema" / "shot.schema.json"
-        return validate_durum(args.path, str(schema_path))
+        return validate_durum(args.path, str(schema_path), durum=durum, **opts)
 
     # CineV3 format
     if "project" in durum and "shots" in durum:
         schema_path = repo_root / "schema" / "cinev3" / "durum.schema.json"
-        return validate_durum_v3(args.path, str(schema_path))
+        return validate_durum_v3(args.path, str(schema_path), durum=durum, **opts)
 
     return _fail("Unknown DURUM format (ne CineV2 ne CineV3 top-level alanları bulundu)")
 
-def validate_durum(durum_path: str, schema_path: str) -> int:
-    # 1) basic load
-    try:
-        durum = _load_json(durum_path)
-    except Exception as e:
-        return _fail(f"Cannot read DURUM file: {e}")
+def validate_durum(
+    durum_path: str,
+    schema_path: str,
+    durum: dict | None = None,
+    full: bool = False,
+    jobs: int = 1,
+    max_errors: int = 0,
+    as_json: bool = False,
+) -> int:
+    # 1) basic load (skipped when the caller already parsed the file)
+    if durum is None:
+        try:
+            durum = _load_json(durum_path)
+        except Exception as e:
+            return _fail(f"Cannot read DURUM file: {e}")
 
-    # 2) basic structure checks (no dependency)
+    report = Report(durum_path, "cinev2", max_errors)
+
+    # 2) basic structure checks (no dependency); nothing below can run without them
     required_top = ["active_project", "current_focus", "shots", "last_updated_utc"]
     for k in required_top:
         if k not in durum:
-            return _fail(f"Missing top-level key: {k}")
+            report.add(ROOT_KEY, f"Missing top-level key: {k}")
 
-    if not isinstance(durum["shots"], dict):
-        return _fail("shots must be an object/dictionary (NOT an array/list)")
+    if "shots" in durum and not isinstance(durum["shots"], dict):
+        report.add(ROOT_KEY, "shots must be an object/dictionary (NOT an array/list)")
 
-    if not _is_iso_utc_z(durum["last_updated_utc"]):
-        return _fail("last_updated_utc must be ISO-8601 UTC with Z, e.g. 2025-12-30T00:00:00Z")
+    if "last_updated_utc" in durum and not _is_iso_utc_z(durum["last_updated_utc"]):
+        report.add(ROOT_KEY, "last_updated_utc must be ISO-8601 UTC with Z, e.g. 2025-12-30T00:00:00Z")
 
-    # 3) load shot schema
-    try:
-        shot_schema = _load_json(schema_path)
-    except Exception as e:
-        return _fail(f"Cannot read schema file: {e}")
+    if report.count and not isinstance(durum.get("shots"), dict):
+        return _emit(report, as_json)
 
-    # 4) jsonschema validate (hard requirement)
+    # 3) jsonschema (hard requirement; used for error messages)
     try:
-        from jsonschema import Draft7Validator
+        import jsonschema  # noqa: F401
     except Exception:
         return _fail("Missing dependency: jsonschema. Install with: python -m pip install jsonschema")
 
-    v = Draft7Validator(shot_schema)
-
-    errors = []
-    for shot_id, shot in durum["shots"].items():
-        if not isinstance(shot, dict):
-            errors.append(f"{shot_id}: shot value must be object")
-            continue
+    # 4) compile / load validators once here so workers hit the on-disk cache
+    try:
+        load_validator(schema_path)
+        if QC_SCHEMA_PATH.exists():
+            load_validator(QC_SCHEMA_PATH)
+    except Exception as e:
+        return _fail(f"Cannot read schema file: {e}")
 
-        # enforce key==id consistency
-        if shot.get("id") != shot_id:
-            errors.append(f"{shot_id}: shot.id must equal the key name")
-
-        for err in sorted(v.iter_errors(shot), key=lambda e: list(e.path)):
-            path = ".".join(str(p) for p in err.path) if err.path else "<root>"
-            errors.append(f"{shot_id}:{path}: {err.message}")
-
-    if errors:
-        print("[FAIL] Validation errors:", file=sys.stderr)
-        for e in errors:
-            print(f"  - {e}", file=sys.stderr)
-        return 1
-    
-    # --- QC report validation (hardening) ---
-    qc_schema_path = Path(__file__).resolve().parents[2] / "schema" / "qc.schema.json"
-    qc_schema = None
-
-    if qc_schema_path.exists():
+    # 5) only shots changed since the last passing run (all of them with --full)
+    shots = durum["shots"]
+    report.shots_total = len(shots)
+    cache = ValidationCache(durum_path, [schema_path, QC_SCHEMA_PATH])
+    todo = list(shots) if full else cache.changed(shots)
+
+    # 6) shot schema + qc.json checks, every error collected
+    passed = _run_shot_checks(report, durum_path, schema_path, shots, todo, jobs)
+
+    cache.record(shots, passed)
+    cache.save()
+    return _emit(report, as_json)
+
+def validate_durum_v3(
+    durum_path: str,
+    schema_path: str,
+    durum: dict | None = None,
+    full: bool = False,
+    jobs: int = 1,
+    max_errors: int = 0,
+    as_json: bool = False,
+) -> int:
+    # 1) load (skipped when the caller already parsed the file)
+    if durum is None:
         try:
-            qc_schema = _load_json(str(qc_schema_path))
-            from jsonschema import Draft7Validator as _QCValidator
-            qc_validator = _QCValidator(qc_schema)
+            durum = _load_json(durum_path)
         except Exception as e:
-            return _fail(f"Cannot load qc.schema.json: {e}")
+            return _fail(f"Cannot read DURUM file: {e}")
 
-    for shot_id, shot in durum["shots"].items():
-        outputs = shot.get("outputs") or {}
-        if not isinstance(outputs, dict):
-            continue
+    report = Report(durum_path, "cinev3", max_errors)
 
-        if "qc.json" not in outputs:
-            continue
-
-        qc_rel = outputs["qc.json"]
-        qc_path = (Path(durum_path).parent / qc_rel).resolve()
-
-        if not qc_path.exists():
-            return _fail(f"{shot_id}: qc.json declared but file missing: {qc_rel}")
-
-        if qc_schema:
-            try:
-                qc_data = _load_json(str(qc_path))
-            except Exception as e:
-                return _fail(f"{shot_id}: qc.json unreadable: {e}")
-
-            qc_errors = sorted(qc_validator.iter_errors(qc_data), key=lambda e: e.path)
-            if qc_errors:
-                msg = "; ".join([f"{'/'.join(map(str, e.path))}: {e.message}" for e in qc_errors])
-                return _fail(f"{shot_id}: qc.json schema invalid: {msg}")
-
-    return _ok(f"{durum_path} is valid (shots={len(durum['shots'])})")
-
-def validate_durum_v3(durum_path: str, schema_path: str) -> int:
-    # 1) load
+    # 2) jsonschema (hard requirement; used for error messages)
     try:
-        durum = _load_json(durum_path)
-    except Exception as e:
-        return _fail(f"Cannot read DURUM file: {e}")
+        import jsonschema  # noqa: F401
+    except Exception:
+        return _fail("Missing dependency: jsonschema. Install with: python -m pip install jsonschema")
 
-    # 2) load schema
+    # 3) compiled validate whole document; unchanged shots (see validate_cache)
+    #    are left out of `shots`, one of them is kept so minProperties still holds
     try:
-        schema = _load_json(schema_path)
+        v = load_validator(schema_path)
+        if QC_SCHEMA_PATH.exists():
+            load_validator(QC_SCHEMA_PATH)
     except Exception as e:
         return _fail(f"Cannot read schema file: {e}")
 
-    # 3) jsonschema validate whole document
-    try:
-        from jsonschema import Draft7Validator
-    except Exception:
-        return _fail("Missing dependency: jsonschema. Install with: python -m pip install jsonschema")
-
-    v = Draft7Validator(schema)
-    errors = sorted(v.iter_errors(durum), key=lambda e: list(e.path))
-
-    if errors:
-        print("[FAIL] Validation errors:", file=sys.stderr)
-        for err in errors:
-            path = ".".join(str(p) for p in err.path) if err.path else "<root>"
-            print(f"  - {path}: {err.message}", file=sys.stderr)
-        return 1
-
-    # 4) enforce shot key == shot.id consistency (same kural CineV2 gibi)
     shots = durum.get("shots")
+    cache = ValidationCache(durum_path, [schema_path, QC_SCHEMA_PATH])
+    if full or not isinstance(shots, dict) or not shots:
+        todo = list(shots) if isinstance(shots, dict) else []
+        doc = durum
+    else:
+        todo = cache.changed(shots)
+        subset = todo or list(shots)[:1]
+        doc = {**durum, "shots": {sid: shots[sid] for sid in subset}}
+
+    schema_bad: set[str] = set()
+    for err in sorted(v.iter_errors(doc), key=lambda e: [str(p) for p in e.path]):
+        path = list(err.path)
+        key = str(path[1]) if len(path) > 1 and path[0] == "shots" else ROOT_KEY
+        if key != ROOT_KEY:
+            schema_bad.add(key)
+        report.add(key, f"{'.'.join(str(p) for p in path) if path else ROOT_KEY}: {err.message}")
+
+    # 4) shots must be an object to go further
     if not isinstance(shots, dict):
-        return _fail("shots must be an object/dictionary (NOT an array/list)")
-
-    bad = []
-    for shot_id, shot in shots.items():
-        if not isinstance(shot, dict):
-            bad.append(f"{shot_id}: shot value must be object")
-            continue
-        if shot.get("id") != shot_id:
-            bad.append(f"{shot_id}: shot.id must equal the key name")
-
-    if bad:
-        print("[FAIL] Validation errors:", file=sys.stderr)
-        for e in bad:
-            print(f"  - {e}", file=sys.stderr)
-        return 1
-
-    # 5) qc.json validation (mevcut CineV2 davranışıyla aynı yaklaşım)
-    qc_schema_path = Path(__file__).resolve().parents[2] / "schema" / "qc.schema.json"
-    qc_schema = None
-
-    if qc_schema_path.exists():
-        try:
-            qc_schema = _load_json(str(qc_schema_path))
-            from jsonschema import Draft7Validator as _QCValidator
-            qc_validator = _QCValidator(qc_schema)
-        except Exception as e:
-            return _fail(f"Cannot load qc.schema.json: {e}")
-
-    for shot_id, shot in shots.items():
-        outputs = shot.get("outputs") or {}
-        if not isinstance(outputs, dict):
-            continue
-
-        if "qc.json" not in outputs:
-            continue
-
-        qc_rel = outputs["qc.json"]
-        qc_path = (Path(durum_path).parent / qc_rel).resolve()
-
-        if not qc_path.exists():
-            return _fail(f"{shot_id}: qc.json declared but file missing: {qc_rel}")
-
-        if qc_schema:
-            try:
-                qc_data = _load_json(str(qc_path))
-            except Exception as e:
-                return _fail(f"{shot_id}: qc.json unreadable: {e}")
-
-            qc_errors = sorted(qc_validator.iter_errors(qc_data), key=lambda e: e.path)
-            if qc_errors:
-                msg = "; ".join([f"{'/'.join(map(str, e.path))}: {e.message}" for e in qc_errors])
-                return _fail(f"{shot_id}: qc.json schema invalid: {msg}")
-
-    return _ok(f"{durum_path} is valid (cinev3 shots={len(shots)})")
-
+        report.add(ROOT_KEY, "shots must be an object/dictionary (NOT an array/list)")
+        return _emit(report, as_json)
+    report.shots_total = len(shots)
+
+    # 5) key == shot.id and qc.json checks (mevcut CineV2 davranışıyla aynı yaklaşım)
+    #    only for shots that passed the schema: their errors are already reported
+    todo = [sid for sid in todo if sid not in schema_bad]
+    passed = _run_shot_checks(report, durum_path, None, shots, todo, jobs)
+
+    cache.record(shots, passed)
+    cache.save()
+    return _emit(report, as_json)
@@ -0,0 +1,103 @@
+"""
+Incremental validation cache.
+
+For every shot that passed `validate`, remember:
+
+- the shot's content hash (canonical_json.shot_sha256)
+- the stat fingerprint (size, mtime_ns, inode) of its declared qc.json
+
+A later run only re-checks shots whose hash or qc.json fingerprint changed.
+Entries are keyed by the absolute DURUM path and are dropped wholesale when
+the shot / qc schema (or this format) changes. `validate --full` ignores the
+cache and re-checks everything.
+
+The cache lives under <cache>/validate/ (see cache.py) and is safe to delete.
+"""
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+
+from .cache import cache_dir, sha256_bytes
+from .canonical_json import shot_sha256
+
+CACHE_VERSION = 1
+
+
+def stat_fingerprint(path) -> list | None:
+    """[size, mtime_ns, inode] or None when the file is missing."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return [st.st_size, st.st_mtime_ns, st.st_ino]
+
+
+def qc_path_of(durum_path, shot) -> Path | None:
+    outputs = shot.get("outputs") if isinstance(shot, dict) else None
+    if not isinstance(outputs, dict) or not isinstance(outputs.get("qc.json"), str):
+        return None
+    return (Path(durum_path).parent / outputs["qc.json"]).resolve()
+
+
+class ValidationCache:
+    def __init__(self, durum_path, schema_paths):
+        self.durum_path = Path(durum_path).resolve()
+        self.path = cache_dir("validate") / (sha256_bytes(str(self.durum_path).encode("utf-8"))[:16] + ".json")
+        self.key = sha256_bytes(
+            "\n".join(
+                [str(CACHE_VERSION)]
+                + [sha256_bytes(Path(p).read_bytes()) for p in schema_paths if Path(p).exists()]
+            ).encode("utf-8")
+        )
+        self.shots: dict = {}
+        self._current: dict = {}
+        self._load()
+
+    def _load(self) -> None:
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+        except Exception:
+            return  # no cache yet / unreadable: everything is "changed"
+        if data.get("durum") == str(self.durum_path) and data.get("key") == self.key:
+            self.shots = data.get("shots") or {}
+
+    def _entry(self, shot_id: str, shot) -> dict:
+        # computed once per run, before the shot is checked, so a qc.json
+        # rewritten mid-run is seen as changed next time
+        e = self._current.get(shot_id)
+        if e is None:
+            qc = qc_path_of(self.durum_path, shot)
+            e = self._current[shot_id] = {
+                "sha256": shot_sha256(shot),
+                "qc": stat_fingerprint(qc) if qc is not None else None,
+            }
+        return e
+
+    def changed(self, shots: dict) -> list[str]:
+        """Shot ids that must be (re)validated."""
+        out = []
+        for shot_id, shot in shots.items():
+            cur = self._entry(shot_id, shot)
+            if self.shots.get(shot_id) != cur:
+                out.append(shot_id)
+        return out
+
+    def record(self, shots: dict, passed) -> None:
+        """Remember `passed` shot ids and forget shots no longer in the state."""
+        kept = {sid: e for sid, e in self.shots.items() if sid in shots}
+        for shot_id in passed:
+            kept[shot_id] = self._entry(shot_id, shots[shot_id])
+        self.shots = kept
+
+    def save(self) -> None:
+        from .durum_io import write_json_atomic
+
+        try:
+            write_json_atomic(
+                self.path,
+                {"version": CACHE_VERSION, "durum": str(self.durum_path), "key": self.key, "shots": self.shots},
+            )
+        except Exception:
+            pass  # read-only cache dir: validation result is still correct
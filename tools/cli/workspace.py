@@ -0,0 +1,195 @@
+"""
+Per-project state layout.
+
+Each project owns its state under projects/<id>/:
+
+    projects/<id>/project.json        (CineV4 contract, unchanged)
+    projects/<id>/DURUM.json          (shot state of this project only)
+    projects/<id>/outputs/...         (outputs root; paths stay relative to DURUM)
+    projects/<id>/history_archive/... (see history_archive)
+
+Commands accept `--project <id>` instead of a DURUM path; resolve_state_args()
+maps it to projects/<id>/DURUM.json (relative to the working directory, like
+release-gate does for project.json). The legacy root DURUM.json keeps working
+when a path is given explicitly. For commands that take a shot id, --project
+and a DURUM path exclude each other: with --project the positional is the
+shot id (`newshot --project p SH001`), whatever it looks like.
+
+`partition` moves a legacy root DURUM.json (all shots belong to its
+active_project) plus the outputs / history archive it references into that
+layout.
+"""
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+
+from .durum_io import write_durum
+from .history_archive import ARCHIVE_DIRNAME, archive_marker
+
+PROJECTS_DIRNAME = "projects"
+STATE_FILENAME = "DURUM.json"
+
+# positional DURUM argument names used by the subcommands
+_PATH_ATTRS = ("path", "durum")
+
+
+def _fail(msg: str) -> int:
+    print(f"[ERR] {msg}")
+    return 2
+
+
+def is_valid_project_id(project_id) -> bool:
+    if not isinstance(project_id, str) or not project_id.strip():
+        return False
+    return "/" not in project_id and "\\" not in project_id and project_id not in (".", "..")
+
+
+def project_dir(project_id: str, root=None) -> Path:
+    return Path(root or os.getcwd()) / PROJECTS_DIRNAME / project_id
+
+
+def project_state_path(project_id: str, root=None) -> Path:
+    return project_dir(project_id, root) / STATE_FILENAME
+
+
+def list_project_states(root=None) -> list[tuple[str, Path]]:
+    base = Path(root or os.getcwd()) / PROJECTS_DIRNAME
+    if not base.is_dir():
+        return []
+    out = []
+    for d in sorted(base.iterdir(), key=lambda p: p.name):
+        state = d / STATE_FILENAME
+        if d.is_dir() and state.is_file():
+            out.append((d.name, state))
+    return out
+
+
+def resolve_state_args(args) -> str | None:
+    """
+    Fill the DURUM path argument from --project when it was omitted.
+    Returns an error message, or None when args are usable.
+    """
+    attr = next((a for a in _PATH_ATTRS if hasattr(args, a)), None)
+    if attr is None or getattr(args, "all_projects", False):
+        return None
+
+    project_id = getattr(args, "project", None)
+    given = getattr(args, attr)
+
+    # --project names the state, so a positional is the shot id: argparse puts
+    # the only positional of `newshot --project p SH001` in the path slot
+    if given is not None and project_id and hasattr(args, "shot_id"):
+        if args.shot_id is not None:
+            return "use either a DURUM path or --project, not both"
+        args.shot_id, given = given, None
+        setattr(args, attr, None)
+
+    if given is not None:
+        return None
+
+    if not project_id:
+        return "missing DURUM.json path (or --project <id>)"
+    if not is_valid_project_id(project_id):
+        return f"invalid project id: {project_id}"
+
+    state = project_state_path(project_id)
+    if not state.is_file():
+        return f"project state not found: {state.as_posix()} (run partition first?)"
+
+    setattr(args, attr, str(state))
+    args.state_root = str(state.parent.resolve())
+    return None
+
+
+def _top_dirs_for(rel: str) -> str | None:
+    """outputs/v0001/preview.mp4 -> outputs/v0001 (the unit we move)."""
+    parts = Path(rel).parts
+    if Path(rel).is_absolute() or ".." in parts or len(parts) < 2:
+        return None
+    return Path(*parts[:2]).as_posix()
+
+
+def cmd_partition(args) -> int:
+    src = Path(args.path)
+    if not src.is_file():
+        return _fail(f"cannot read {src}")
+
+    try:
+        durum = json.loads(src.read_text(encoding="utf-8"))
+    except Exception as e:
+        return _fail(f"invalid json: {e}")
+
+    shots = durum.get("shots")
+    if not isinstance(shots, dict):
+        return _fail("DURUM.json: 'shots' must be an object")
+
+    project_id = args.project or durum.get("active_project")
+    if not is_valid_project_id(project_id):
+        return _fail("partition requires --project or DURUM.active_project")
+
+    src_root = src.resolve().parent
+    dst_root = project_dir(project_id, src_root)
+    dst_state = dst_root / STATE_FILENAME
+    if dst_state.exists():
+        return _fail(f"project state already exists: {dst_state}")
+
+    # collect the directories referenced by this state
+    units: set[str] = set()
+    for sid, shot in shots.items():
+        if not isinstance(shot, dict):
+            continue
+        for rel in (shot.get("outputs") or {}).values():
+            if isinstance(rel, str):
+                unit = _top_dirs_for(rel)
+                if unit:
+                    units.add(unit)
+        if archive_marker(shot) is not None:
+            units.add(f"{ARCHIVE_DIRNAME}/{sid}")
+
+    moves = []
+    errors = []
+    for unit in sorted(units):
+        a = src_root / unit
+        b = dst_root / unit
+        if not a.exists():
+            continue
+        if b.exists():
+            errors.append(f"target exists: {b}")
+            continue
+        moves.append((a, b))
+
+    if errors:
+        print("[FAIL] partition validation errors:")
+        for e in errors:
+            print(f"  - {e}")
+        return 1
+
+    print(f"[PLAN] {src} -> {dst_state}")
+    print(f"[PLAN] shots: {len(shots)} | directories to move: {len(moves)}")
+    if not args.apply:
+        print("[OK] dry run; re-run with --apply to partition")
+        return 0
+
+    done = []
+    try:
+        for a, b in moves:
+            b.parent.mkdir(parents=True, exist_ok=True)
+            a.rename(b)
+            done.append((a, b))
+        dst_root.mkdir(parents=True, exist_ok=True)
+        write_durum(dst_state, durum)
+    except Exception as e:
+        for a, b in reversed(done):
+            try:
+                b.rename(a)
+            except Exception:
+                pass
+        return _fail(f"partition failed, rolled back: {e}")
+
+    # keep the legacy file as a marker instead of deleting history
+    src.rename(src.with_name(src.name + ".partitioned"))
+
+    print(f"[OK] project state: {dst_state}")
+    return 0
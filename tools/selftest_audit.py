@@ -0,0 +1,83 @@
+import json
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from tools.cli.statmap import StatMap  # noqa: E402
+
+CLI = [sys.executable, "-m", "tools.cli", "audit"]
+
+
+def run(args):
+    p = subprocess.run(CLI + args, capture_output=True, text=True, cwd=str(ROOT))
+    return p.returncode, p.stdout + p.stderr
+
+
+def check(name: str, cond: bool, detail: str = "") -> None:
+    if not cond:
+        print(f"❌ {name}: FAIL {detail}")
+        sys.exit(1)
+    print(f"✅ {name}: OK")
+
+
+def shot(sid, outputs):
+    return {"id": sid, "phase": "FAZ_1", "status": "QC", "inputs": {"prompt": sid},
+            "outputs": outputs, "history": []}
+
+
+def main() -> int:
+    with tempfile.TemporaryDirectory() as td:
+        root = Path(td)
+        for rel, data in [
+            ("outputs/v0001/preview.mp4", b"mp4"),
+            ("outputs/v0001/qc.json", b"{}"),
+            ("outputs/v0002/preview.mp4", b""),
+            ("outputs/v0003/stray.mp4", b"x"),
+            ("outputs/v0001/_qc_frames/f0.png", b"png"),
+        ]:
+            (root / rel).parent.mkdir(parents=True, exist_ok=True)
+            (root / rel).write_bytes(data)
+
+        dpath = root / "DURUM.json"
+        dpath.write_text(json.dumps({
+            "active_project": "selftest_audit",
+            "current_focus": "FAZ_1",
+            "shots": {
+                "SH001": shot("SH001", {"preview.mp4": "outputs/v0001/preview.mp4", "qc.json": "outputs/v0001/qc.json"}),
+                "SH002": shot("SH002", {"preview.mp4": "outputs/v0002/preview.mp4", "qc.json": "outputs/v0002/qc.json"}),
+                "SH003": shot("SH003", {"preview.mp4": "../escape.mp4"}),
+            },
+            "last_updated_utc": "2026-01-01T00:00:00Z",
+        }), encoding="utf-8")
+
+        rc, out = run([str(dpath), "--json"])
+        rep = json.loads(out)
+        check("audit_fails_on_missing", rc == 1 and not rep["ok"], out)
+        check("audit_missing", [e["path"] for e in rep["missing"]] == ["outputs/v0002/qc.json"], str(rep["missing"]))
+        check("audit_zero_size", [e["path"] for e in rep["zero_size"]] == ["outputs/v0002/preview.mp4"], str(rep["zero_size"]))
+        check("audit_bad_path", [e["shot_id"] for e in rep["bad_paths"]] == ["SH003"], str(rep["bad_paths"]))
+        check("audit_orphans_skip_scratch", rep["orphaned"] == ["outputs/v0003/stray.mp4"], str(rep["orphaned"]))
+
+        rc, out = run([str(dpath)])
+        check("audit_text", rc == 1 and "[ORPHAN] outputs/v0003/stray.mp4" in out and "[MISSING] SH002 qc.json" in out, out)
+
+        # StatMap: one scandir per directory, answers reused
+        sm = StatMap.scan([root / "outputs/v0001/preview.mp4", root / "outputs/v0001/qc.json",
+                           root / "outputs/v0001/nope.mp4", root / "outputs/v0009/x.mp4"])
+        check("statmap_one_scan_per_dir", sm.scandirs == 2, str(sm.scandirs))
+        check("statmap_lookups", sm.size(root / "outputs/v0001/preview.mp4") == 3
+              and not sm.is_file(root / "outputs/v0001/nope.mp4")
+              and not sm.is_file(root / "outputs/v0009/x.mp4"))
+        check("statmap_no_rescan", sm.scandirs == 2, str(sm.scandirs))
+
+    print("\n🎉 TÜM AUDIT TESTLERİ BAŞARILI")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
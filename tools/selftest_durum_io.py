@@ -0,0 +1,164 @@
+import json
+import os
+import stat
+import sys
+import tempfile
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from tools.cli import canonical_json, durum_io, state_hash_cache  # noqa: E402
+from tools.cli.canonical_json import StateHasher, canonical_bytes, canonical_pretty, state_sha256  # noqa: E402
+from tools.cli.validate_cache import stat_fingerprint  # noqa: E402
+from tools.cli.durum_io import DurumWriter, write_durum  # noqa: E402
+
+
+def check(name: str, cond: bool, detail: str = "") -> None:
+    if not cond:
+        print(f"❌ {name}: FAIL {detail}")
+        sys.exit(1)
+    print(f"✅ {name}: OK")
+
+
+def base_durum():
+    return {
+        "active_project": "selftest",
+        "current_focus": "FAZ_1",
+        "shots": {
+            "SH001": {"id": "SH001", "phase": "FAZ_1", "status": "PLANNED",
+                      "inputs": {"prompt": "p1"}, "outputs": {}, "history": []},
+        },
+        "last_updated_utc": "2026-01-01T00:00:00Z",
+    }
+
+
+def main() -> int:
+    with tempfile.TemporaryDirectory() as td:
+        p = Path(td) / "DURUM.json"
+        write_durum(p, base_durum())
+        check("write_durum_roundtrip", json.loads(p.read_text(encoding="utf-8")) == base_durum())
+
+        leftovers = [x for x in os.listdir(td) if x.endswith(".tmp")]
+        check("no_tmp_leftovers", not leftovers, str(leftovers))
+
+        # the rename keeps the target's mode (mkstemp alone would leave 0600)
+        if os.name != "nt":
+            umask = os.umask(0o022)
+            try:
+                fresh = Path(td) / "fresh.json"
+                durum_io.write_json_atomic(fresh, {"a": 1})
+                check("new_file_mode_from_umask", stat.S_IMODE(fresh.stat().st_mode) == 0o644,
+                      oct(fresh.stat().st_mode))
+                os.chmod(p, 0o640)
+                write_durum(p, base_durum())
+                check("existing_file_mode_kept", stat.S_IMODE(p.stat().st_mode) == 0o640, oct(p.stat().st_mode))
+                os.chmod(p, 0o644)
+            finally:
+                os.umask(umask)
+
+        # group commit: N queued mutations -> one write
+        writes = []
+        real = durum_io.write_bytes_atomic
+
+        def counting(path, payload):
+            writes.append(path)
+            real(path, payload)
+
+        durum_io.write_bytes_atomic = counting
+        try:
+            with DurumWriter(p) as w:
+                for i in range(2, 12):
+                    sid = f"SH{i:03d}"
+                    w.queue(lambda d, sid=sid: d["shots"].__setitem__(
+                        sid, {"id": sid, "phase": "FAZ_1", "status": "PLANNED",
+                              "inputs": {"prompt": sid}, "outputs": {}, "history": []}))
+        finally:
+            durum_io.write_bytes_atomic = real
+
+        d = json.loads(p.read_text(encoding="utf-8"))
+        check("group_commit_single_write", len(writes) == 1, f"writes={len(writes)}")
+        check("group_commit_applied_all", len(d["shots"]) == 11, f"shots={len(d['shots'])}")
+
+        # failing batch must leave the file untouched
+        before = p.read_bytes()
+        try:
+            with DurumWriter(p) as w:
+                w.queue(lambda d: d["shots"].clear())
+                raise RuntimeError("boom")
+        except RuntimeError:
+            pass
+        check("failed_batch_no_write", p.read_bytes() == before)
+
+        # canonical hashing: formatting / key order must not change the hash
+        d = base_durum()
+        p.write_text(json.dumps(d, indent=4), encoding="utf-8")
+        h1 = state_sha256(json.loads(p.read_text(encoding="utf-8")))
+        reordered = dict(reversed(list(d.items())))
+        p.write_text(json.dumps(reordered, separators=(",", ":")), encoding="utf-8")
+        h2 = state_sha256(json.loads(p.read_text(encoding="utf-8")))
+        check("state_hash_format_independent", h1 == h2)
+
+        # incremental hash == full hash after touching one shot
+        hasher = StateHasher(d)
+        d["shots"]["SH001"]["status"] = "IN_PROGRESS"
+        hasher.update_shot("SH001")
+        check("state_hash_incremental", hasher.digest() == state_sha256(d))
+        check("state_hash_changes", hasher.digest() != h1)
+
+        # persisted per-shot hashes: a touched write re-hashes only its shots
+        prev_cache = os.environ.get("CINEV2_CACHE_DIR")
+        os.environ["CINEV2_CACHE_DIR"] = str(Path(td) / "cache")
+        hashed = []
+        real_shot_sha = canonical_json.shot_sha256
+
+        def counting_sha(shot):
+            hashed.append(shot.get("id"))
+            return real_shot_sha(shot)
+
+        canonical_json.shot_sha256 = counting_sha
+        try:
+            d = base_durum()
+            for i in range(2, 21):
+                d["shots"][f"SH{i:03d}"] = {**d["shots"]["SH001"], "id": f"SH{i:03d}"}
+            write_durum(p, d, touched=["SH001"])
+            check("state_cache_needs_seed", state_hash_cache.load(p, stat_fingerprint(p)) is None)
+            fp = stat_fingerprint(p)
+            check("state_digest_full_when_cold", state_hash_cache.state_digest(p, d, fp) == state_sha256(d))
+
+            hashed.clear()
+            d["shots"]["SH004"]["status"] = "IN_PROGRESS"
+            write_durum(p, d, touched=["SH004"])
+            check("state_write_rehashes_touched", hashed == ["SH004"], str(hashed))
+            hashed.clear()
+            digest = state_hash_cache.state_digest(p, json.loads(p.read_text(encoding="utf-8")), stat_fingerprint(p))
+            check("state_digest_from_cache", hashed == [] and digest == state_sha256(d), str(hashed))
+
+            d["shots"]["SH005"]["status"] = "IN_PROGRESS"
+            write_durum(p, d)  # touched unknown: the entry goes stale
+            hashed.clear()
+            digest = state_hash_cache.state_digest(p, d, stat_fingerprint(p))
+            check("state_digest_stale_rehashes", len(hashed) == 20 and digest == state_sha256(d), str(len(hashed)))
+        finally:
+            canonical_json.shot_sha256 = real_shot_sha
+            if prev_cache is None:
+                os.environ.pop("CINEV2_CACHE_DIR", None)
+            else:
+                os.environ["CINEV2_CACHE_DIR"] = prev_cache
+
+        # NaN is rejected by both forms, with or without orjson
+        for fn in (canonical_bytes, canonical_pretty):
+            try:
+                fn({"x": [1.0, float("nan")]})
+                rejected = False
+            except ValueError:
+                rejected = True
+            check(f"{fn.__name__}_rejects_nan", rejected)
+
+    print("\n🎉 TÜM DURUM IO TESTLERİ BAŞARILI")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,83 @@
+import json
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from tools.cli.history_archive import full_history  # noqa: E402
+from tools.cli.qc import _find_faz2_char_id  # noqa: E402
+
+
+def run(*args: str) -> subprocess.CompletedProcess:
+    return subprocess.run([sys.executable, "-m", "tools.cli", *args], text=True, capture_output=True, cwd=str(ROOT))
+
+
+def check(name: str, cond: bool, detail: str = "") -> None:
+    if not cond:
+        print(f"❌ {name}: FAIL {detail}")
+        sys.exit(1)
+    print(f"✅ {name}: OK")
+
+
+def main() -> int:
+    with tempfile.TemporaryDirectory() as td:
+        p = Path(td) / "DURUM.json"
+
+        history = [{"event": "CREATED", "at": "2025-01-01T00:00:00Z", "by": "system"}]
+        history.append({
+            "event": "FAZ2_LOCKS",
+            "at": "2025-01-02T00:00:00Z",
+            "by": "user",
+            "note": json.dumps({"character_lock": {"id": "hero"}}),
+        })
+        for i in range(40):
+            history.append({
+                "event": "STATUS_CHANGED", "from": "QC", "to": "RETRY",
+                "at": f"2025-02-{(i % 28) + 1:02d}T00:00:00Z", "by": "cli",
+            })
+
+        durum = {
+            "active_project": "selftest",
+            "current_focus": "FAZ_2",
+            "shots": {
+                "SH001": {"id": "SH001", "phase": "FAZ_2", "status": "IN_PROGRESS",
+                          "inputs": {"prompt": "p"}, "outputs": {}, "history": history},
+            },
+            "last_updated_utc": "2026-01-01T00:00:00Z",
+        }
+        p.write_text(json.dumps(durum, indent=2), encoding="utf-8")
+        size_before = p.stat().st_size
+
+        r = run("archive-history", str(p), "--keep", "5")
+        check("archive_ok", r.returncode == 0, r.stdout + r.stderr)
+
+        d = json.loads(p.read_text(encoding="utf-8"))
+        shot = d["shots"]["SH001"]
+        check("hot_history_small", len(shot["history"]) == 6, str(len(shot["history"])))
+        check("marker_first", shot["history"][0]["event"] == "HISTORY_ARCHIVED")
+        check("durum_smaller", p.stat().st_size < size_before)
+
+        full = full_history(shot, Path(td))
+        check("full_history_roundtrip", full == history)
+        check("faz2_char_from_archive", _find_faz2_char_id(shot, Path(td)) == "hero")
+
+        # second pass appends a new segment and keeps order
+        r = run("archive-history", str(p), "--keep", "2")
+        check("archive_again_ok", r.returncode == 0, r.stdout + r.stderr)
+        shot = json.loads(p.read_text(encoding="utf-8"))["shots"]["SH001"]
+        check("two_segments", len(shot["history"][0]["segments"]) == 2)
+        check("full_history_roundtrip_2", full_history(shot, Path(td)) == history)
+
+        r = run("validate", str(p))
+        check("validate_after_archive", r.returncode == 0, r.stdout + r.stderr)
+
+    print("\n🎉 TÜM HISTORY ARCHIVE TESTLERİ BAŞARILI")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,4 +1,5 @@
 import json
+import os
 import subprocess
 import sys
 import tempfile
@@ -65,6 +66,38 @@ def main():
             print(out)
             sys.exit(1)
 
+        # streaming load: a non-object "shots" is still a clean error
+        bad = tmp / "bad.json"
+        write_json(bad, {"active_project": "x", "shots": [1, 2]})
+        rc, out = run(CLI + [str(bad)])
+        if rc == 0 or "'shots' must be an object" not in out:
+            print("❌ GEÇERSİZ 'shots' İÇİN HATA BEKLENİYORDU")
+            print(out)
+            sys.exit(1)
+
+        print("✅ OK")
+
+        # per-project layout: --project and workspace-wide --all-projects
+        for pid in ("p1", "p2"):
+            pdir = tmp / "projects" / pid
+            pdir.mkdir(parents=True)
+            durum["active_project"] = pid
+            write_json(pdir / "DURUM.json", durum)
+
+        env = dict(os.environ, PYTHONPATH=str(ROOT))
+        p = subprocess.run(CLI + ["--project", "p1"], capture_output=True, text=True, cwd=str(tmp), env=env)
+        if p.returncode != 0 or "SH001" not in p.stdout:
+            print("❌ --project ÇALIŞMADI")
+            print(p.stdout + p.stderr)
+            sys.exit(1)
+
+        p = subprocess.run(CLI + ["--all-projects"], capture_output=True, text=True, cwd=str(tmp), env=env)
+        out = p.stdout + p.stderr
+        if p.returncode != 0 or "TOTAL shots: 4 | DONE: 2 | projects: 2" not in out:
+            print("❌ --all-projects ÖZETİ YANLIŞ")
+            print(out)
+            sys.exit(1)
+
         print("✅ OK")
         print("\n🎉 TÜM LISTSHOTS TESTLERİ BAŞARILI")
 
@@ -0,0 +1,80 @@
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+CLI = [sys.executable, "-m", "tools.cli", "newshot"]
+
+
+def run(cmd, cwd=ROOT):
+    env = dict(os.environ, PYTHONPATH=str(ROOT))
+    p = subprocess.run(cmd, capture_output=True, text=True, cwd=str(cwd), env=env)
+    return p.returncode, p.stdout + p.stderr
+
+
+def check(name: str, cond: bool, detail: str = "") -> None:
+    if not cond:
+        print(f"❌ {name}: FAIL {detail}")
+        sys.exit(1)
+    print(f"✅ {name}: OK")
+
+
+def main() -> int:
+    with tempfile.TemporaryDirectory() as td:
+        root = Path(td)
+        dpath = root / "DURUM.json"
+        dpath.write_text(json.dumps({
+            "active_project": "selftest_newshot",
+            "current_focus": "FAZ_1",
+            "shots": {},
+            "last_updated_utc": "2026-01-01T00:00:00Z",
+        }, indent=2), encoding="utf-8")
+
+        rc, out = run(CLI + [str(dpath), "SH001", "--prompt", "single"])
+        check("single_shot", rc == 0, out)
+
+        # bad input: every error reported, nothing written
+        bad = root / "bad.csv"
+        bad.write_text("id,prompt\nSH002,ok\nSH003,\nSH002,dup\nSH001,exists\nX9,bad id\n", encoding="utf-8")
+        before = dpath.read_bytes()
+        rc, out = run(CLI + [str(dpath), "--from", str(bad)])
+        check("bulk_reports_all_errors", rc != 0 and "4 error(s)" in out, out)
+        check("bulk_error_no_write", dpath.read_bytes() == before)
+
+        good = root / "good.jsonl"
+        good.write_text(
+            "\n".join(json.dumps({"id": f"SH{i:04d}", "prompt": f"p{i}"}) for i in range(2, 602)) + "\n",
+            encoding="utf-8",
+        )
+        rc, out = run(CLI + [str(dpath), "--from", str(good)])
+        check("bulk_import_ok", rc == 0 and "created 600 shots" in out, out)
+
+        d = json.loads(dpath.read_text(encoding="utf-8"))
+        check("bulk_import_count", len(d["shots"]) == 601, str(len(d["shots"])))
+
+        rc, out = run([sys.executable, "-m", "tools.cli", "validate", str(dpath)])
+        check("validate_after_import", rc == 0, out)
+
+        # --project: the positional is the shot id; a DURUM path needs no .json suffix
+        pstate = root / "projects" / "p1" / "DURUM.json"
+        pstate.parent.mkdir(parents=True)
+        pstate.write_text(json.dumps({**d, "shots": {}}), encoding="utf-8")
+        rc, out = run(CLI + ["--project", "p1", "SH010", "--prompt", "x"], cwd=root)
+        check("project_shot_positional", rc == 0
+              and "SH010" in json.loads(pstate.read_text(encoding="utf-8"))["shots"], out)
+        bare = root / "STATE"
+        bare.write_text(json.dumps({**d, "shots": {}}), encoding="utf-8")
+        rc, out = run(CLI + [str(bare), "SH011", "--prompt", "x"])
+        check("path_without_json_suffix", rc == 0 and "SH011" in json.loads(bare.read_text(encoding="utf-8"))["shots"], out)
+        rc, out = run(CLI + [str(pstate), "SH012", "--project", "p1", "--prompt", "x"], cwd=root)
+        check("project_and_path_rejected", rc != 0 and "not both" in out, out)
+
+    print("\n🎉 TÜM NEWSHOT TESTLERİ BAŞARILI")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
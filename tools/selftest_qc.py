@@ -0,0 +1,372 @@
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+ROOT = Path(__file__).resolve().parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from tools.cli import probe  # noqa: E402
+from tools.cli.face_detect import FaceDetector, get_detector  # noqa: E402
+from tools.cli.mp4 import check_mp4, faststart  # noqa: E402
+from tools.cli.render import cmd_render  # noqa: E402
+from tools.cli.qc_incremental import boxes_from_json, boxes_to_json, frame_change  # noqa: E402
+from tools.cli.qc_metrics import frame_metrics, threshold_errors  # noqa: E402
+from tools.cli.ref_index import descriptor_distance, face_descriptor, ref_descriptor  # noqa: E402
+from tools.cli.qc_frames import (  # noqa: E402
+    _seek_read, read_frames, sample_frames, samples_for_phase, spread_stamps,
+)
+
+
+def run(args):
+    p = subprocess.run([sys.executable, "-m", "tools.cli"] + args, capture_output=True, text=True, cwd=str(ROOT))
+    return p.returncode, p.stdout + p.stderr
+
+
+def check(name: str, cond: bool, detail: str = "") -> None:
+    if not cond:
+        print(f"❌ {name}: FAIL {detail}")
+        sys.exit(1)
+    print(f"✅ {name}: OK")
+
+
+def write_preview(path: Path, seconds: float = 1.0, fps: int = 25, size=(320, 240)) -> None:
+    """Synthetic preview: frame n is filled with gray level n*4 (decodable by OpenCV)."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    w = cv2.VideoWriter(str(path), cv2.VideoWriter_fourcc(*"mp4v"), fps, size)
+    for n in range(int(seconds * fps)):
+        w.write(np.full((size[1], size[0], 3), (n * 4) % 256, np.uint8))
+    w.release()
+
+
+def faz2_shot(sid: str, status: str = "QC") -> dict:
+    return {
+        "id": sid, "phase": "FAZ_2", "status": status, "inputs": {"prompt": sid}, "outputs": {},
+        "history": [{"event": "FAZ2_LOCKS", "at": "2026-01-01T00:00:00Z", "by": "user",
+                     "note": json.dumps({"character_lock": {"id": "hero"}})}],
+    }
+
+
+def make_state(root: Path, shot_ids) -> Path:
+    ref = root / "assets" / "characters" / "hero" / "ref.jpg"
+    ref.parent.mkdir(parents=True, exist_ok=True)
+    cv2.imwrite(str(ref), np.full((64, 64, 3), 128, np.uint8))
+    for n, sid in enumerate(shot_ids, start=1):
+        write_preview(root / "outputs" / f"v{n:04d}" / "preview.mp4")
+    dpath = root / "DURUM.json"
+    dpath.write_text(json.dumps({
+        "active_project": "selftest_qc",
+        "current_focus": "FAZ_2",
+        "shots": {sid: faz2_shot(sid) for sid in shot_ids},
+        "last_updated_utc": "2026-01-01T00:00:00Z",
+    }), encoding="utf-8")
+    return dpath
+
+
+def main() -> int:
+    # QC result cache in a throwaway dir (inherited by the CLI subprocesses)
+    cache_td = tempfile.TemporaryDirectory()
+    os.environ["CINEV2_CACHE_DIR"] = cache_td.name
+
+    # detector: one per process, no faces in flat frames, full-res fallback
+    check("detector_singleton", get_detector() is get_detector())
+    blank = [np.full((480, 640, 3), v, np.uint8) for v in (0, 128, 255)]
+    check("detector_no_face", get_detector().any_face(blank) is False)
+    check("detector_no_downscale_for_small_min_size", FaceDetector(min_size=(20, 20))._downscale() == 1.0)
+    check("detector_detect_all", get_detector().detect_all([b[..., 0] for b in blank]) == [[], [], []])
+
+    # picture metrics: black / frozen / blur over the whole stack
+    flat = np.stack([np.full((32, 32), v, np.uint8) for v in (0, 0, 120)])
+    pm = frame_metrics(flat)
+    check("picture_metrics", pm["luma_mean"] == [0.0, 0.0, 120.0] and pm["frame_diff_mean"] == [0.0, 120.0]
+          and pm["laplacian_var_median"] == 0.0, str(pm))
+    check("picture_thresholds", threshold_errors(pm, {"black_luma": 16, "freeze_diff": 200, "blur_var": 5})
+          == ["black_frames", "frozen_preview", "blurry_preview"]
+          and threshold_errors(pm, {"black_luma": None}) == [], str(pm))
+    checker = np.indices((32, 32)).sum(axis=0) % 2 * 255
+    check("picture_sharp", frame_metrics(checker[None].astype(np.uint8))["laplacian_var_median"] > 1000)
+
+    # identity descriptor: identical crops -> 0, unrelated textures -> far apart
+    rng = np.random.default_rng(1)
+    a = cv2.GaussianBlur(rng.integers(0, 256, (120, 120), dtype=np.uint8), (0, 0), 2)
+    b = cv2.GaussianBlur(rng.integers(0, 256, (120, 120), dtype=np.uint8), (0, 0), 6)
+    box = (10, 10, 100, 100)
+    da = face_descriptor(a, box)
+    check("descriptor_shape", da.shape == (16, 256) and abs(float(da.sum()) - 16.0) < 1e-3, str(da.shape))
+    check("descriptor_self_distance", descriptor_distance(da, da) == 0.0)
+    check("descriptor_brightness_invariant",
+          descriptor_distance(da, face_descriptor(np.clip(a.astype(int) + 30, 0, 255).astype(np.uint8), box)) < 0.1)
+    dab = descriptor_distance(da, face_descriptor(b, box))
+    check("descriptor_different", 0.1 < dab <= 1.0, str(dab))
+
+    with tempfile.TemporaryDirectory() as td:
+        root = Path(td)
+        dpath = make_state(root, ["SH001"])
+        preview = root / "outputs" / "v0001" / "preview.mp4"
+
+        frames = read_frames(preview)
+        check("read_frames_count", len(frames) == 3, str(len(frames)))
+        check("read_frames_gray_array", isinstance(frames, np.ndarray) and frames.shape == (3, 240, 320)
+              and frames.dtype == np.uint8, str(getattr(frames, "shape", None)))
+        means = [float(f.mean()) for f in frames]
+        check("read_frames_in_order", means[0] < means[1] < means[2], str(means))
+        cap = cv2.VideoCapture(str(preview))
+        try:
+            past, kept = _seek_read(cap, [0.5, 99.0])
+        finally:
+            cap.release()
+        check("seek_read_drops_undecoded_stamps", len(past) == 1 and kept == [0.5], f"{len(past)} {kept}")
+
+        # duration-aware sampling: stamps cover the whole clip, not just the first second
+        check("spread_stamps", spread_stamps(10.0, 4) == [1.25, 3.75, 6.25, 8.75], str(spread_stamps(10.0, 4)))
+        check("spread_stamps_unknown_duration", spread_stamps(None, 2) == [0.25, 0.75])
+        check("samples_per_phase", samples_for_phase("FAZ_2") == 5 and samples_for_phase(None) == 3)
+        long_preview = root / "long" / "preview.mp4"
+        write_preview(long_preview, seconds=4.0)
+        sample = sample_frames(long_preview, 4)
+        check("sample_frames_probe", sample.duration is not None and abs(sample.duration - 4.0) < 0.1
+              and sample.fps == 25, str(sample[1:]))
+        check("sample_frames_spread", len(sample.frames) == 4 and sample.stamps[-1] > 3.0, str(sample.stamps))
+
+        # probe metadata: decoded once, then served from the index while the file is unchanged
+        calls = []
+        real_probe = probe.probe_uncached
+        probe.probe_uncached = lambda p: calls.append(p) or real_probe(p)
+        try:
+            info = probe.probe_video(long_preview)
+            again = probe.probe_video(long_preview)
+            check("probe_cached", calls == [] and again == info and info["width"] == 320
+                  and info["height"] == 240 and abs(info["duration"] - 4.0) < 0.1, f"{calls} {info}")
+            write_preview(long_preview, seconds=2.0)
+            info2 = probe.probe_video(long_preview)
+            check("probe_changed_file", len(calls) == 1 and abs(info2["duration"] - 2.0) < 0.1, str(info2))
+        finally:
+            probe.probe_uncached = real_probe
+        check("probe_missing_file", probe.probe_video(root / "nope.mp4") is None)
+        check("probe_format", probe.format_media(info2).startswith("2.00s 25fps 320x240 ")
+              and probe.format_media(None) == "-", probe.format_media(info2))
+
+        rc, out = run(["qc", str(dpath), "SH001", "--out", "outputs/v0001"])
+        check("qc_runs", rc == 0, out)
+        qc = json.loads((root / "outputs" / "v0001" / "qc.json").read_text(encoding="utf-8"))
+        m = qc["metrics"]
+        check("qc_frames_extracted", m["frames_extracted"] == 5, str(m))
+        check("qc_sampling_metrics", len(m["sample_stamps"]) == 5 and m["keyframe_seek"] is False
+              and abs(m["duration_sec"] - 1.0) < 0.05, str(m))
+        check("qc_media_metrics", m["media"]["width"] == 320 and m["media"]["fps"] == 25, str(m.get("media")))
+        check("probe_index_persisted", (Path(os.environ["CINEV2_CACHE_DIR"]) / "probe" / "index.json").is_file())
+        rc, out = run(["listshots", str(dpath), "--media"])
+        check("listshots_media_column", rc == 0 and "MEDIA" in out and "1.00s 25fps 320x240" in out, out)
+        check("qc_no_frame_files", not (root / "outputs" / "v0001" / "_qc_frames").exists())
+        check("qc_picture_metrics", len(m["luma_mean"]) == 5 and m["luma_mean"] == sorted(m["luma_mean"])
+              and m["frame_diff_max"] > 0 and "laplacian_var_median" in m, str(m))
+        check("qc_identity_no_ref_face", m["identity_status"] == "NO_REF_FACE" and m["identity_distance"] is None
+              and any("identity not checked" in w for w in qc["warnings"]), str(qc))
+
+        # ref.jpg descriptors are indexed once on disk (a faceless ref is indexed too)
+        ref = root / "assets" / "characters" / "hero" / "ref.jpg"
+        indexed = list((Path(os.environ["CINEV2_CACHE_DIR"]) / "ref_index").rglob("*.npz"))
+        check("ref_index_persisted", len(indexed) == 1 and ref_descriptor(ref) is None, str(indexed))
+        check("qc_no_face_status", m["character_passive_status"] == "FAIL_NO_FACE"
+              and "no_face_detected_in_preview" in qc["errors"], str(qc))
+        check("qc_first_run_cache_miss", m["cache_hit"] is False, str(m))
+        t = m["timing"]
+        check("qc_timing_stages", {"hash", "cache", "probe", "extract", "metrics", "detect",
+                                   "schema_validate"} <= set(t["stages"]), str(t))
+        check("qc_timing_counters", t["frames"] == 5 and t["bytes_read"] >= 2 * m["preview_bytes"], str(t))
+        side = json.loads((root / "qc_timing.json").read_text(encoding="utf-8"))["qc"]["outputs/v0001/qc.json"]
+        check("qc_timing_sidecar", side["utc"] == qc["utc"] and set(side["stages"]) == {"qc_write", "state_write"}
+              and side["stages"]["state_write"]["shared_by"] == 1, str(side))
+
+        # unchanged preview + ref: result comes from the cache, qc.json still rewritten
+        rc, out = run(["qc", str(dpath), "SH001", "--out", "outputs/v0001"])
+        qc2 = json.loads((root / "outputs" / "v0001" / "qc.json").read_text(encoding="utf-8"))
+        check("qc_cache_hit", rc == 0 and qc2["metrics"]["cache_hit"] is True and "cache hit" in out, out)
+        check("qc_cache_hit_timing", "extract" not in qc2["metrics"]["timing"]["stages"]
+              and qc2["metrics"]["timing"]["frames"] == 0, str(qc2["metrics"]["timing"]))
+        check("qc_cache_hit_same_result", qc2["errors"] == qc["errors"]
+              and qc2["metrics"]["frames_extracted"] == 5
+              and qc2["metrics"]["sample_stamps"] == m["sample_stamps"]
+              and qc2["metrics"]["character_passive_status"] == "FAIL_NO_FACE", str(qc2))
+
+        rc, out = run(["qc", str(dpath), "SH001", "--out", "outputs/v0001", "--no-cache"])
+        qc3 = json.loads((root / "outputs" / "v0001" / "qc.json").read_text(encoding="utf-8"))
+        check("qc_no_cache", rc == 0 and qc3["metrics"]["cache_hit"] is False, str(qc3["metrics"]))
+
+        # new preview bytes -> new key
+        write_preview(preview, seconds=1.2)
+        rc, out = run(["qc", str(dpath), "SH001", "--out", "outputs/v0001"])
+        qc4 = json.loads((root / "outputs" / "v0001" / "qc.json").read_text(encoding="utf-8"))
+        check("qc_cache_miss_on_new_preview", qc4["metrics"]["cache_hit"] is False, str(qc4["metrics"]))
+
+        rc, out = run(["qc", str(dpath), "SH001", "--out", "outputs/v0001", "--samples", "2"])
+        qc5 = json.loads((root / "outputs" / "v0001" / "qc.json").read_text(encoding="utf-8"))
+        check("qc_samples_override", qc5["metrics"]["frames_extracted"] == 2
+              and qc5["metrics"]["cache_hit"] is False, str(qc5["metrics"]))
+        rc, out = run(["qc", str(dpath), "SH001", "--out", "outputs/v0001", "--keep-frames"])
+        kept = sorted(p.name for p in (root / "outputs" / "v0001" / "_qc_frames").glob("*.png"))
+        check("qc_keep_frames", rc == 0 and kept == [f"f{i:02d}.png" for i in range(1, 6)], str(kept))
+
+        # thresholds: flat synthetic frames are blurry; gray ramp is never black / frozen
+        rc, out = run(["qc", str(dpath), "SH001", "--out", "outputs/v0001",
+                       "--blur-var", "5", "--black-luma", "1", "--freeze-diff", "0.5"])
+        qc6 = json.loads((root / "outputs" / "v0001" / "qc.json").read_text(encoding="utf-8"))
+        check("qc_picture_thresholds", qc6["metrics"]["cache_hit"] is True and "blurry_preview" in qc6["errors"]
+              and "black_frames" not in qc6["errors"] and "frozen_preview" not in qc6["errors"], str(qc6))
+
+        rc, out = run(["qc", str(dpath), "SH001", "--out", "outputs/v0001", "--samples", "0"])
+        check("qc_samples_invalid", rc != 0, out)
+
+        d = json.loads(dpath.read_text(encoding="utf-8"))
+        check("qc_outputs_recorded", d["shots"]["SH001"]["outputs"] == {
+            "qc.json": "outputs/v0001/qc.json", "preview.mp4": "outputs/v0001/preview.mp4"})
+
+        # incremental (opt-in): a re-render that barely changes the picture reuses v0001's face result
+        v1_outputs = d["shots"]["SH001"]["outputs"]
+        write_preview(root / "outputs" / "v0002" / "preview.mp4", seconds=1.2, size=(256, 192))
+        rc, out = run(["qc", str(dpath), "SH001", "--out", "outputs/v0002", "--no-cache"])
+        inc = json.loads((root / "outputs" / "v0002" / "qc.json").read_text(encoding="utf-8"))["metrics"]
+        check("incremental_off_by_default", rc == 0 and "incremental" not in inc
+              and "detect" in inc["timing"]["stages"], str(inc))
+        d["shots"]["SH001"]["outputs"] = v1_outputs
+        dpath.write_text(json.dumps(d), encoding="utf-8")
+        rc, out = run(["qc", str(dpath), "SH001", "--out", "outputs/v0002", "--reuse-diff", "2"])
+        inc = json.loads((root / "outputs" / "v0002" / "qc.json").read_text(encoding="utf-8"))["metrics"]
+        check("incremental_reused", rc == 0 and inc["incremental"]["reused"] is True
+              and inc["incremental"]["prior_qc"] == "outputs/v0001/qc.json"
+              and inc["incremental"]["frame_change"] < 2.0 and "reused outputs/v0001/qc.json" in out, out)
+        check("incremental_skips_detect", "detect" not in inc["timing"]["stages"]
+              and "incremental" in inc["timing"]["stages"]
+              and inc["character_passive_status"] == "FAIL_NO_FACE", str(inc))
+
+        # a visibly different re-render runs full QC
+        d["shots"]["SH001"]["outputs"] = v1_outputs
+        dpath.write_text(json.dumps(d), encoding="utf-8")
+        changed = root / "outputs" / "v0003" / "preview.mp4"
+        changed.parent.mkdir(parents=True)
+        w = cv2.VideoWriter(str(changed), cv2.VideoWriter_fourcc(*"mp4v"), 25, (320, 240))
+        for _ in range(30):
+            w.write(np.full((240, 320, 3), 250, np.uint8))
+        w.release()
+        rc, out = run(["qc", str(dpath), "SH001", "--out", "outputs/v0003", "--reuse-diff", "2"])
+        inc = json.loads((root / "outputs" / "v0003" / "qc.json").read_text(encoding="utf-8"))["metrics"]
+        check("incremental_full_on_change", rc == 0 and inc["incremental"]["reused"] is False
+              and inc["incremental"]["frame_change"] > 2.0 and "detect" in inc["timing"]["stages"], str(inc))
+
+        d["shots"]["SH001"]["outputs"] = v1_outputs
+        dpath.write_text(json.dumps(d), encoding="utf-8")
+        rc, out = run(["qc", str(dpath), "SH001", "--out", "outputs/v0002", "--reuse-diff", "0"])
+        inc = json.loads((root / "outputs" / "v0002" / "qc.json").read_text(encoding="utf-8"))["metrics"]
+        check("incremental_off", rc == 0 and "incremental" not in inc and "detect" in inc["timing"]["stages"], str(inc))
+        rc, out = run(["qc", str(dpath), "SH001", "--out", "outputs/v0002", "--reuse-diff", "-1"])
+        check("incremental_invalid_threshold", rc != 0, out)
+
+        # a change confined to a face-sized patch is not diluted by the rest of the frame
+        still = np.full((3, 240, 320), 100, np.uint8)
+        patched = still.copy()
+        patched[1, 100:124, 150:174] = 220
+        check("frame_change_local_patch", float(np.abs(patched.astype(int) - still).mean()) < 2.0
+              and frame_change(still, patched) > 20.0, str(frame_change(still, patched)))
+        boxes = [[(150, 100, 24, 24)], [], [(0, 0, 320, 240)]]
+        check("face_boxes_round_trip", boxes_from_json(boxes_to_json(boxes, (240, 320)), (240, 320)) == boxes
+              and boxes_from_json(boxes_to_json(boxes, (240, 320)), (192, 256))[0] == [(120, 80, 19, 19)])
+
+        # container check: box headers only, truncated uploads fail before any decoder runs
+        v1 = root / "outputs" / "v0001" / "preview.mp4"
+        box = check_mp4(v1)
+        check("mp4_structure", box["ok"] and box["boxes"][0] == "ftyp" and "moov" in box["boxes"]
+              and box["faststart"] is False, str(box))
+        data = v1.read_bytes()
+        truncated = root / "outputs" / "v0004" / "preview.mp4"
+        truncated.parent.mkdir(parents=True)
+        truncated.write_bytes(data[: len(data) // 2])
+        check("mp4_truncated", "truncated" in " ".join(check_mp4(truncated)["errors"]), str(check_mp4(truncated)))
+        (root / "not.mp4").write_bytes(b"<html>not a video</html>")
+        check("mp4_not_mp4", not check_mp4(root / "not.mp4")["ok"])
+        rc, out = run(["qc", str(dpath), "SH001", "--out", "outputs/v0004"])
+        bad = json.loads((truncated.parent / "qc.json").read_text(encoding="utf-8"))
+        check("qc_container_fails_fast", "preview_container_invalid" in bad["errors"]
+              and bad["metrics"]["frames_extracted"] == 0 and "extract" not in bad["metrics"]["timing"]["stages"]
+              and "probe" not in bad["metrics"]["timing"]["stages"], str(bad))
+        v2_warnings = json.loads((root / "outputs" / "v0002" / "qc.json").read_text(encoding="utf-8"))["warnings"]
+        check("qc_faststart_warning", any("not faststart" in w for w in v2_warnings), str(v2_warnings))
+
+        # faststart remux: moov first, chunk offsets patched, same decoded frames
+        fast = root / "fast.mp4"
+        check("faststart_remux", faststart(v1, fast) and check_mp4(fast)["faststart"] is True
+              and faststart(fast, root / "again.mp4") is False and not (root / "again.mp4").exists())
+        check("faststart_same_frames", np.array_equal(read_frames(fast), read_frames(v1)))
+        if os.name != "nt":
+            os.chmod(fast, 0o640)
+            faststart(v1, fast)
+            check("faststart_keeps_mode", fast.stat().st_mode & 0o777 == 0o640, oct(fast.stat().st_mode))
+
+        def render(src, out):
+            ns = argparse.Namespace(path=str(dpath), shot_id="SH001", out=out, src=src, force=False,
+                                    faststart=True, state_root=str(root))
+            return cmd_render(ns)
+
+        check("render_faststart", render("outputs/v0001/preview.mp4", "outputs/v0005") == 0
+              and check_mp4(root / "outputs" / "v0005" / "preview.mp4")["faststart"] is True
+              and not (root / "outputs" / "v0005" / ".preview.faststart.mp4").exists())
+        check("render_faststart_idempotent", render("outputs/v0001/preview.mp4", "outputs/v0005") == 0)
+        check("render_rejects_truncated", render("outputs/v0004/preview.mp4", "outputs/v0006") != 0
+              and not (root / "outputs" / "v0006" / "preview.mp4").exists())
+
+    # batch: every QC shot in one run, one DURUM write
+    with tempfile.TemporaryDirectory() as td:
+        root = Path(td)
+        ids = [f"SH{i:03d}" for i in range(1, 5)]
+        dpath = make_state(root, ids)
+        d = json.loads(dpath.read_text(encoding="utf-8"))
+        for n, sid in enumerate(ids, start=1):
+            d["shots"][sid]["outputs"] = {"preview.mp4": f"outputs/v{n:04d}/preview.mp4"}
+        d["shots"]["SH004"]["status"] = "IN_PROGRESS"
+        d["shots"]["SH003"]["history"] = []  # no character lock
+        dpath.write_text(json.dumps(d), encoding="utf-8")
+
+        rc, out = run(["qc", str(dpath), "--status", "QC", "--jobs", "2"])
+        check("batch_status_runs", "frames/sec" in out and "shots: 3" in out, out)
+        d = json.loads(dpath.read_text(encoding="utf-8"))
+        check("batch_merged_outputs", all(
+            d["shots"][sid]["outputs"].get("qc.json") == f"outputs/v{n:04d}/qc.json"
+            for n, sid in enumerate(ids[:3], start=1)
+        ), json.dumps({k: v["outputs"] for k, v in d["shots"].items()}))
+        qc3 = json.loads((root / "outputs" / "v0003" / "qc.json").read_text(encoding="utf-8"))
+        check("batch_no_char_picture_metrics", qc3["ok"] and len(qc3["metrics"]["luma_mean"]) == 5
+              and qc3["metrics"]["character_passive_status"] == "NOT_EVALUATED", json.dumps(qc3))
+        side = json.loads((root / "qc_timing.json").read_text(encoding="utf-8"))["qc"]
+        shared = [side[f"outputs/v{n:04d}/qc.json"]["stages"]["state_write"]["shared_by"] for n in (1, 2, 3)]
+        check("batch_state_write_shared", shared == [3, 3, 3], json.dumps(side))
+
+        rc, out = run(["qc-timing", str(dpath), "--json"])
+        agg = json.loads(out) if rc == 0 else {}
+        stages = {r["stage"]: r for r in agg.get("stages", [])}
+        check("qc_timing_summary", agg.get("shots") == 3 and agg.get("shots_without_timing") == 0
+              and stages["state_write"]["shots"] == 3 and stages["qc_write"]["shots"] == 3
+              and stages["schema_validate"]["shots"] == 3
+              and abs(sum(r["wall_share"] for r in agg["stages"]) - 1) < 0.01,
+              out)
+        rc, out = run(["qc-timing", str(dpath)])
+        check("qc_timing_table", rc == 0 and "extract" in out and "shots: 3" in out, out)
+        check("batch_skips_other_status", "qc.json" not in d["shots"]["SH004"]["outputs"])
+
+        rc, out = run(["qc", str(dpath), "--shots", "SH004", "SH001"])
+        check("batch_shots_list", "SH004" in out and "shots: 2" in out, out)
+
+        rc, out = run(["qc", str(dpath), "SH001", "--all"])
+        check("batch_and_single_rejected", rc != 0, out)
+
+    print("\n🎉 TÜM QC TESTLERİ BAŞARILI")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,97 @@
+import json
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def run(args):
+    p = subprocess.run([sys.executable, "-m", "tools.cli"] + args, capture_output=True, text=True, cwd=str(ROOT))
+    return p.returncode, p.stdout + p.stderr
+
+
+def check(name: str, cond: bool, detail: str = "") -> None:
+    if not cond:
+        print(f"❌ {name}: FAIL {detail}")
+        sys.exit(1)
+    print(f"✅ {name}: OK")
+
+
+def shot(sid, status, outputs=None, phase="FAZ_1"):
+    return {"id": sid, "phase": phase, "status": status, "inputs": {"prompt": sid},
+            "outputs": outputs or {}, "history": []}
+
+
+def out(v):
+    return {"preview.mp4": f"outputs/{v}/preview.mp4", "qc.json": f"outputs/{v}/qc.json"}
+
+
+def main() -> int:
+    with tempfile.TemporaryDirectory() as td:
+        root = Path(td)
+        files = {
+            "v0003": {"ok": True, "errors": []},
+            "v0004": {"ok": False, "errors": ["no face"]},
+            "v0006": {"ok": True, "errors": [], "metrics": {"character_passive_status": "PASSIVE_FAIL"}},
+            "v0007": {"ok": True, "errors": [], "metrics": {"character_passive_status": "PASSIVE_OK"}},
+        }
+        for v, qc in files.items():
+            (root / "outputs" / v).mkdir(parents=True)
+            (root / "outputs" / v / "qc.json").write_text(json.dumps(qc), encoding="utf-8")
+            (root / "outputs" / v / "preview.mp4").write_bytes(b"mp4")
+        (root / "outputs" / "v0005").mkdir()
+        (root / "outputs" / "v0005" / "qc.json").write_text(json.dumps(files["v0003"]), encoding="utf-8")
+
+        dpath = root / "DURUM.json"
+        dpath.write_text(json.dumps({
+            "active_project": "selftest_readiness",
+            "current_focus": "FAZ_1",
+            "shots": {
+                "SH001": shot("SH001", "PLANNED"),
+                "SH002": shot("SH002", "IN_PROGRESS"),
+                "SH003": shot("SH003", "QC", out("v0003")),
+                "SH004": shot("SH004", "QC", out("v0004")),
+                "SH005": shot("SH005", "QC", out("v0005")),
+                "SH006": shot("SH006", "DONE", out("v0006"), "FAZ_2"),
+                "SH007": shot("SH007", "DONE", out("v0007"), "FAZ_2"),
+                "SH008": shot("SH008", "RELEASE", out("v0007")),
+            },
+            "last_updated_utc": "2026-01-01T00:00:00Z",
+        }), encoding="utf-8")
+
+        rc, o = run(["readiness", str(dpath), "--json"])
+        check("readiness_json", rc == 0, o)
+        rep = json.loads(o)
+        by = {r["shot_id"]: r for r in rep["shots"]}
+
+        def nxt(sid):
+            return by[sid]["next"][0] if by[sid]["next"] else None
+
+        check("planned_ready", nxt("SH001")["to"] == "IN_PROGRESS" and nxt("SH001")["ready"])
+        check("in_progress_needs_outputs", not nxt("SH002")["ready"]
+              and nxt("SH002")["reasons"] == ["IN_PROGRESS -> QC requires non-empty outputs"])
+        check("qc_ready", nxt("SH003")["to"] == "DONE" and nxt("SH003")["ready"])
+        check("qc_not_ok", nxt("SH004")["reasons"] == ["QC -> DONE requires qc.json ok==true"], str(nxt("SH004")))
+        check("qc_missing_preview", not nxt("SH005")["ready"], str(nxt("SH005")))
+        check("faz2_passive_lock", not nxt("SH006")["ready"]
+              and "character_passive_status" in nxt("SH006")["reasons"][0], str(nxt("SH006")))
+        check("faz2_passive_ok", nxt("SH007")["ready"], str(nxt("SH007")))
+        check("release_terminal", by["SH008"]["next"] == [], str(by["SH008"]))
+        check("totals", rep["totals"] == {"ready": 3, "blocked": 4, "terminal": 1}, str(rep["totals"]))
+
+        # same first reason as `transition` itself
+        for sid, to in [("SH002", "QC"), ("SH004", "DONE"), ("SH005", "DONE")]:
+            rc, o = run(["transition", str(dpath), sid, "--to", to])
+            check(f"matches_transition_{sid}", rc != 0 and nxt(sid)["reasons"][0] in o, o)
+
+        rc, o = run(["readiness", str(dpath), "--ready-only"])
+        check("table_ready_only", rc == 0 and "SH003" in o and "SH004" not in o and "READY: 3" in o, o)
+
+    print("\n🎉 TÜM READINESS TESTLERİ BAŞARILI")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
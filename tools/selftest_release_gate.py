@@ -214,6 +214,12 @@ def main():
             print("manifest shots:", len(data.get("shots", [])))
             sys.exit(1)
 
+        # runtime total: the empty placeholder preview has no probe metadata
+        totals = data.get("totals", {})
+        if totals.get("runtime_sec") != 0 or totals.get("runtime_unknown") != 1:
+            print("❌ totals.runtime_sec / runtime_unknown yanlış:", totals)
+            sys.exit(1)
+
         print("\n🎉 TÜM RELEASE GATE TESTLERİ BAŞARILI")
         return 0
 
@@ -0,0 +1,135 @@
+import copy
+import json
+import os
+import random
+import re
+import sys
+import tempfile
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from jsonschema import Draft7Validator  # noqa: E402
+
+from tools.cli.schema_compile import CompiledValidator  # noqa: E402
+
+SCHEMAS = [
+    ROOT / "schema" / "shot.schema.json",
+    ROOT / "schema" / "qc.schema.json",
+    ROOT / "schema" / "cinev3" / "durum.schema.json",
+]
+
+# values that hit type / enum / pattern / bound edges
+JUNK = [None, True, False, 0, -1, 1.5, 2.0, "", "x", "SH001", "SH1", "DONE", "FAZ_1",
+        "2026-01-01T00:00:00Z", [], [1], ["a"], {}, {"a": 1}]
+
+PATTERN_CANDIDATES = ["SH001", "2026-01-01T00:00:00Z", "outputs/v0001/preview.mp4", "a" * 64, "x"]
+
+
+def check(name: str, cond: bool, detail: str = "") -> None:
+    if not cond:
+        print(f"❌ {name}: FAIL {detail}")
+        sys.exit(1)
+    print(f"✅ {name}: OK")
+
+
+def _sample(schema, root, rnd, depth=0):
+    """A mostly-valid instance for `schema` (enough to reach nested checks)."""
+    if not isinstance(schema, dict) or depth > 6:
+        return None
+    if "$ref" in schema:
+        node = root
+        for part in schema["$ref"][2:].split("/"):
+            node = node[part]
+        return _sample(node, root, rnd, depth + 1)
+    if "enum" in schema:
+        return rnd.choice(schema["enum"])
+    if "const" in schema:
+        return schema["const"]
+    t = schema.get("type")
+    t = rnd.choice(t) if isinstance(t, list) else t
+    if t == "object" or "properties" in schema:
+        out = {k: _sample(s, root, rnd, depth + 1) for k, s in (schema.get("properties") or {}).items()}
+        ap = schema.get("additionalProperties")
+        if isinstance(ap, dict):
+            out["SH001"] = _sample(ap, root, rnd, depth + 1)
+        return out
+    if t == "array":
+        return [_sample(schema.get("items") or {}, root, rnd, depth + 1) for _ in range(rnd.randint(0, 2))]
+    if t == "string":
+        if "pattern" in schema:
+            return next((c for c in PATTERN_CANDIDATES if re.search(schema["pattern"], c)), "x")
+        return "x"
+    if t in ("integer", "number"):
+        return schema.get("minimum", 1)
+    if t == "boolean":
+        return True
+    return None
+
+
+def _mutate(doc, rnd):
+    doc = copy.deepcopy(doc)
+    node = doc
+    for _ in range(rnd.randint(0, 4)):
+        if isinstance(node, dict) and node:
+            k = rnd.choice(list(node))
+            if rnd.random() < 0.3:
+                node[k] = rnd.choice(JUNK)
+                return doc
+            if rnd.random() < 0.1:
+                del node[k]
+                return doc
+            if not isinstance(node[k], (dict, list)):
+                node[k] = rnd.choice(JUNK)
+                return doc
+            node = node[k]
+        elif isinstance(node, list) and node:
+            i = rnd.randrange(len(node))
+            if not isinstance(node[i], (dict, list)):
+                node[i] = rnd.choice(JUNK)
+                return doc
+            node = node[i]
+    if isinstance(node, dict):
+        node[rnd.choice(["extra", "id", "status"])] = rnd.choice(JUNK)
+    return doc
+
+
+def main() -> int:
+    rnd = random.Random(1234)
+    with tempfile.TemporaryDirectory() as td:
+        os.environ["CINEV2_CACHE_DIR"] = td
+
+        for path in SCHEMAS:
+            schema = json.loads(path.read_text(encoding="utf-8-sig"))
+            cv = CompiledValidator(schema, path.stem)
+            check(f"{path.name}_compiled", cv.compiled)
+
+            ref = Draft7Validator(schema)
+            base = _sample(schema, schema, rnd)
+            check(f"{path.name}_sample_valid", ref.is_valid(base))
+            mismatches = []
+            for _ in range(3000):
+                doc = _mutate(base, rnd)
+                if cv.is_valid(doc) != ref.is_valid(doc):
+                    mismatches.append(doc)
+            check(f"{path.name}_matches_jsonschema", not mismatches, json.dumps(mismatches[:1])[:300])
+
+            # error messages still come from jsonschema
+            bad = {"id": 1} if path.stem != "durum" else {"shots": 1}
+            msgs = [e.message for e in cv.iter_errors(bad)]
+            check(f"{path.name}_error_messages", msgs == [e.message for e in ref.iter_errors(bad)])
+
+        cached = list(Path(td, "schema").glob("*.py"))
+        check("compiled_source_cached", len(cached) == len(SCHEMAS), str(cached))
+        # second load is served from the cache
+        schema = json.loads(SCHEMAS[0].read_text(encoding="utf-8-sig"))
+        check("cache_reload", CompiledValidator(schema, SCHEMAS[0].stem).compiled)
+
+    print("\n🎉 TÜM SCHEMA COMPILE TESTLERİ BAŞARILI")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
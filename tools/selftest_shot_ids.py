@@ -0,0 +1,88 @@
+import json
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def run(*args: str) -> subprocess.CompletedProcess:
+    return subprocess.run([sys.executable, "-m", "tools.cli", *args], text=True, capture_output=True, cwd=str(ROOT))
+
+
+def check(name: str, cond: bool, detail: str = "") -> None:
+    if not cond:
+        print(f"❌ {name}: FAIL {detail}")
+        sys.exit(1)
+    print(f"✅ {name}: OK")
+
+
+def shot(sid: str, outputs=None) -> dict:
+    return {"id": sid, "phase": "FAZ_1", "status": "PLANNED", "inputs": {"prompt": sid},
+            "outputs": outputs or {}, "history": []}
+
+
+def main() -> int:
+    with tempfile.TemporaryDirectory() as td:
+        root = Path(td)
+        p = root / "DURUM.json"
+        (root / "outputs" / "SH001" / "v0001").mkdir(parents=True)
+        (root / "outputs" / "SH001" / "v0001" / "preview.mp4").write_bytes(b"\x00")
+
+        durum = {
+            "active_project": "selftest",
+            "current_focus": "FAZ_1",
+            "shots": {
+                "SH1000": shot("SH1000"),
+                "SH999": shot("SH999"),
+                "SH001": shot("SH001", {"preview.mp4": "outputs/SH001/v0001/preview.mp4"}),
+            },
+            "last_updated_utc": "2026-01-01T00:00:00Z",
+        }
+        p.write_text(json.dumps(durum, indent=2), encoding="utf-8")
+
+        r = run("validate", str(p))
+        check("wide_ids_validate", r.returncode == 0, r.stdout + r.stderr)
+
+        r = run("listshots", str(p))
+        order = [line.split()[0] for line in r.stdout.splitlines() if line.startswith("SH")]
+        check("listshots_natural_order", order == ["SH001", "SH999", "SH1000"], str(order))
+
+        # dry run must not touch anything
+        before = p.read_bytes()
+        r = run("migrate-ids", str(p), "--width", "4")
+        check("migrate_dry_run", r.returncode == 0 and p.read_bytes() == before, r.stdout + r.stderr)
+
+        # collision is rejected
+        (root / "map.json").write_text(json.dumps({"SH999": "SH1000"}), encoding="utf-8")
+        r = run("migrate-ids", str(p), "--map", str(root / "map.json"), "--apply")
+        check("migrate_rejects_collision", r.returncode != 0 and "collision" in r.stdout, r.stdout)
+
+        r = run("migrate-ids", str(p), "--width", "4", "--apply")
+        check("migrate_apply", r.returncode == 0, r.stdout + r.stderr)
+
+        d = json.loads(p.read_text(encoding="utf-8"))
+        check("ids_rewritten", sorted(d["shots"]) == ["SH0001", "SH0999", "SH1000"], str(sorted(d["shots"])))
+        out = d["shots"]["SH0001"]["outputs"]["preview.mp4"]
+        check("outputs_rewritten", out == "outputs/SH0001/v0001/preview.mp4", out)
+        check("outputs_moved", (root / out).is_file())
+
+        r = run("validate", str(p))
+        check("validate_after_migrate", r.returncode == 0, r.stdout + r.stderr)
+
+        # a one-digit scene prefix is not a valid id: --width must not produce SC1_SH0001
+        bad = root / "BAD.json"
+        durum["shots"] = {"SC1_SH001": shot("SC1_SH001")}
+        bad.write_text(json.dumps(durum, indent=2), encoding="utf-8")
+        before = bad.read_bytes()
+        r = run("migrate-ids", str(bad), "--width", "4", "--apply")
+        check("migrate_rejects_bad_scene_prefix", r.returncode != 0 and "SC1_SH001" in r.stdout
+              and bad.read_bytes() == before, r.stdout + r.stderr)
+
+    print("\n🎉 TÜM SHOT ID TESTLERİ BAŞARILI")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
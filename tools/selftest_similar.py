@@ -0,0 +1,137 @@
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+ROOT = Path(__file__).resolve().parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from tools.cli.perceptual import MultiIndex, dhash, hamming, phash  # noqa: E402
+from tools.cli.similar import SimilarIndex  # noqa: E402
+
+
+def run(args):
+    p = subprocess.run([sys.executable, "-m", "tools.cli"] + args, capture_output=True, text=True, cwd=str(ROOT))
+    return p.returncode, p.stdout + p.stderr
+
+
+def check(name: str, cond: bool, detail: str = "") -> None:
+    if not cond:
+        print(f"❌ {name}: FAIL {detail}")
+        sys.exit(1)
+    print(f"✅ {name}: OK")
+
+
+def texture(seed: int, size=(320, 240)) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    return cv2.GaussianBlur(rng.integers(0, 256, (size[1], size[0]), dtype=np.uint8), (0, 0), 6)
+
+
+def write_preview(path: Path, seed: int, size=(320, 240), seconds: float = 1.0, fps: int = 25) -> None:
+    """Textured preview (flat frames all hash alike); `size` changes the encode, not the picture."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    base = texture(seed)
+    w = cv2.VideoWriter(str(path), cv2.VideoWriter_fourcc(*"mp4v"), fps, size)
+    for n in range(int(seconds * fps)):
+        img = cv2.resize(np.roll(base, n * 2, axis=1), size, interpolation=cv2.INTER_AREA)
+        w.write(cv2.cvtColor(img, cv2.COLOR_GRAY2BGR))
+    w.release()
+
+
+def main() -> int:
+    cache_td = tempfile.TemporaryDirectory()
+    os.environ["CINEV2_CACHE_DIR"] = cache_td.name
+
+    # hashes: stable under resize / brightness / JPEG, far apart for other pictures
+    a, b = texture(1), texture(2)
+    _, jpg = cv2.imencode(".jpg", a, [cv2.IMWRITE_JPEG_QUALITY, 40])
+    variants = [
+        cv2.resize(cv2.resize(a, (160, 120), interpolation=cv2.INTER_AREA), (320, 240)),
+        np.clip(a.astype(np.int16) + 20, 0, 255).astype(np.uint8),
+        cv2.imdecode(jpg, cv2.IMREAD_GRAYSCALE),
+    ]
+    for fn in (dhash, phash):
+        near = [hamming(fn(a), fn(v)) for v in variants]
+        far = hamming(fn(a), fn(b))
+        check(f"{fn.__name__}_robust", max(near) <= 6 and far >= 20, f"near={near} far={far}")
+
+    # multi-index: same answers as brute force, far fewer comparisons
+    rng = np.random.default_rng(0)
+    hashes = [int(x) for x in rng.integers(0, 2**63, 5000, dtype=np.int64)]
+    mi = MultiIndex()
+    for i, h in enumerate(hashes):
+        mi.add(h, i)
+    q = hashes[7] ^ 0b1001000000100000010000001
+    for radius in (0, 4, 10, 15):
+        got = sorted(mi.query(q, radius))
+        want = sorted((hamming(q, h), i) for i, h in enumerate(hashes) if hamming(q, h) <= radius)
+        check(f"multi_index_exact_r{radius}", got == want, f"{got} != {want}")
+    mi.query(q, 10)
+    check("multi_index_sublinear", mi.checked < len(hashes) // 10, str(mi.checked))
+
+    with tempfile.TemporaryDirectory() as td:
+        root = Path(td)
+        # SH002 = SH001 re-encoded at another size, SH003 different picture, SH004 no qc yet
+        write_preview(root / "outputs" / "v0001" / "preview.mp4", seed=1)
+        write_preview(root / "outputs" / "v0002" / "preview.mp4", seed=1, size=(256, 192))
+        write_preview(root / "outputs" / "v0003" / "preview.mp4", seed=3)
+        ids = ["SH001", "SH002", "SH003", "SH004"]
+        shots = {
+            sid: {"id": sid, "phase": "FAZ_1", "status": "QC", "inputs": {"prompt": sid}, "history": [],
+                  "outputs": {"preview.mp4": f"outputs/v{n:04d}/preview.mp4"} if n < 4 else {}}
+            for n, sid in enumerate(ids, start=1)
+        }
+        dpath = root / "DURUM.json"
+        dpath.write_text(json.dumps({
+            "active_project": "selftest_similar", "current_focus": "FAZ_1",
+            "shots": shots, "last_updated_utc": "2026-01-01T00:00:00Z",
+        }), encoding="utf-8")
+
+        rc, out = run(["qc", str(dpath), "--shots", "SH001", "SH002", "SH003", "--jobs", "1"])
+        check("qc_runs", rc == 0, out)
+        qc = json.loads((root / "outputs" / "v0001" / "qc.json").read_text(encoding="utf-8"))
+        m = qc["metrics"]
+        check("qc_frame_hashes", len(m["frame_phash"]) == 3 and len(m["frame_dhash"]) == 3
+              and all(len(h) == 16 for h in m["frame_phash"]), str(m))
+
+        rc, out = run(["similar", str(dpath), "SH001", "--json"])
+        res = json.loads(out) if rc == 0 else {}
+        sims = {r["shot_id"]: r for r in res.get("similar", [])}
+        check("similar_finds_reencode", "SH002" in sims and sims["SH002"]["frames_matched"] == 3, out)
+        check("similar_skips_other_picture", "SH003" not in sims, out)
+        check("similar_indexed", res.get("indexed_shots") == 3, out)
+
+        index_files = list((Path(cache_td.name) / "similar").glob("*.sqlite"))
+        check("similar_index_persisted", len(index_files) == 1, str(index_files))
+        idx = SimilarIndex(root)
+        idx.refresh(json.loads(dpath.read_text(encoding="utf-8")), jobs=1)
+        check("similar_index_reused", idx.updated == 0 and sorted(idx.shots) == ["SH001", "SH002", "SH003"]
+              and idx.hashes("SH001") == m["frame_phash"], str(idx.shots))
+
+        rc, out = run(["similar", str(dpath), "SH003"])
+        check("similar_none", rc == 0 and "no similar previews" in out, out)
+
+        rc, out = run(["similar", str(dpath), "SH004"])
+        check("similar_needs_qc", rc != 0 and "re-run qc" in out, out)
+
+        # SH003 now re-uses SH001's picture: only its qc.json is re-read, result follows
+        write_preview(root / "outputs" / "v0003" / "preview.mp4", seed=1, size=(288, 216))
+        rc, out = run(["qc", str(dpath), "SH003", "--out", "outputs/v0003"])
+        idx = SimilarIndex(root)
+        idx.refresh(json.loads(dpath.read_text(encoding="utf-8")), jobs=1)
+        check("similar_index_updates_changed_only", idx.updated == 1, str(idx.updated))
+        rc, out = run(["similar", str(dpath), "SH001"])
+        check("similar_table_refreshed", rc == 0 and "SH002" in out and "SH003" in out, out)
+
+    print("\n🎉 TÜM SIMILAR TESTLERİ BAŞARILI")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,140 @@
+import json
+import os
+import re
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+CLI = [sys.executable, "-m", "tools.cli", "validate"]
+
+
+def run(args, env):
+    p = subprocess.run(CLI + args, capture_output=True, text=True, cwd=str(ROOT), env=env)
+    return p.returncode, p.stdout + p.stderr
+
+
+def check(name: str, cond: bool, detail: str = "") -> None:
+    if not cond:
+        print(f"❌ {name}: FAIL {detail}")
+        sys.exit(1)
+    print(f"✅ {name}: OK")
+
+
+def checked(out: str) -> int:
+    m = re.search(r"checked=(\d+)", out)
+    return int(m.group(1)) if m else -1
+
+
+def shot(sid, status="PLANNED", outputs=None):
+    return {"id": sid, "phase": "FAZ_1", "status": status, "inputs": {"prompt": sid},
+            "outputs": outputs or {}, "history": []}
+
+
+def main() -> int:
+    with tempfile.TemporaryDirectory() as td:
+        root = Path(td)
+        env = dict(os.environ, CINEV2_CACHE_DIR=str(root / "cache"))
+
+        qc = root / "outputs" / "v0001" / "qc.json"
+        qc.parent.mkdir(parents=True)
+        qc.write_text(json.dumps({"ok": True, "errors": []}), encoding="utf-8")
+
+        dpath = root / "DURUM.json"
+        durum = {
+            "active_project": "selftest_validate",
+            "current_focus": "FAZ_1",
+            "shots": {
+                "SH001": shot("SH001", "QC", {"qc.json": "outputs/v0001/qc.json"}),
+                "SH002": shot("SH002"),
+                "SH003": shot("SH003"),
+            },
+            "last_updated_utc": "2026-01-01T00:00:00Z",
+        }
+        dpath.write_text(json.dumps(durum, indent=2), encoding="utf-8")
+
+        rc, out = run([str(dpath)], env)
+        check("v2_first_run_checks_all", rc == 0 and checked(out) == 3, out)
+
+        rc, out = run([str(dpath)], env)
+        check("v2_second_run_cached", rc == 0 and checked(out) == 0, out)
+
+        durum["shots"]["SH002"]["inputs"]["prompt"] = "changed"
+        dpath.write_text(json.dumps(durum, indent=2), encoding="utf-8")
+        rc, out = run([str(dpath)], env)
+        check("v2_changed_shot_only", rc == 0 and checked(out) == 1, out)
+
+        # qc.json rewritten behind DURUM's back -> shot is re-checked
+        qc.write_text(json.dumps({"ok": "yes"}), encoding="utf-8")
+        rc, out = run([str(dpath)], env)
+        check("v2_qc_change_detected", rc != 0 and "SH001" in out, out)
+
+        qc.write_text(json.dumps({"ok": True, "errors": []}), encoding="utf-8")
+        rc, out = run([str(dpath)], env)
+        check("v2_qc_fixed", rc == 0 and checked(out) == 1, out)
+
+        rc, out = run([str(dpath), "--full"], env)
+        check("v2_full_checks_all", rc == 0 and checked(out) == 3, out)
+
+        # CineV3: schema errors in a changed shot are still reported
+        v3 = root / "DURUM_v3.json"
+        d3 = {"project": {"id": "p"}, "shots": {"SH001": shot("SH001"), "SH002": shot("SH002")}}
+        v3.write_text(json.dumps(d3), encoding="utf-8")
+        rc, out = run([str(v3)], env)
+        check("v3_first_run", rc == 0 and checked(out) == 2, out)
+
+        rc, out = run([str(v3)], env)
+        check("v3_cached", rc == 0 and checked(out) == 0, out)
+
+        d3["shots"]["SH002"]["status"] = "NOPE"
+        v3.write_text(json.dumps(d3), encoding="utf-8")
+        rc, out = run([str(v3)], env)
+        check("v3_changed_shot_invalid", rc != 0 and "shots.SH002.status" in out, out)
+
+        # non-string qc.json path: a clean schema error, not a crash in the qc check
+        d3["shots"]["SH002"]["status"] = "DONE"
+        d3["shots"]["SH002"]["outputs"] = {"qc.json": 5}
+        v3.write_text(json.dumps(d3), encoding="utf-8")
+        rc, out = run([str(v3)], env)
+        check("v3_non_string_qc_path", rc != 0 and "shots.SH002.outputs" in out and "Traceback" not in out, out)
+        durum["shots"]["SH003"]["outputs"] = {"qc.json": 5}
+        dpath.write_text(json.dumps(durum, indent=2), encoding="utf-8")
+        rc, out = run([str(dpath)], env)
+        check("v2_non_string_qc_path", rc != 0 and "SH003" in out and "Traceback" not in out, out)
+        durum["shots"]["SH003"]["outputs"] = {}
+        d3["shots"]["SH002"]["outputs"] = {}
+
+        d3["extra"] = 1
+        v3.write_text(json.dumps(d3), encoding="utf-8")
+        rc, out = run([str(v3)], env)
+        check("v3_top_level_always_checked", rc != 0 and "extra" in out, out)
+
+        # complete report: every bad shot, not just the first (parallel == serial)
+        big = root / "DURUM_big.json"
+        many = {}
+        for i in range(1, 601):
+            sid = f"SH{i:04d}"
+            outs = {"qc.json": f"outputs/missing/{sid}.json"} if i % 2 else {}
+            many[sid] = shot(sid, "QC", outs)
+        many["SH0002"]["status"] = "NOPE"
+        big.write_text(json.dumps({**durum, "shots": many}), encoding="utf-8")
+
+        rc, out = run([str(big), "--json", "--full", "--jobs", "4"], env)
+        rep = json.loads(out[out.index("{"):])
+        check("report_all_errors", rc != 0 and rep["error_count"] == 301 and not rep["truncated"], str(rep)[:300])
+        check("report_grouped_by_shot", list(rep["errors"])[:3] == ["SH0001", "SH0002", "SH0003"], str(list(rep["errors"])[:3]))
+
+        rc, out = run([str(big), "--json", "--full", "--jobs", "1"], env)
+        check("report_serial_equals_parallel", json.loads(out[out.index("{"):]) == rep)
+
+        rc, out = run([str(big), "--json", "--full", "--max-errors", "5"], env)
+        rep = json.loads(out[out.index("{"):])
+        check("max_errors_stops", rc != 0 and rep["error_count"] == 5 and rep["truncated"], str(rep)[:300])
+
+    print("\n🎉 TÜM VALIDATE TESTLERİ BAŞARILI")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())